@@ -0,0 +1,266 @@
+'''
+    Benchmark de ponta a ponta do scraper, sem acesso ao vlr.gg.
+
+    Um servidor HTTP local substitui o site, servindo as páginas sintéticas de `benchmarks/fixtures`
+    (ver `benchmarks.fixturePages`), com as datas relativas ao dia atual:
+        - /rankings e /rankings/<região>: cada região recebe Ids de times distintos
+        - /team/<id>/..., /team/matches/<id>/... e /team/stats/<id>/...: páginas do time com o Id e o nome da URL
+
+    O servidor pode simular latência, erros (HTTP 500) e limitação de requisições (HTTP 429). O
+    `VLRGGScraper.run` completo é executado contra ele, em um diretório temporário e sem cache.
+
+    Sem erros, a coleta dos 300 times leva cerca de 15s. Com erros ou limitação, o limitador de taxa reduz a taxa
+    pela metade a cada resposta 429/5xx e a recupera em 10% a cada sucesso: com `--error-rate 0.1 --throttle-rate 0.05`
+    a taxa cai em poucos minutos para perto do mínimo (0.05 req/s) e a coleta completa levaria horas. A coleta é
+    interrompida após `--time-limit` segundos (600, por padrão; a finalização das requisições em andamento pode levar
+    cerca de um minuto a mais) e os resultados parciais são marcados como tal.
+
+    Resultados: tempo total, páginas por segundo, pico de memória (RSS) e tempo de processamento por extrator.
+    Com `-o`, os resultados são salvos em JSON (com o commit atual); com `--compare`, são comparados a
+    um resultado anterior, permitindo identificar regressões entre commits.
+
+    Uso (a partir do diretório Scraper):
+        python -m benchmarks.crawlBenchmark [--latency S] [--error-rate P] [--throttle-rate P] [-w N] [-p]
+                                            [--time-limit S] [-o RESULTADO.json] [--compare BASE.json]
+'''
+import os
+import re
+import sys
+import json
+import random
+import argparse
+import resource
+import tempfile
+import subprocess
+from threading import Thread, Lock, Timer
+from time import sleep, perf_counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from src.scraper import VLRGGScraper
+from src.metrics import METRICS
+from benchmarks.fixturePages import FIXTURES, loadFixture
+
+# Id e nome na URL do time presente nas páginas (substituídos pelos da URL requisitada)
+FIXTURE_TEAM_ID = b"1001"
+FIXTURE_TEAM_SLUG = b"team-heretics"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    '''
+        Servidor substituto do vlr.gg. A configuração (latência, taxas de erro) fica nos atributos do servidor.
+    '''
+    def do_GET(self):
+        server = self.server
+        server.countRequest()
+
+        delay = server.latency + server.random(0, server.jitter)
+        if delay:
+            sleep(delay)
+
+        draw = server.random(0, 1)
+        if draw < server.throttle_rate:
+            self.reply(429, b"", {"Retry-After": "1"})
+            return
+        if draw < server.throttle_rate + server.error_rate:
+            self.reply(500, b"")
+            return
+
+        body = self.page(self.path)
+        if body is None:
+            self.reply(404, b"")
+            return
+        self.reply(200, body)
+
+    def page(self, path:str) -> bytes | None:
+        pages = self.server.pages
+        if path == "/rankings":
+            return pages["rankings.html"]
+
+        if path.startswith("/rankings/"):
+            # Ids de times distintos por região: o Id do fixture somado a um deslocamento da região
+            offset = self.server.regionOffset(path.split("/")[-1])
+            region = path.split("/")[-1].replace("-", " ").title().encode()
+            body = re.sub(rb"/team/(\d+)/", lambda m: b"/team/%d/" % (int(m.group(1)) + offset), pages["ranking_europe.html"])
+            return body.replace(b"Europe", region)
+
+        match = re.match(r"/team/(?:(matches|stats)/)?(\d+)/([^/?#]*)", path)
+        if match is None:
+            return None
+        name = {"matches": "team_matches.html", "stats": "team_stats.html"}.get(match.group(1), "team.html")
+        body = pages[name].replace(FIXTURE_TEAM_ID, match.group(2).encode())
+        return body.replace(b"/" + FIXTURE_TEAM_SLUG, b"/" + (match.group(3).encode() or FIXTURE_TEAM_SLUG))
+
+    def reply(self, status:int, body:bytes, headers:dict|None=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency:float=0.0, jitter:float=0.0, error_rate:float=0.0, throttle_rate:float=0.0, seed:int=0):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.pages = {name: loadFixture(name) for name in os.listdir(FIXTURES) if name.endswith(".html")}
+        self.requests = 0
+        self._regions : dict[str, int] = dict()
+        self._random = random.Random(seed)
+        self._lock = Lock()
+
+    def random(self, low:float, high:float) -> float:
+        with self._lock:
+            return self._random.uniform(low, high)
+
+    def countRequest(self):
+        with self._lock:
+            self.requests += 1
+
+    def regionOffset(self, region:str) -> int:
+        with self._lock:
+            return self._regions.setdefault(region, len(self._regions) * 100000)
+
+    def start(self) -> str:
+        Thread(target=self.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+def currentCommit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def runBenchmark(args) -> dict:
+    '''
+        Executa o scraper contra o servidor substituto e retorna os resultados.
+    '''
+    commit = currentCommit()
+    server = StandInServer(args.latency, args.jitter, args.error_rate, args.throttle_rate, args.seed)
+    host = server.start()
+
+    # O scraper usa o endereço do servidor substituto no lugar do vlr.gg
+    scraper_class = type("BenchmarkScraper", (VLRGGScraper,), {"host": host})
+    timer = None
+
+    METRICS.reset()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            scraper = scraper_class("dataset.jsonl", args.workers, args.rate, args.burst, args.engine, args.concurrency,
+                                    None, False, args.pipeline, args.team_workers, args.parse_processes, None, "ERROR",
+                                    prefetch=not args.no_prefetch)
+            # Limite de tempo: a coleta é interrompida como por um Ctrl+C
+            timer = Timer(args.time_limit, scraper.interrupt) if args.time_limit else None
+            if timer is not None:
+                timer.daemon = True
+                timer.start()
+            start = perf_counter()
+            code = scraper.run()
+            elapsed = perf_counter() - start
+            teams = len(scraper.data_manager.teams)
+        finally:
+            if timer is not None:
+                timer.cancel()
+            os.chdir(cwd)
+            server.shutdown()
+            server.server_close()
+
+    downloads = scraper.downloader.getStats()["requests"]
+    parse = {}
+    for name, labels, histogram in METRICS.histograms():
+        if name in ("parse_seconds", "pipeline_parse_seconds") and histogram.count:
+            label = labels.get("method") or labels.get("function")
+            parse[label] = {"count": histogram.count, "total": round(histogram.sum, 4), "avg_ms": round(histogram.sum/histogram.count*1000, 3)}
+
+    return {
+        "commit": commit,
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "code": code,
+        "timed_out": scraper.interrupted,
+        "teams": teams,
+        "requests": server.requests,
+        "pages": downloads,
+        "elapsed": round(elapsed, 3),
+        "pages_per_second": round(downloads / elapsed, 2) if elapsed else 0.0,
+        # ru_maxrss em KiB no Linux; os processos de processamento (modo pipeline) são contabilizados à parte
+        "peak_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_rss_children_mib": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1) if args.pipeline else None,
+        "parse": parse,
+    }
+
+
+def printResults(results:dict, baseline:dict|None=None):
+    def delta(key, higher_is_better=False):
+        if baseline is None or not baseline.get(key):
+            return ""
+        change = (results[key] - baseline[key]) / baseline[key] * 100
+        worse = change < 0 if higher_is_better else change > 0
+        return f" ({change:+.1f}%{' REGRESSION' if worse and abs(change) > 10 else ''})"
+
+    print("="*70)
+    print(f"Commit: {results['commit']}" + (f" (baseline {baseline['commit']})" if baseline else ""))
+    print(f"Exit code: {results['code']}, teams collected: {results['teams']}, server requests: {results['requests']}")
+    if results.get("timed_out"):
+        print(f"TIMED OUT after {results['config']['time_limit']:.0f}s: partial results, not comparable to a complete crawl")
+    print(f"Crawl time: {results['elapsed']:.2f}s" + delta("elapsed"))
+    print(f"Pages/s: {results['pages_per_second']:.2f}" + delta("pages_per_second", higher_is_better=True))
+    children = f" (parse processes {results['peak_rss_children_mib']:.1f} MiB)" if results["peak_rss_children_mib"] is not None else ""
+    print(f"Peak RSS: {results['peak_rss_mib']:.1f} MiB{children}" + delta("peak_rss_mib"))
+    print("-"*70)
+    print(f"{'extractor':<34} {'count':>7} {'total (s)':>10} {'avg (ms)':>10}")
+    for name, stats in sorted(results["parse"].items()):
+        change = ""
+        if baseline and name in baseline.get("parse", {}) and baseline["parse"][name]["avg_ms"]:
+            change = f" {(stats['avg_ms'] - baseline['parse'][name]['avg_ms']) / baseline['parse'][name]['avg_ms'] * 100:+.1f}%"
+        print(f"{name:<34} {stats['count']:>7} {stats['total']:>10.3f} {stats['avg_ms']:>10.3f}{change}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", required=False, type=float, default=0.02, help="Server latency per request, in seconds")
+    parser.add_argument("--jitter", required=False, type=float, default=0.0, help="Random extra latency per request, up to this many seconds")
+    parser.add_argument("--error-rate", required=False, type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--throttle-rate", required=False, type=float, default=0.0, help="Fraction of requests answered with HTTP 429")
+    parser.add_argument("--seed", required=False, type=int, default=0, help="Seed of the server random draws")
+    parser.add_argument("-w", "--workers", required=False, type=int, default=8, help="Number of download worker threads")
+    parser.add_argument("-r", "--rate", required=False, type=float, default=200.0, help="Maximum number of requests per second")
+    parser.add_argument("-b", "--burst", required=False, type=int, default=20, help="Maximum number of requests sent in a burst")
+    parser.add_argument("-e", "--engine", required=False, type=str, choices=["threads", "async"], default="threads", help="Download engine")
+    parser.add_argument("-c", "--concurrency", required=False, type=int, default=100, help="Maximum number of simultaneous requests in the async engine")
+    parser.add_argument("-p", "--pipeline", action="store_true", help="Run the pipelined team processing")
+    parser.add_argument("--team-workers", required=False, type=int, default=8, help="Number of teams processed concurrently in pipeline mode")
+    parser.add_argument("--parse-processes", required=False, type=int, default=None, help="Number of parsing processes in pipeline mode")
+    parser.add_argument("--no-prefetch", action="store_true", help="Disable the speculative prefetch of the team matchlist and statistics pages")
+    parser.add_argument("--time-limit", required=False, type=float, default=600.0, help="Interrupt the crawl after this many seconds (0 disables the limit)")
+    parser.add_argument("-o", "--output", required=False, type=str, default=None, help="Save the results to this JSON file")
+    parser.add_argument("--compare", required=False, type=str, default=None, help="Compare the results with a previously saved JSON file")
+    args = parser.parse_args()
+
+    results = runBenchmark(args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, mode="r") as file:
+            baseline = json.load(file)
+    printResults(results, baseline)
+
+    if args.output:
+        with open(args.output, mode="w") as file:
+            json.dump(results, file, indent=4)
+
+    sys.exit(0 if results["code"] == 0 else 1)
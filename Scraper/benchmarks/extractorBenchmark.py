@@ -0,0 +1,97 @@
+'''
+    Micro-benchmark dos extratores de dados sobre as páginas sintéticas de `benchmarks/fixtures`
+    (ver `benchmarks.fixturePages`), com as datas relativas ao dia atual, ou sobre páginas reais
+    salvas do vlr.gg (`--pages`).
+
+    Compara o tempo de extração por time com o do caminho original (`benchmarks.originalExtractor`:
+    uma passagem completa do `html.parser` por campo e seletores `nth-child`) e, para cada parser disponível:
+        - "separado": uma chamada (e um processamento do HTML) por campo, com o DataExtractor atual
+        - "única":    a página do time processada uma única vez com `extractTeamPage`
+
+    O ganho é a razão entre o tempo do caminho original e o de cada modo. Nas páginas sintéticas, a passagem única
+    com o lxml é de 2.2x a 2.4x mais rápida que o caminho original, abaixo da meta de 3x: uma melhoria parcial, e a
+    maior parte do tempo restante é o processamento dos cartões da página de partidas. Esse resultado não vale para
+    as páginas reais, que devem ser medidas com `--pages`.
+
+    Uso (a partir do diretório Scraper):
+        python -m benchmarks.extractorBenchmark [-n REPETICOES] [--pages DIRETORIO]
+
+    O diretório de `--pages` deve conter as páginas de um time salvas do site: "team.html" (/team/<id>/<nome>),
+    "team_matches.html" (/team/matches/<id>/<nome>) e "team_stats.html" (/team/stats/<id>/<nome>).
+'''
+import os
+import argparse
+from time import perf_counter
+
+from src.dataExtractor import DataExtractor
+from benchmarks.fixturePages import loadFixture
+from benchmarks.originalExtractor import OriginalExtractor
+
+
+def originalPasses(extractor:OriginalExtractor, team, matches, stats):
+    extractor.extractTeamInfo(team)
+    extractor.extractTeamMatchlistPage(team)
+    extractor.extractTeamStatsPage(team)
+    extractor.extractTeamRecentMatchesResult(matches)
+    extractor.extractTeamMapsStats(stats)
+
+
+def separatePasses(extractor:DataExtractor, team, matches, stats):
+    extractor.extractTeamInfo(team)
+    extractor.extractTeamMatchlistPage(team)
+    extractor.extractTeamStatsPage(team)
+    extractor.extractTeamRecentMatchesResult(matches)
+    extractor.extractTeamMapsStats(stats)
+
+
+def singlePass(extractor:DataExtractor, team, matches, stats):
+    extractor.extractTeamPage(team)
+    extractor.extractTeamRecentMatchesResult(matches)
+    extractor.extractTeamMapsStats(stats)
+
+
+def availableParsers() -> list[str]:
+    parsers = ["html.parser"]
+    try:
+        import lxml
+        parsers.append("lxml")
+    except ImportError:
+        pass
+    return parsers
+
+
+def measure(function, extractor, pages, repetitions:int) -> float:
+    '''
+        Retorna o tempo médio (em milissegundos) de uma execução da função.
+    '''
+    start = perf_counter()
+    for _ in range(repetitions):
+        function(extractor, *pages)
+    return (perf_counter() - start)/repetitions*1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--repetitions", required=False, type=int, default=20, help="Number of simulated teams per measurement")
+    parser.add_argument("--pages", required=False, type=str, default=None, help="Directory with team.html, team_matches.html and team_stats.html saved from vlr.gg (default: the synthetic fixtures)")
+    args = parser.parse_args()
+
+    names = ("team.html", "team_matches.html", "team_stats.html")
+    if args.pages:
+        pages = []
+        for name in names:
+            with open(os.path.join(args.pages, name), mode="rb") as file:
+                pages.append(file.read())
+        print(f"Pages saved from vlr.gg in '{args.pages}'")
+    else:
+        pages = [loadFixture(name) for name in names]
+        print("Synthetic fixture pages (use --pages to measure pages saved from vlr.gg)")
+
+    baseline = measure(originalPasses, OriginalExtractor(), pages, args.repetitions)
+    print(f"{'parser':<12} {'mode':<10} {'ms/team':>10} {'speedup':>8}")
+    print(f"{'html.parser':<12} {'original':<10} {baseline:>10.2f} {1:>7.2f}x")
+    for backend in availableParsers():
+        extractor = DataExtractor(backend)
+        for mode, function in (("separate", separatePasses), ("single", singlePass)):
+            elapsed = measure(function, extractor, pages, args.repetitions)
+            print(f"{backend:<12} {mode:<10} {elapsed:>10.2f} {baseline/elapsed:>7.2f}x")
@@ -0,0 +1,31 @@
+'''
+    Páginas usadas pelos benchmarks (`benchmarks/fixtures`).
+
+    As páginas são sintéticas: reproduzem a estrutura HTML das páginas do vlr.gg usada pelos extratores
+    (rankings, página, partidas e estatísticas de um time), mas com conteúdo gerado (nomes de eventos,
+    tópicos de discussão, placares), e não foram gravadas do site.
+
+    As datas das páginas são deslocadas de forma que a partida mais recente seja a do dia atual. Como a janela
+    de resultados recentes é calculada a partir da data atual, o número de partidas processadas (e, portanto,
+    o trabalho medido) não depende do dia em que o benchmark é executado.
+'''
+import os
+import re
+from datetime import date
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Data da partida mais recente da página de partidas
+FIXTURE_LATEST_MATCH = date(2026, 9, 30)
+FIXTURE_DATE = re.compile(rb"(\d{4})/(\d{2})/(\d{2})")
+
+
+def loadFixture(name:str, today:date|None=None) -> bytes:
+    '''
+        Lê uma página, com as datas deslocadas para que a partida mais recente seja em `today` (por padrão, o dia atual).
+    '''
+    with open(os.path.join(FIXTURES, name), mode="rb") as file:
+        body = file.read()
+
+    shift = (today or date.today()) - FIXTURE_LATEST_MATCH
+    return FIXTURE_DATE.sub(lambda m: (date(int(m.group(1)), int(m.group(2)), int(m.group(3))) + shift).strftime("%Y/%m/%d").encode(), body)
@@ -1,13 +1,66 @@
+import os
+import socket
 import argparse
 
 from src.scraper import VLRGGScraper
+from src.frontier import Frontier
+
+
+def positiveFloat(value:str) -> float:
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive number")
+    return number
+
+def positiveInt(value:str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return number
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("-f", "--filename", required=False, type=str, default="./VLRGG_Scraper_Dataset.json", help="The name of the output file with data collected by the WebScraper")
+    parser.add_argument("-f", "--filename", required=False, type=str, default="./VLRGG_Scraping_Dataset.jsonl", help="The name of the output file with data collected by the WebScraper (.jsonl for an append-only dataset, .db/.sqlite for a SQLite database, .json for a single JSON document). A new .jsonl/.db dataset starts from the .json dataset with the same name, if there is one")
+    parser.add_argument("-w", "--workers", required=False, type=positiveInt, default=5, help="Number of download worker threads")
+    parser.add_argument("-r", "--rate", required=False, type=positiveFloat, default=2.0, help="Maximum number of requests per second")
+    parser.add_argument("-b", "--burst", required=False, type=positiveInt, default=5, help="Maximum number of requests sent in a burst")
+    parser.add_argument("-e", "--engine", required=False, type=str, choices=["threads", "async"], default="threads", help="Download engine: worker threads with cloudscraper or asyncio with aiohttp")
+    parser.add_argument("-c", "--concurrency", required=False, type=positiveInt, default=100, help="Maximum number of simultaneous requests in the async engine")
+    parser.add_argument("--cache-dir", required=False, type=str, default="./.vlrgg_cache", help="Directory of the on-disk page cache")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the on-disk page cache")
+    parser.add_argument("--offline", action="store_true", help="Only replay pages from the cache, without accessing the network")
+    parser.add_argument("-p", "--pipeline", action="store_true", help="Process the teams of all rankings concurrently, parsing pages in a process pool")
+    parser.add_argument("--team-workers", required=False, type=positiveInt, default=8, help="Number of teams processed concurrently in pipeline mode")
+    parser.add_argument("--parse-processes", required=False, type=positiveInt, default=None, help="Number of parsing processes in pipeline mode (default: number of CPUs)")
+    parser.add_argument("--refresh-after", required=False, type=float, default=None, help="Collect again teams whose records are older than this many hours (default: never)")
+    parser.add_argument("--log-level", required=False, type=str.upper, choices=["DEBUG", "INFO", "WARNING", "ERROR"], default="INFO", help="Minimum level of the events written to the log")
+    parser.add_argument("--metrics-file", required=False, type=str, default=None, help="Write the performance histograms to this file in the Prometheus text format")
+    parser.add_argument("--max-attempts", required=False, type=positiveInt, default=5, help="Maximum number of download attempts per page for throttled, server and network errors")
+    parser.add_argument("--resume", action="store_true", help="Continue the interrupted crawl from its checkpoint")
+    parser.add_argument("--checkpoint-file", required=False, type=str, default=None, help="File of the crawl checkpoint (default: the dataset filename with the '.checkpoint.json' extension)")
+    parser.add_argument("--checkpoint-interval", required=False, type=float, default=60.0, help="Seconds between checkpoints of the crawl state (0 disables periodic checkpoints)")
+    parser.add_argument("--mode", required=False, type=str, choices=["standalone", "coordinator", "worker"], default="standalone", help="Crawl alone, coordinate a multi-process crawl on this host (merging the teams into the dataset) or work for a coordinator")
+    parser.add_argument("--frontier", required=False, type=str, default=None, help="SQLite file of the distributed crawl frontier, shared by the coordinator and the workers on the same host, not on a network filesystem (default: the dataset filename with the '.frontier.db' extension)")
+    parser.add_argument("--worker-id", required=False, type=str, default=f"{socket.gethostname()}-{os.getpid()}", help="Name of this worker in the distributed crawl")
+    parser.add_argument("--lease-seconds", required=False, type=positiveFloat, default=60.0, help="Seconds before the work units of a silent worker are handed to another worker")
+    parser.add_argument("--lease-batch", required=False, type=positiveInt, default=8, help="Number of work units leased by a worker at a time")
+    parser.add_argument("--no-prefetch", action="store_true", help="Only download the matchlist and statistics pages of a team after parsing its page, instead of predicting them from the team URL")
     args = parser.parse_args()
 
-    app = VLRGGScraper(args.filename)
-    code = app.run()
+    refresh_after = args.refresh_after*60*60 if args.refresh_after is not None else None
+
+    cache_dir = None if args.no_cache else args.cache_dir
+
+    checkpoint_file = args.checkpoint_file or os.path.splitext(args.filename)[0] + ".checkpoint.json"
+
+    app = VLRGGScraper(args.filename, args.workers, args.rate, args.burst, args.engine, args.concurrency, cache_dir, args.offline, args.pipeline, args.team_workers, args.parse_processes, refresh_after, args.log_level, args.metrics_file, args.max_attempts, checkpoint_file, args.resume, args.checkpoint_interval, not args.no_prefetch)
+    if args.mode == "standalone":
+        code = app.run()
+    else:
+        frontier = Frontier(args.frontier or os.path.splitext(args.filename)[0] + ".frontier.db", args.lease_seconds)
+        if args.mode == "coordinator":
+            code = app.coordinate(frontier)
+        else:
+            code = app.work(frontier, args.worker_id, args.lease_batch)
 
     exit(code)
\ No newline at end of file
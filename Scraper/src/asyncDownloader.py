@@ -0,0 +1,153 @@
+import asyncio
+from threading import Semaphore, Thread
+from time import monotonic
+
+from src.downloader import BaseDownloader
+from src.request import Request
+from src.response import PageResponse
+from src.retryPolicy import NETWORK_ERROR_STATUS
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncDownloader(BaseDownloader):
+    '''
+        Downloader baseado em asyncio.
+
+        Um event loop em uma thread dedicada mantém até `concurrency` requisições simultâneas,
+        reaproveitando conexões HTTP (keep-alive). Uma thread alimentadora retira as requisições
+        do escalonador, respeitando a prioridade e o limitador de taxa, e as envia ao event loop.
+
+        O tratamento das respostas (cache com compressão e escrita em disco) é executado fora do event loop,
+        no executor padrão, para não atrasar as demais requisições.
+
+        Mantém a mesma interface do Downloader (`addToQueue`/`getResponse`).
+    '''
+
+    def __init__(self, host, event_log, rate:float=2.0, burst:int=5, concurrency:int=100, cache=None, retry_policy=None, breaker=None):
+        if aiohttp is None:
+            raise RuntimeError("The async download engine requires the 'aiohttp' package!")
+
+        super().__init__(host, event_log, rate, burst, cache, retry_policy, breaker)
+        self.concurrency = concurrency
+        self._slots = Semaphore(concurrency)
+        self._loop = asyncio.new_event_loop()
+        self._session = None
+        self._loop_thread = Thread(target=self._runLoop, daemon=True)
+        self._feeder_thread = Thread(target=self._feed, daemon=True)
+
+    def start(self, workers:int|None=None):
+        '''
+            Inicializa o event loop e a thread alimentadora. O número de requisições simultâneas
+            é limitado por `concurrency`, então `workers` é ignorado.
+        '''
+        self._loop_thread.start()
+        asyncio.run_coroutine_threadsafe(self._openSession(), self._loop).result()
+        self._feeder_thread.start()
+
+    def _runLoop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _openSession(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=30)
+        self._session = aiohttp.ClientSession(connector=connector, headers={"User-Agent": "*"})
+
+    def _feed(self):
+        '''
+            Retira as requisições do escalonador e as envia ao event loop,
+            respeitando o limite de requisições simultâneas e o limitador de taxa.
+        '''
+        while True:
+            self._slots.acquire()
+
+            request = self.scheduler.get()
+
+            # Escalonador fechado: não há mais requisições a serem feitas
+            if request is None:
+                self._slots.release()
+                break
+
+            # Páginas atualizadas no cache não passam pelo limitador de taxa
+            cached, conditional_headers = self.fromCache(request)
+            if cached is not None:
+                self.storeResponse(request, cached)
+                self._slots.release()
+                continue
+
+            self.breaker.acquire()
+            self.acquireRate()
+            future = asyncio.run_coroutine_threadsafe(self._fetch(request, conditional_headers), self._loop)
+            future.add_done_callback(lambda future, url=request.getUrl(): self._fetchDone(future, url))
+
+    async def _fetch(self, request:Request, headers:dict):
+        '''
+            Efetua uma requisição de forma assíncrona.
+
+            Qualquer erro durante a requisição é tratado como um erro de rede, e a requisição é sempre finalizada.
+        '''
+        self.startRequest()
+        start = monotonic()
+        try:
+            async with self._session.get(self.host+request.getUrl(), headers=headers, allow_redirects=True) as resp:
+                content = await resp.read()
+                response = PageResponse(str(resp.url), resp.status, dict(resp.headers), content)
+        except Exception as e:
+            self.log(f"{request.getUrl()} download raised {e!r}!", "WARNING", url=request.getUrl(), stage="download",
+                     duration=round(monotonic() - start, 4))
+            response = PageResponse(self.host+request.getUrl(), NETWORK_ERROR_STATUS, dict(), b"")
+        finally:
+            self._slots.release()
+
+        await asyncio.get_running_loop().run_in_executor(None, self.finishRequest, request, response, monotonic() - start)
+
+    def _fetchDone(self, future, url:str):
+        '''
+            Registra erros não tratados de uma requisição assíncrona.
+        '''
+        if future.cancelled():
+            self.log(f"{url} download was cancelled!", "WARNING", url=url, stage="download")
+        elif future.exception() is not None:
+            self.log(f"{url} download task raised {future.exception()!r}!", "ERROR", url=url, stage="download")
+
+    def join(self, timeout:float|None=None):
+        '''
+            Espera o encerramento dos downloads após `close`, na ordem: thread alimentadora, requisições em andamento
+            no event loop, sessão HTTP e event loop. Requisições não finalizadas em `timeout` segundos são canceladas.
+        '''
+        deadline = None if timeout is None else monotonic() + timeout
+        self._feeder_thread.join(timeout)
+        if not self._loop.is_running():
+            return
+
+        remaining = None if deadline is None else max(0.0, deadline - monotonic())
+        asyncio.run_coroutine_threadsafe(self._drain(remaining), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+
+    async def _drain(self, timeout:float|None):
+        '''
+            Espera as requisições em andamento (cancelando as que excederem `timeout` segundos) e fecha a sessão HTTP.
+        '''
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            if pending:
+                self.log(f"{len(pending)} downloads still in flight after {timeout:.0f}s, cancelling them", "WARNING", stage="download")
+                for task in pending:
+                    task.cancel()
+                await asyncio.wait(pending)
+
+        if self._session:
+            await self._session.close()
+
+    def close(self):
+        '''
+            Encerra o escalonador e acorda a thread alimentadora. As requisições em andamento são finalizadas em `join`.
+        '''
+        super().close()
+        # A thread alimentadora pode estar esperando por uma vaga: uma vaga extra a libera para encerrar
+        self._slots.release()
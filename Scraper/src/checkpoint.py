@@ -0,0 +1,155 @@
+import os
+import json
+from datetime import datetime
+from threading import Lock
+
+
+class Checkpoint:
+    '''
+        Estado da coleta, salvo periodicamente em disco para que uma execução interrompida possa ser retomada.
+
+        O estado contém:
+            - O progresso de cada ranking: região, times selecionados (rank, url, id) e Ids dos times já coletados
+            - As URLs pendentes (na fila, em andamento ou baixadas e ainda não processadas), com as suas prioridades
+            - Os registros de times e de partidas ainda não gravados no Dataset
+
+        As URLs já processadas ficam apenas em memória, para filtrar as pendentes, e são descartadas
+        a cada salvamento assim que deixam de estar pendentes: o arquivo não cresce com a coleta.
+
+        O arquivo é reescrito em um arquivo temporário e substituído atomicamente.
+    '''
+    VERSION = 1
+
+    def __init__(self, filename:str|None):
+        self.filename = filename
+        self.rankings : dict[str, dict | None] = dict()
+        self.completed : set[str] = set()
+        self.pending : list[tuple[str, int]] = list()
+        self.unsaved_teams : list[dict] = list()
+        self.unsaved_matches : list[dict] = list()
+        self.saved_at = None
+        self._lock = Lock()
+
+    def exists(self) -> bool:
+        return self.filename is not None and os.path.exists(os.path.abspath(self.filename))
+
+    def load(self) -> bool:
+        '''
+            Carrega o estado salvo. Retorna False se não houver um checkpoint válido.
+        '''
+        if not self.exists():
+            return False
+
+        try:
+            with open(self.filename, mode="r", encoding="utf-8") as file:
+                state = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return False
+        if state.get("version") != self.VERSION:
+            return False
+
+        with self._lock:
+            self.rankings = {
+                ranking: None if progress is None else {
+                    "region": progress["region"],
+                    "teams": [tuple(team) for team in progress["teams"]],
+                    "done": set(progress["done"]),
+                }
+                for ranking, progress in state["rankings"].items()
+            }
+            self.completed = set()
+            self.pending = [tuple(item) for item in state["pending"]]
+            self.unsaved_teams = state["unsaved_teams"]
+            self.unsaved_matches = state.get("unsaved_matches", [])
+            self.saved_at = state["saved_at"]
+        return True
+
+    def save(self, pending:list[tuple[str, int]], unsaved_teams:list[dict], unsaved_matches:list[dict]=()):
+        '''
+            Salva o estado atual, junto com as URLs pendentes e os times e partidas ainda não gravados no Dataset.
+        '''
+        if self.filename is None:
+            return
+
+        with self._lock:
+            # Apenas as URLs processadas que ainda aparecem como pendentes precisam ser lembradas
+            self.completed.intersection_update(url for url, _ in pending)
+            state = {
+                "version": self.VERSION,
+                "saved_at": datetime.now().isoformat(timespec="seconds"),
+                "rankings": {
+                    ranking: None if progress is None else {
+                        "region": progress["region"],
+                        "teams": progress["teams"],
+                        "done": sorted(progress["done"]),
+                    }
+                    for ranking, progress in self.rankings.items()
+                },
+                "pending": [[url, priority] for url, priority in pending if url not in self.completed],
+                "unsaved_teams": unsaved_teams,
+                "unsaved_matches": list(unsaved_matches),
+            }
+
+        temp_filename = f"{self.filename}.tmp"
+        with open(temp_filename, mode="w", encoding="utf-8") as output:
+            json.dump(state, output, ensure_ascii=False)
+            output.flush()
+            os.fsync(output.fileno())
+        os.replace(temp_filename, self.filename)
+
+    def remove(self):
+        '''
+            Remove o checkpoint (coleta finalizada).
+        '''
+        if self.exists():
+            os.remove(self.filename)
+
+    def setRankings(self, rankings:list[str]):
+        with self._lock:
+            for ranking in rankings:
+                self.rankings.setdefault(ranking, None)
+
+    def getRankings(self) -> list[str]:
+        with self._lock:
+            return list(self.rankings)
+
+    def startRanking(self, ranking:str, region:str, teams:list[tuple[int, str, str]]):
+        '''
+            Registra a região e os times selecionados de um ranking.
+        '''
+        with self._lock:
+            self.rankings[ranking] = {"region": region, "teams": [tuple(team) for team in teams], "done": set()}
+
+    def getRanking(self, ranking:str) -> tuple[str, list[tuple[int, str, str]]] | None:
+        '''
+            Retorna a região e os times ainda não coletados de um ranking, ou None se o ranking ainda não foi extraído.
+        '''
+        with self._lock:
+            progress = self.rankings.get(ranking)
+            if progress is None:
+                return None
+            return progress["region"], [team for team in progress["teams"] if team[2] not in progress["done"]]
+
+    def teamDone(self, ranking:str, team_id:str):
+        with self._lock:
+            progress = self.rankings.get(ranking)
+            if progress is not None:
+                progress["done"].add(team_id)
+
+    def urlCompleted(self, url:str):
+        with self._lock:
+            self.completed.add(url)
+
+    def getStats(self) -> dict:
+        '''
+            Retorna o número de rankings extraídos e de times coletados e restantes.
+        '''
+        with self._lock:
+            extracted = [progress for progress in self.rankings.values() if progress is not None]
+            done = sum(len(progress["done"]) for progress in extracted)
+            return {
+                "rankings": len(self.rankings),
+                "extracted": len(extracted),
+                "done": done,
+                "remaining": sum(len(progress["teams"]) for progress in extracted) - done,
+            }
@@ -0,0 +1,80 @@
+from threading import Condition
+from time import monotonic
+
+
+class CircuitBreaker:
+    '''
+        Disjuntor de requisições para o host.
+
+        Após `failure_threshold` falhas consecutivas, o disjuntor abre e nenhuma requisição é enviada
+        durante `reset_timeout` segundos. Depois disso, uma única requisição de teste é liberada: se ela
+        tiver sucesso o disjuntor fecha, caso contrário ele volta a abrir.
+    '''
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold:int=10, reset_timeout:float=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._trips = 0
+        self._condition = Condition()
+
+    def acquire(self, timeout:float|None=None) -> bool:
+        '''
+            Espera até que uma requisição possa ser enviada. Retorna False se o tempo de espera se esgotar.
+        '''
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._state == self.CLOSED:
+                    return True
+
+                now = monotonic()
+                if self._state == self.OPEN and now >= self._opened_at + self.reset_timeout:
+                    self._state = self.HALF_OPEN
+                if self._state == self.HALF_OPEN and not self._probing:
+                    # Esta é a requisição de teste
+                    self._probing = True
+                    return True
+
+                wait = self._opened_at + self.reset_timeout - now if self._state == self.OPEN else None
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return False
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._condition.wait(wait)
+
+    def recordSuccess(self):
+        with self._condition:
+            self._failures = 0
+            if self._state != self.CLOSED:
+                self._state = self.CLOSED
+                self._probing = False
+                self._condition.notify_all()
+
+    def recordFailure(self) -> bool:
+        '''
+            Registra uma falha. Retorna True se o disjuntor abriu com esta falha.
+        '''
+        with self._condition:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (self._state == self.CLOSED and self._failures >= self.failure_threshold):
+                self._state = self.OPEN
+                self._opened_at = monotonic()
+                self._probing = False
+                self._trips += 1
+                self._condition.notify_all()
+                return True
+            return False
+
+    def getState(self) -> str:
+        return self._state
+
+    def getTrips(self) -> int:
+        return self._trips
@@ -1,22 +1,45 @@
 import re
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime, timedelta
 
+from src.metrics import METRICS
+
+try:
+    import lxml
+    DEFAULT_PARSER = "lxml"
+except ImportError:
+    DEFAULT_PARSER = "html.parser"
+
 
 class DataExtractor:
     '''
         Classe responsável pela extração de dados de páginas HTML.
+
+        Utiliza o parser do lxml quando ele estiver instalado, por ser mais rápido que o `html.parser`.
+        Todos os métodos de extração aceitam tanto o conteúdo da página quanto um HTML já processado.
+
+        O tempo de processamento é registrado no histograma `parse_seconds` apenas pelos métodos usados pelo scraper
+        para cada página (ex.: `extractTeamPage`), e não pelos métodos que eles chamam, evitando contar o mesmo tempo duas vezes.
     '''
+
+    def __init__(self, parser:str|None=None):
+        self.parser = parser or DEFAULT_PARSER
     
-    def getHTML(self, webpage):
+    def getHTML(self, webpage, parse_only:SoupStrainer|None=None):
         '''
             Recebe o conteúdo de uma página web e retorna o HTML manipulável via BeautifulSoup.
+
+            Caso a página já tenha sido processada, retorna o próprio HTML. Se `parse_only` for
+            informado, apenas os elementos correspondentes são processados.
         '''
-        return BeautifulSoup(webpage, "html.parser")
+        if isinstance(webpage, BeautifulSoup):
+            return webpage
+        return BeautifulSoup(webpage, self.parser, parse_only=parse_only)
 
     def cleanText(self, text):
         return " ".join(text.split())
 
+    @METRICS.timed("parse_seconds")
     def extractRegionalRankingsPaths(self, webpage):
         '''
             Extrai e retorna as URLs dos rankings regionais da página de rankings principal.
@@ -27,6 +50,7 @@ class DataExtractor:
 
         return urls
 
+    @METRICS.timed("parse_seconds")
     def extractTeamsFromRanking(self, webpage):
         '''
             Extrai e retorna as URLs dos 100 primeiros times listados nos rankings regionais e a região do ranking.
@@ -46,6 +70,26 @@ class DataExtractor:
 
         return urls, region
 
+    def extractTeamId(self, url):
+        '''
+            Extrai e retorna o ID de um time a partir da URL da sua página (ex.: "/team/1001/team-heretics").
+        '''
+        team_id = re.search(r"/team/(?:\w+/)?(\d+)", url) or re.search(r"(\d+)", url)
+        return team_id.group(1)
+
+    def predictTeamPages(self, url):
+        '''
+            Prevê as URLs das páginas de partidas e de estatísticas de um time a partir da URL da sua página
+            (ex.: "/team/1001/team-heretics" -> "/team/matches/1001/team-heretics/" e "/team/stats/1001/team-heretics/").
+
+            Retorna None se a URL não seguir o padrão esperado.
+        '''
+        match = re.fullmatch(r"/team/(\d+)/([^/?#]+)/?", url)
+        if match is None:
+            return None
+        team_id, slug = match.groups()
+        return f"/team/matches/{team_id}/{slug}/", f"/team/stats/{team_id}/{slug}/"
+
     def extractTeamInfo(self, webpage):
         '''
             Extrai e retorna as seguintes informações, dada a página de um time:
@@ -114,6 +158,24 @@ class DataExtractor:
 
         return name, players, coach
 
+    @METRICS.timed("parse_seconds")
+    def extractTeamPage(self, webpage):
+        '''
+            Extrai e retorna, processando a página de um time uma única vez:
+                - Nome do time
+                - Jogadores (se houver)
+                - Técnico (se houver)
+                - URL da página de partidas
+                - URL da página de estatísticas
+        '''
+        html = self.getHTML(webpage)
+
+        name, players, coach = self.extractTeamInfo(html)
+        matchlist_page = self.extractTeamMatchlistPage(html)
+        stats_page = self.extractTeamStatsPage(html)
+
+        return name, players, coach, matchlist_page, stats_page
+
     def extractTeamMatchlistPage(self, webpage):
         '''
             Extrai e retorna a URL da página de partidas, dada a página de um time.
@@ -132,86 +194,185 @@ class DataExtractor:
         stats_div = html.find("a", class_="wf-nav-item mod-stats")
         return stats_div["href"]
 
-    def extractTeamRecentMatchesResult(self, webpage):
+    # Elementos necessários da página de partidas: cartões das partidas, mapas jogados e paginação
+    matchlist_strainer = SoupStrainer(["a", "div", "span"], class_=re.compile(r"(^|\s)(m-item|m-item-games|mod-page)(\s|$)"))
+    matchlist_date = re.compile(r'class="m-item-date"[^>]*>\s*<div[^>]*>\s*(\d{4}/\d{2}/\d{2})')
+    matchlist_card = re.compile(r'<a[\s][^>]*class="(?:[^"]*\s)?m-item(?:\s[^"]*)?"')
+    match_id = re.compile(r"/(\d+)/")
+
+    def extractMatchId(self, url):
+        '''
+            Extrai e retorna o ID de uma partida a partir da URL da sua página (ex.: "/420000/team-heretics-vs-natus-vincere").
+        '''
+        match_id = self.match_id.match(url)
+        return match_id.group(1) if match_id else url
+
+    def truncateMatchlist(self, webpage, cutoff:datetime):
         '''
-            Extrai e retorna, dada a página de partidas de um time, as seguintes informações:
-                - Data da partida
-                - Serie, ou número de mapas jogados (se houver)
-                - Oponente
+            Recebe o conteúdo de uma página de partidas e o retorna truncado no início da primeira
+            partida anterior à data de corte, evitando processar partidas fora da janela.
+
+            Retorna o conteúdo original caso nenhuma partida anterior à data de corte seja encontrada.
+        '''
+        if isinstance(webpage, bytes):
+            text = webpage.decode("utf-8", errors="replace")
+        elif isinstance(webpage, str):
+            text = webpage
+        else:
+            return webpage
+
+        for date in self.matchlist_date.finditer(text):
+            if datetime.strptime(date.group(1), "%Y/%m/%d") < cutoff:
+                # O cartão da partida é o último link com a classe "m-item" aberto antes da data
+                card_start = None
+                for card in self.matchlist_card.finditer(text, 0, date.start()):
+                    card_start = card.start()
+                if card_start is not None:
+                    return text[:card_start]
+                break
+
+        return text
+
+    def extractTeamRecentMatchesResult(self, webpage, window_days:int=6*30, known=None):
+        '''
+            Extrai e retorna, dada a página de partidas de um time, os seus resultados recentes:
+                - Id da partida (extraído da URL do cartão da partida)
+                - Nome do time na partida
                 - Resultado ("win" ou "loss")
-                - Mapas jogados (se houver)
-                    - Cada mapa com as informações do nome do mapa e o placar do mapa.
+                - Partida (apenas se o Id não estiver em `known`), do ponto de vista do time:
+                    - Id, URL e data da partida
+                    - Serie, ou número de mapas jogados (se houver)
+                    - Times (o time e o oponente, com Ids ainda desconhecidos)
+                    - Placar e índice do vencedor em "Teams"
+                    - Mapas jogados (se houver), cada um com o nome do mapa e o placar do mapa
         '''
-        html = self.getHTML(webpage)
+        recent_results, _ = self.extractTeamRecentMatchesPage(webpage, window_days, known)
+        return recent_results
+
+    @METRICS.timed("parse_seconds")
+    def extractTeamRecentMatchesPage(self, webpage, window_days:int=6*30, known=None):
+        '''
+            Extrai os resultados recentes (ver `extractTeamRecentMatchesResult`) de uma página de partidas.
+
+            As partidas são listadas da mais recente para a mais antiga, então a extração termina na primeira
+            partida fora da janela de `window_days` dias e apenas os cartões das partidas são processados.
+            Os detalhes das partidas cujos Ids estão em `known` (já presentes no Dataset) não são extraídos.
+
+            Retorna os resultados e a URL da próxima página de partidas, caso todas as partidas desta página
+            estejam dentro da janela e exista uma próxima página (ou None, caso contrário).
+        '''
+        # Data de corte calculada uma única vez
+        cutoff = datetime.now() - timedelta(days=window_days)
+
+        html = self.getHTML(self.truncateMatchlist(webpage, cutoff), self.matchlist_strainer)
 
         recent_results = list()
+        window_ended = False
 
         matches = html.find_all("a", class_="wf-card fc-flex m-item")
 
         for match in matches:
-            # Verificando se a partida aconteceu nos últimos 6 meses
+            # Verificando se a partida aconteceu dentro da janela (6 meses, por padrão)
             match_date_div = match.find("div", class_="m-item-date")
             match_date = match_date_div.find("div").text.strip()
             match_date_obj = datetime.strptime(match_date, "%Y/%m/%d")
 
-            current_date = datetime.now()
-            six_months_ago = current_date - timedelta(days=6*30)
-
-            # Caso verdadeiro
-            if match_date_obj >= six_months_ago:
-                # Extrai oponente
-                oponent_name_div = match.find("div", class_="m-item-team text-of mod-right")
-                oponent_name = oponent_name_div.find("span", class_="m-item-team-name").text.strip()
-
-                # Extrai resultado
-                result_div = match.find("div", class_="m-item-result")
-                result = "loss" if "mod-loss" in result_div["class"] else "win"
-
-                # Extrai placar
-                score = result_div.text.strip()
-                series = None
-                maps = dict()
-
-                ## Se a partida aconteceu
-                if score != "FFL" and score != "FFW":
-                    # Extrai o tipo de serie (MD1, MD3, MD5)
-                    score_team_a, score_team_b = score.split(":")
-                    score_team_a = int(score_team_a)
-                    score_team_b = int(score_team_b)
-                    maps_sum = score_team_a + score_team_b
-
-                    series = 1
-                    if maps_sum == 2:
-                        series = 3
-                    elif maps_sum == 3:
-                        if score_team_a == 0 or score_team_b == 0:
-                            series = 5
-                        else:
-                            series = 3
-                    elif maps_sum == 4:
-                        series = 5
+            # Caso falso: as demais partidas são ainda mais antigas
+            if match_date_obj < cutoff:
+                window_ended = True
+                break
 
-                    # Extrai mapas jogados
-                    games_div = match.parent.find("div", class_="m-item-games")
-                    games = [] if games_div == None else games_div.find_all("a")
-                    for game in games:
-                        game_result_div = game.find("div", class_="m-item-games-result").find("div")
-                        map_name = game_result_div.find("div", class_="map").text.strip()
-                        map_score = game_result_div.find("div", class_="score").text.strip()
-                        maps[map_name] = map_score
-
-                match_item = {
-                    "date": match_date,
-                    "series": f"bo{series}" if series else "",
-                    "oponent": oponent_name,
-                    "result": result,
-                    "maps": maps
-                }
-
-                recent_results.append(match_item)
+            match_url = match["href"]
+            match_id = self.extractMatchId(match_url)
 
-        return recent_results
+            # Extrai o nome do time (à esquerda no cartão)
+            team_name_div = match.find("div", class_="m-item-team text-of")
+            team_name = team_name_div.find("span", class_="m-item-team-name").text.strip()
+
+            # Extrai resultado
+            result_div = match.find("div", class_="m-item-result")
+            result = "loss" if "mod-loss" in result_div["class"] else "win"
+
+            result_item = {"Id": match_id, "Team": team_name, "Result": result}
+            recent_results.append(result_item)
+
+            # Partida já presente no Dataset: os seus detalhes não são extraídos novamente
+            if known is not None and match_id in known:
+                continue
+
+            # Extrai oponente
+            oponent_name_div = match.find("div", class_="m-item-team text-of mod-right")
+            oponent_name = oponent_name_div.find("span", class_="m-item-team-name").text.strip()
+
+            # Extrai placar
+            score = result_div.text.strip()
+            series = None
+            match_score = None
+            maps = list()
+
+            ## Se a partida aconteceu
+            if score != "FFL" and score != "FFW":
+                # Extrai o tipo de serie (MD1, MD3, MD5)
+                score_team_a, score_team_b = score.split(":")
+                score_team_a = int(score_team_a)
+                score_team_b = int(score_team_b)
+                match_score = [score_team_a, score_team_b]
+                maps_sum = score_team_a + score_team_b
+
+                series = 1
+                if maps_sum == 2:
+                    series = 3
+                elif maps_sum == 3:
+                    if score_team_a == 0 or score_team_b == 0:
+                        series = 5
+                    else:
+                        series = 3
+                elif maps_sum == 4:
+                    series = 5
+
+                # Extrai mapas jogados (a div de mapas, se houver, vem logo após o cartão da partida)
+                games_div = match.find_next_sibling()
+                if games_div is not None and "m-item-games" not in games_div.get("class", []):
+                    games_div = None
+                games = [] if games_div == None else games_div.find_all("a")
+                for game in games:
+                    game_result_div = game.find("div", class_="m-item-games-result").find("div")
+                    map_name = game_result_div.find("div", class_="map").text.strip()
+                    map_score = game_result_div.find("div", class_="score").text.strip()
+                    maps.append({"Map": map_name, "Score": self.parseMapScore(map_score)})
+
+            result_item["Match"] = {
+                "Id": match_id,
+                "URL": match_url,
+                "Date": match_date,
+                "Series": f"bo{series}" if series else "",
+                "Teams": [{"Id": None, "Name": team_name}, {"Id": None, "Name": oponent_name}],
+                "Score": match_score,
+                "Winner": 0 if result == "win" else 1,
+                "Maps": maps
+            }
+
+        # Próxima página, apenas se a janela não terminou nesta página
+        next_page = None
+        if not window_ended:
+            current_page = html.find("span", class_="mod-page")
+            next_page_link = current_page.find_next_sibling("a", class_="mod-page") if current_page else None
+            if next_page_link:
+                next_page = next_page_link["href"]
+
+        return recent_results, next_page
+
+    def parseMapScore(self, score:str) -> list[int | None]:
+        '''
+            Converte um placar de mapa ("10-13") nos rounds de cada time.
+        '''
+        try:
+            team_score, oponent_score = score.split("-")
+            return [int(team_score), int(oponent_score)]
+        except ValueError:
+            return [None, None]
 
+    @METRICS.timed("parse_seconds")
     def extractTeamMapsStats(self, webpage):
         '''
             Extrai e retorna, dada uma página de estatísticas de uma time, as seguintes informações:
@@ -220,7 +381,8 @@ class DataExtractor:
                 - Porcentagem de rounds vencidos no lado ATAQUE
                 - Porcentagem de rounds vencidos no lado DEFESA
         '''
-        html = self.getHTML(webpage)
+        # Apenas a tabela de mapas é processada
+        html = self.getHTML(webpage, SoupStrainer("table", class_="wf-table mod-team-maps"))
 
         # Encontrando a tabela
         table = html.find("table", class_="wf-table mod-team-maps")
@@ -234,19 +396,21 @@ class DataExtractor:
             if "mod-toggle" in row.get("class", []):
                 continue
             
+            cells = row.find_all("td", recursive=False)
+
             # Extrair o nome do mapa
-            map_cell = row.select("td:nth-child(1)")[0]
+            map_cell = cells[0]
             if map_cell:
                 map_name = map_cell.text
                 map_name = map_name.split("(")[0]
                 map_name = map_name.strip()
                 
             # Extrair WIN%, ATK RWIN%, DEF RWIN%
-            win_percent = row.select("td:nth-child(3)")[0].text.strip()
+            win_percent = cells[2].text.strip()
             win_percent = win_percent.strip()
-            atk_rwin_percent = row.select("td:nth-child(8)")[0].text.strip()
+            atk_rwin_percent = cells[7].text.strip()
             atk_rwin_percent = atk_rwin_percent.strip()
-            def_rwin_percent = row.select("td:nth-child(11)")[0].text.strip()
+            def_rwin_percent = cells[10].text.strip()
             def_rwin_percent = def_rwin_percent.strip()
             
             # Adicionar os dados à lista
@@ -1,31 +1,177 @@
 import os
 import json
+from datetime import datetime
+
+from src.jsonLinesStore import JsonLinesStore
+from src.sqliteStore import SQLiteStore, SQLiteMatchStore
+from src.metrics import METRICS
 
 
 class DataManager:
     '''
         Classe responsável por gerenciar os dados extraídos
+
+        Se o Dataset for um arquivo JSON Lines (".jsonl"), cada time é adicionado ao final do arquivo
+        assim que é extraído. Se for um banco SQLite (".db" ou ".sqlite"), os times são gravados em
+        tabelas normalizadas, em lotes. Caso contrário, o Dataset é salvo como um único documento JSON a cada 10 times.
+
+        Os times são indexados pelo Id e pelo nome (em letras minúsculas), permitindo buscas em O(1).
+        Times diferentes podem ter o mesmo nome: o índice por nome guarda todos eles.
+
+        As partidas são armazenadas uma única vez, indexadas pelo Id da partida no vlr.gg, e os resultados
+        recentes de cada time apenas referenciam as partidas pelo Id. No formato JSON Lines, as partidas
+        são gravadas em um arquivo separado ("<dataset>.matches.jsonl"); no formato SQLite, na tabela vlr_matches.
+
+        Um Dataset em JSON Lines ou SQLite que ainda não existe é criado a partir do documento JSON de mesmo nome
+        ("<dataset>.json"), se houver, para que a troca de formato não recomece a coleta do zero.
     '''
     def __init__(self, filename:str):
-        self.data = {"teams": [], "count": 0}
+        self.teams : dict[str, dict] = dict()
+        self.names : dict[str, list[dict]] = dict()
+        self.matches : dict[str, dict] = dict()
         self.filename = filename
+        self.store = None
+        self.match_store = None
+        self.imported_from = None
+        new_store = not os.path.exists(os.path.abspath(filename))
+        if filename.endswith(".jsonl"):
+            self.store = JsonLinesStore(filename)
+            self.match_store = JsonLinesStore(os.path.splitext(filename)[0] + ".matches.jsonl")
+        elif filename.endswith((".db", ".sqlite")):
+            self.store = SQLiteStore(filename)
+            self.match_store = SQLiteMatchStore(self.store)
+        self._added = 0
+        self._unsaved : dict[str, dict] = dict()
+        self._unsaved_matches : dict[str, dict] = dict()
         self.__load_data()
+        if self.store is not None and new_store:
+            self.__import_json()
 
     def __load_data(self):
         '''
             Carrega os dados atuais do Dataset, caso estejam atualizados.
         '''
-        if os.path.exists(os.path.abspath(self.filename)):
+        if self.store is not None:
+            # Registros mais recentes de um mesmo time substituem os anteriores
+            for team in self.store.load():
+                if team.get("Deleted"):
+                    self.__unindex(team["Id"])
+                else:
+                    self.__index(team)
+            for match in self.match_store.load():
+                self.matches[match["Id"]] = match
+        elif os.path.exists(os.path.abspath(self.filename)):
             with open(self.filename, mode="r") as file:
-                self.data = json.load(file)
+                data = json.load(file)
+            for team in data["teams"]:
+                self.__index(team)
+            for match in data.get("matches", []):
+                self.matches[match["Id"]] = match
+
+    def __import_json(self):
+        '''
+            Importa o documento JSON de mesmo nome do Dataset (formato anterior) para o armazenamento.
+        '''
+        json_filename = os.path.splitext(self.filename)[0] + ".json"
+        if not os.path.exists(os.path.abspath(json_filename)):
+            return
+
+        with open(json_filename, mode="r", encoding="utf-8") as file:
+            data = json.load(file)
+        self.bulkLoadMatches(data.get("matches", []))
+        self.bulkLoad(data["teams"])
+        self.store.save(self.teams.values())
+        self.imported_from = json_filename
+
+    def __index(self, team:dict) -> bool:
+        '''
+            Adiciona (ou substitui) um time nos índices. Retorna True se o time é novo.
+        '''
+        old_team = self.teams.get(team["Id"])
+        if old_team is not None:
+            self.__unindexName(old_team)
+
+        self.teams[team["Id"]] = team
+        self.names.setdefault(team["Name"].lower(), []).append(team)
+        return old_team is None
+
+    def __unindex(self, id) -> dict | None:
+        '''
+            Remove um time dos índices, retornando o seu registro.
+        '''
+        team = self.teams.pop(id, None)
+        if team is not None:
+            self.__unindexName(team)
+        return team
+
+    def __unindexName(self, team:dict):
+        '''
+            Remove um time do índice por nome, mantendo os demais times com o mesmo nome.
+        '''
+        name = team["Name"].lower()
+        teams = [other for other in self.names.get(name, []) if other is not team]
+        if teams:
+            self.names[name] = teams
+        else:
+            self.names.pop(name, None)
+
+    def getDocument(self) -> dict:
+        '''
+            Monta o Dataset no formato de documento JSON: {"teams": [...], "matches": [...], "count": N}.
+
+            O documento é reconstruído a cada chamada; para percorrer os times ou as partidas, use `teams` e `matches`.
+        '''
+        return {"teams": list(self.teams.values()), "matches": list(self.matches.values()), "count": len(self.teams)}
 
     def datasetHasTeam(self, id):
-        return id in [team["Id"] for team in self.data["teams"]]
+        return id in self.teams
+
+    def getTeam(self, id) -> dict | None:
+        '''
+            Retorna o registro de um time pelo Id, ou None.
+        '''
+        return self.teams.get(id)
+
+    def getTeamByName(self, name:str) -> dict | None:
+        '''
+            Retorna o registro de um time pelo nome (sem diferenciar maiúsculas e minúsculas), ou None.
+            Se mais de um time tiver o mesmo nome, retorna o adicionado mais recentemente.
+        '''
+        teams = self.names.get(name.lower())
+        return teams[-1] if teams else None
+
+    def getMatch(self, id) -> dict | None:
+        '''
+            Retorna o registro de uma partida pelo Id no vlr.gg, ou None.
+        '''
+        return self.matches.get(id)
+
+    def teamNeedsUpdate(self, id, max_age:float|None=None):
+        '''
+            Verifica se um time precisa ser coletado: se ele não está no Dataset ou se o seu
+            registro é mais antigo que `max_age` segundos (registros sem data são considerados antigos).
+
+            Se `max_age` for None, times já presentes no Dataset nunca são atualizados.
+        '''
+        team = self.teams.get(id)
+        if team is None:
+            return True
+        if max_age is None:
+            return False
+        if "Updated At" not in team:
+            return True
+        age = datetime.now() - datetime.fromisoformat(team["Updated At"])
+        return age.total_seconds() > max_age
 
     def addNewTeam(self, id, name, players, region, coach, rank, recent_results, maps_stats, urls):
         '''
-            Adiciona um novo time na lista de times.
+            Adiciona um novo time na lista de times (ou substitui o registro anterior do time).
+
+            As partidas dos resultados recentes são incorporadas ao armazenamento de partidas (ver `addMatches`)
+            e o time guarda apenas as referências {"match": Id, "result": "win" ou "loss"}.
         '''
+        recent_results = self.addMatches(id, recent_results)
+
         team = {
             "Id": id,
             "Name": name,
@@ -35,19 +181,176 @@ class DataManager:
             "Rank": rank,
             "Recent Results": recent_results,
             "Maps Stats": maps_stats,
-            "URLs": urls
+            "URLs": urls,
+            "Updated At": datetime.now().isoformat(timespec="seconds")
         }
-        self.data["teams"].append(team)
-        self.data["count"] += 1
 
-        if self.data["count"]%10 == 0:
+        self.upsertTeam(team)
+
+    def upsertTeam(self, team:dict) -> bool:
+        '''
+            Adiciona um time ou substitui o seu registro anterior. Retorna True se o time é novo.
+        '''
+        if self.store is not None:
+            self.store.append(team)
+        else:
+            self._unsaved[team["Id"]] = team
+
+        new = self.__index(team)
+
+        self._added += 1
+        if self.store is None and self._added%10 == 0:
+            self.save_data()
+
+        return new
+
+    def addMatches(self, team_id, recent_results:list[dict]) -> list[dict]:
+        '''
+            Incorpora as partidas extraídas da página de partidas de um time ao armazenamento de partidas.
+
+            Uma partida nova é adicionada com o Id do time; o Id do oponente é preenchido caso ele já esteja no Dataset.
+            Se a partida já existir (coletada a partir do oponente), o Id do time é preenchido no lado da partida
+            com o mesmo nome e sem Id, unindo os dois lados. Os demais dados da partida não são alterados.
+
+            Retorna as referências às partidas: [{"match": Id, "result": "win" ou "loss"}].
+        '''
+        changed = []
+        for result in recent_results:
+            match = self.matches.get(result["Id"])
+
+            if match is None:
+                match = result.get("Match")
+                # Partida conhecida na extração e ausente no Dataset: apenas a referência é mantida
+                if match is None:
+                    continue
+                match["Teams"][0]["Id"] = team_id
+                oponent = self.getTeamByName(match["Teams"][1]["Name"])
+                if oponent is not None and oponent["Id"] != team_id:
+                    match["Teams"][1]["Id"] = oponent["Id"]
+                self.matches[match["Id"]] = match
+                changed.append(match)
+                continue
+
+            if any(side["Id"] == team_id for side in match["Teams"]):
+                continue
+            for side in match["Teams"]:
+                if side["Id"] is None and side["Name"].lower() == result["Team"].lower():
+                    side["Id"] = team_id
+                    changed.append(match)
+                    break
+
+        if changed:
+            if self.match_store is not None:
+                self.match_store.appendMany(changed)
+            else:
+                self._unsaved_matches.update((match["Id"], match) for match in changed)
+
+        return [{"match": result["Id"], "result": result["Result"]} for result in recent_results]
+
+    def bulkLoadMatches(self, matches) -> int:
+        '''
+            Adiciona (ou substitui) vários registros de partidas. Retorna o número de partidas novas.
+        '''
+        matches = list(matches)
+
+        if self.match_store is not None:
+            self.match_store.appendMany(matches)
+        else:
+            self._unsaved_matches.update((match["Id"], match) for match in matches)
+
+        new = 0
+        for match in matches:
+            new += match["Id"] not in self.matches
+            self.matches[match["Id"]] = match
+        return new
+
+    def deleteTeam(self, id) -> bool:
+        '''
+            Remove um time do Dataset. Retorna False se o time não existir.
+        '''
+        team = self.__unindex(id)
+        if team is None:
+            return False
+        self._unsaved.pop(id, None)
+
+        if self.store is not None:
+            self.store.append({"Id": id, "Deleted": True})
+
+        return True
+
+    def bulkLoad(self, teams) -> int:
+        '''
+            Adiciona (ou substitui) vários times de uma só vez, gravando-os no Dataset em uma única escrita.
+
+            Retorna o número de times novos.
+        '''
+        teams = list(teams)
+
+        if self.store is not None:
+            self.store.appendMany(teams)
+
+        new = 0
+        for team in teams:
+            new += self.__index(team)
+
+        if self.store is None:
             self.save_data()
-    
+
+        return new
+
+    @METRICS.timed("save_seconds")
     def save_data(self):
         '''
-            Salva os dados extraídos em um arquivo JSON.
+            Salva os dados extraídos.
+
+            No formato JSON Lines, compacta os arquivos caso eles possuam registros substituídos ou removidos.
+            No formato SQLite, grava os times pendentes.
+            No formato JSON, reescreve o Dataset em um arquivo temporário e o substitui atomicamente.
+        '''
+        if self.store is not None:
+            self.store.save(self.teams.values())
+            self.match_store.save(self.matches.values())
+            return
+
+        self.export_json(self.filename)
+        self._unsaved.clear()
+        self._unsaved_matches.clear()
+
+    def unsavedTeams(self) -> list[dict]:
+        '''
+            Retorna os times adicionados que ainda não foram gravados no Dataset.
+        '''
+        if self.store is not None:
+            return self.store.pending()
+        return list(self._unsaved.values())
+
+    def unsavedMatches(self) -> list[dict]:
+        '''
+            Retorna as partidas adicionadas ou alteradas que ainda não foram gravadas no Dataset.
+        '''
+        if self.match_store is not None:
+            return self.match_store.pending()
+        return list(self._unsaved_matches.values())
+
+    def getStats(self) -> dict:
+        '''
+            Retorna o número de times, de partidas, de partidas com os dois lados no Dataset
+            e de referências dos times às partidas.
+        '''
+        return {
+            "teams": len(self.teams),
+            "matches": len(self.matches),
+            "merged": sum(all(side["Id"] is not None for side in match["Teams"]) for match in self.matches.values()),
+            "references": sum(len(team["Recent Results"]) for team in self.teams.values()),
+        }
+
+    def export_json(self, filename:str):
+        '''
+            Exporta o Dataset como um único documento JSON.
         '''
-        filename = "VLRGG_Scraping_Dataset.json"
-        with open(filename, mode="w", encoding="utf-8") as output:
-            json.dump(self.data, output, indent=4, ensure_ascii=False)
-    
\ No newline at end of file
+        temp_filename = f"{filename}.tmp"
+        with open(temp_filename, mode="w", encoding="utf-8") as output:
+            json.dump(self.getDocument(), output, indent=4, ensure_ascii=False)
+            output.flush()
+            os.fsync(output.fileno())
+        os.replace(temp_filename, filename)
@@ -0,0 +1,197 @@
+from threading import Thread, Event
+from time import monotonic, sleep
+
+from src.frontier import Frontier
+
+
+class Coordinator:
+    '''
+        Coordenador da coleta distribuída.
+
+        Adiciona a lista de rankings à fronteira compartilhada e incorpora os resultados enviados pelos workers:
+            - Lista de rankings: adiciona uma unidade por ranking
+            - Ranking: seleciona os times ausentes ou desatualizados no Dataset e adiciona uma unidade por time
+            - Time: adiciona o time ao Dataset
+
+        A coleta termina quando não há unidades pendentes, em andamento ou resultados a serem incorporados.
+        Como a fronteira é persistente, um coordenador reiniciado continua a coleta de onde ela parou.
+    '''
+    def __init__(self, scraper, frontier:Frontier, poll_interval:float=1.0, report_interval:float=30.0):
+        self.scraper = scraper
+        self.frontier = frontier
+        self.poll_interval = poll_interval
+        self.report_interval = report_interval
+
+    def log(self, msg, level:str="INFO", **fields):
+        self.scraper.log(msg, level, **fields)
+
+    def run(self) -> int:
+        '''
+            Executa o coordenador até o fim da coleta. Retorna -1 caso alguma unidade tenha falhado.
+        '''
+        if self.frontier.isClosed():
+            self.log(f"Frontier '{self.frontier.filename}' holds a finished crawl, starting a new one")
+            self.frontier.reset()
+
+        self.frontier.addUnits("rankings", [("/rankings", {})])
+        self.log(f"Coordinating crawl on frontier '{self.frontier.filename}'...")
+
+        last_report = monotonic()
+        while not self.scraper.interrupted:
+            results = self.frontier.results()
+            for id, kind, payload, result in results:
+                self.merge(id, kind, payload, result)
+            if results:
+                self.frontier.markMerged([id for id, _, _, _ in results])
+            elif self.frontier.isIdle():
+                break
+            else:
+                sleep(self.poll_interval)
+
+            if monotonic() - last_report >= self.report_interval:
+                self.logProgress()
+                last_report = monotonic()
+
+        self.logProgress()
+        if self.scraper.interrupted:
+            self.log("Coordinator interrupted! Run it again to continue the crawl", "WARNING")
+            return 130
+
+        # Sinaliza aos workers que a coleta terminou
+        self.frontier.close()
+        return -1 if self.frontier.getStats()["failed"] else 0
+
+    def merge(self, id:str, kind:str, payload:dict, result):
+        '''
+            Incorpora o resultado de uma unidade de trabalho.
+        '''
+        if kind == "rankings":
+            added = self.frontier.addUnits("ranking", [(ranking, {}) for ranking in result])
+            self.log(f"{added} rankings added to the frontier")
+        elif kind == "ranking":
+            teams = self.scraper.selectTeams(id, result["urls"])
+            added = self.frontier.addUnits("team", [(url, {"ranking": id, "rank": rank, "team_id": team_id, "region": result["region"]})
+                                                    for rank, url, team_id in teams])
+            self.log(f"{added} teams from ranking '{id}' added to the frontier", url=id)
+        elif kind == "team":
+            self.scraper.data_manager.addNewTeam(*result)
+            self.log(f"Team '{result[1]}' added to dataset!", url=id, team_id=result[0], stage="write")
+
+    def logProgress(self):
+        stats = self.frontier.getStats()
+        self.log(f"Frontier: {stats['pending']} pending, {stats['leased']} leased, {stats['done']} done, {stats['failed']} failed units, "
+                 f"{stats['workers']} active workers")
+
+
+class CrawlWorker:
+    '''
+        Worker da coleta distribuída.
+
+        Recebe lotes de unidades de trabalho da fronteira, baixa as suas páginas com o Downloader do scraper
+        (com o seu próprio limitador de taxa) e as processa com o DataExtractor, enviando os resultados ao coordenador.
+        Uma thread renova periodicamente o lease das unidades recebidas; se o worker for encerrado,
+        as unidades são entregues a outro worker quando o lease expirar.
+    '''
+    def __init__(self, scraper, frontier:Frontier, worker_id:str, batch_size:int=8, poll_interval:float=1.0):
+        self.scraper = scraper
+        self.frontier = frontier
+        self.worker_id = worker_id
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = frontier.lease_seconds / 3
+        self._stop = Event()
+        self.completed = 0
+        self.failed = 0
+
+    def log(self, msg, level:str="INFO", **fields):
+        self.scraper.log(msg, level, worker=self.worker_id, **fields)
+
+    def run(self) -> int:
+        '''
+            Processa unidades até que o coordenador encerre a coleta. Retorna -1 caso alguma unidade tenha falhado.
+        '''
+        heartbeat = Thread(target=self.heartbeatRun, daemon=True)
+        heartbeat.start()
+        self.log(f"Worker '{self.worker_id}' started on frontier '{self.frontier.filename}'")
+
+        while not self.scraper.interrupted and not self.frontier.isClosed():
+            units = self.frontier.lease(self.worker_id, self.batch_size)
+            if not units:
+                sleep(self.poll_interval)
+                continue
+
+            # As páginas de todas as unidades do lote são adicionadas na fila de requisições
+            self.scraper.downloader.addManyToQueue([id for id, kind, _ in units if kind in ("rankings", "ranking")], 1)
+            self.scraper.queueTeams([id for id, kind, _ in units if kind == "team"])
+
+            for id, kind, payload in units:
+                if self.scraper.interrupted:
+                    break
+                self.processUnit(id, kind, payload)
+
+        # Unidades recebidas e não processadas voltam para a fronteira
+        released = self.frontier.release(self.worker_id)
+        if released:
+            self.log(f"{released} units released back to the frontier")
+
+        self._stop.set()
+        heartbeat.join()
+        self.log(f"Worker '{self.worker_id}' finished: {self.completed} units completed, {self.failed} failed")
+
+        if self.scraper.interrupted:
+            return 130
+        return -1 if self.failed else 0
+
+    def processUnit(self, id:str, kind:str, payload:dict):
+        '''
+            Processa uma unidade de trabalho, enviando o resultado (ou a falha) para a fronteira.
+        '''
+        try:
+            result = self.extract(id, kind, payload)
+        except Exception as e:
+            self.log(f"Unit '{id}' extraction FAILED with error {e}!", "ERROR", url=id, stage="parse")
+            result = None
+
+        if result is None:
+            # Coleta interrompida: a unidade é devolvida sem contar como falha
+            if self.scraper.interrupted:
+                return
+            self.failed += 1
+            self.frontier.fail(id, self.worker_id, f"{kind} extraction failed")
+            return
+
+        if self.frontier.complete(id, self.worker_id, result):
+            self.completed += 1
+        else:
+            self.log(f"Unit '{id}' was already completed by another worker (lease expired)", "WARNING", url=id)
+
+    def extract(self, id:str, kind:str, payload:dict):
+        '''
+            Baixa e extrai as páginas de uma unidade de trabalho. Retorna None caso alguma página falhe.
+        '''
+        scraper = self.scraper
+
+        if kind == "team":
+            # Sem `known`: o Dataset do worker não é o do coordenador, os detalhes de todas as partidas são enviados
+            return scraper.collectTeam(payload["ranking"], payload["rank"], id, payload["team_id"], payload["region"])
+
+        response = scraper.getResponse(id)
+        if not response:
+            self.log(f"Invalid response for URL '{id}'!", "ERROR", url=id)
+            return None
+
+        if kind == "rankings":
+            return scraper.data_extractor.extractRegionalRankingsPaths(response)
+
+        urls, region = scraper.data_extractor.extractTeamsFromRanking(response)
+        return {"urls": urls, "region": region}
+
+    def heartbeatRun(self):
+        '''
+            Método executado pela thread de heartbeat: renova o lease das unidades do worker.
+        '''
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self.frontier.heartbeat(self.worker_id)
+            except Exception as e:
+                self.log(f"Heartbeat FAILED with error {e}!", "WARNING", stage="heartbeat")
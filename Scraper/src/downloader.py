@@ -3,39 +3,309 @@ from src.scheduler import Scheduler
 from src.request import Request
 from src.priority import Priority
 from src.storage import Storage
+from src.rateLimiter import RateLimiter
+from src.pageCache import PageCache
+from src.response import PageResponse, FailedResponse
+from src.retryPolicy import RetryPolicy, ErrorKind, NETWORK_ERROR_STATUS, classifyResponse
+from src.circuitBreaker import CircuitBreaker
+from src.eventLog import EventLog
+from src.metrics import METRICS, BYTES_BUCKETS
 
-import os
-import datetime
+from abc import ABC, abstractmethod
+from threading import Lock, Thread
+from time import monotonic
 
 
-class Downloader:
+class BaseDownloader(ABC):
     '''
-        Classe responsável por efetuar o download das páginas necessárias para extração de dados.
+        Base dos mecanismos de download: fila de requisições, armazenamento das respostas, cache,
+        limitador de taxa, novas tentativas e disjuntor.
+
+        Falhas temporárias (limitação do servidor, erros 5xx e de rede) são reagendadas no escalonador de acordo
+        com a política de novas tentativas. Após a última tentativa, a resposta armazenada é uma `FailedResponse`.
+        Um disjuntor suspende as requisições ao host após uma sequência de falhas.
+
+        Cada mecanismo implementa `start`, que inicia os downloads, e `join`, que espera o seu encerramento após `close`.
     '''
 
-    def __init__(self, host):
+    def __init__(self, host, event_log:EventLog, rate:float=2.0, burst:int=5, cache:PageCache|None=None, retry_policy:RetryPolicy|None=None, breaker:CircuitBreaker|None=None):
         self.host = host
         self.scheduler = Scheduler()
-        self.downloader = cloudscraper.create_scraper()
         self.storage = Storage()
-        if os.path.exists(os.path.abspath("./download_log.txt")):
-            with open("./download_log.txt", mode="w") as file:
-                pass
+        self.rate_limiter = RateLimiter(rate, burst)
+        self.cache = cache
+        self._stats_lock = Lock()
+        self._latencies : list[float] = list()
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._retries = 0
+        self._failures = 0
+        self._cancelled : set[str] = set()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.event_log = event_log
 
-    def log(self, msg:str):
+    def log(self, msg:str, level:str="INFO", **fields):
         '''
-            Faz o log de um download no arquivo de logs.
+            Registra um evento de download no log estruturado.
         '''
-        with open("./download_log.txt", mode="a") as log:
-            date = datetime.datetime.now().strftime("%d-%m-%Y %H:%M:%S")
-            log.write(f"[{date}]: {msg}\n")
+        self.event_log.log(msg, level, source="downloader", **fields)
     
     def addToQueue(self, url:str, priority:int):
         '''
             Adiciona a url a fila de requisições com uma certa prioridade.
         '''
-        request = Request(url, Priority(priority)) 
-        self.scheduler.put(request)
+        self.addManyToQueue([url], priority)
+
+    def addManyToQueue(self, urls:list[str], priority:int):
+        '''
+            Adiciona várias urls a fila de requisições com uma mesma prioridade.
+
+            URLs já baixadas e ainda não coletadas (ex.: restauradas de um checkpoint) não são baixadas novamente.
+        '''
+        with self._stats_lock:
+            self._cancelled.difference_update(urls)
+        requests = [Request(url, Priority(priority)) for url in urls if url not in self.storage]
+        self.scheduler.putMany(requests)
+
+    def cancel(self, urls:list[str]) -> int:
+        '''
+            Cancela requisições que não serão coletadas: remove-as da fila ou descarta as respostas já armazenadas.
+
+            As respostas de requisições em andamento são descartadas quando chegarem, em vez de armazenadas.
+            Retorna o número de requisições canceladas.
+        '''
+        cancelled = 0
+        for url in urls:
+            if self.scheduler.cancel(url) or self.storage.discard(url):
+                cancelled += 1
+            elif self.scheduler.isInFlight(url):
+                with self._stats_lock:
+                    self._cancelled.add(url)
+                cancelled += 1
+        return cancelled
+
+    def isThrottled(self, response) -> bool:
+        '''
+            Verifica se a resposta indica que o servidor está limitando as requisições
+            (HTTP 429, erros 5xx ou desafio do Cloudflare).
+        '''
+        if response.status_code == 429 or response.status_code >= 500:
+            return True
+        return response.status_code == 403 and "cf-mitigated" in response.headers
+
+    @abstractmethod
+    def start(self, workers:int):
+        '''
+            Inicia os downloads das requisições da fila, com até `workers` downloads simultâneos.
+        '''
+
+    @abstractmethod
+    def join(self, timeout:float|None=None):
+        '''
+            Espera, por até `timeout` segundos, o encerramento dos downloads após `close`.
+        '''
+
+    def fromCache(self, request:Request):
+        '''
+            Consulta o cache de páginas.
+
+            Retorna a resposta em cache (se houver uma válida) e os cabeçalhos da requisição condicional.
+            No modo offline, páginas ausentes do cache resultam em uma resposta 504.
+        '''
+        if self.cache is None:
+            return None, dict()
+
+        cached, conditional_headers = self.cache.lookup(request.getUrl())
+        if cached is None and self.cache.offline:
+            cached = PageResponse(self.host+request.getUrl(), 504, dict(), b"")
+
+        return cached, conditional_headers
+
+    def acquireRate(self):
+        '''
+            Espera pela liberação do limitador de taxa, registrando o tempo de espera.
+        '''
+        start = monotonic()
+        self.rate_limiter.acquire()
+        METRICS.observe("rate_limiter_wait_seconds", monotonic() - start)
+
+    def startRequest(self):
+        '''
+            Registra o início de uma requisição, para o cálculo da concorrência atingida.
+        '''
+        with self._stats_lock:
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+
+    def finishRequest(self, request:Request, response, latency:float):
+        '''
+            Finaliza uma requisição (ver `handleResponse`).
+
+            Um erro no tratamento da resposta não pode deixar a requisição sem resposta (quem a espera ficaria bloqueado
+            até o tempo de espera se esgotar): a requisição é finalizada com uma `FailedResponse` e registrada como falha
+            no disjuntor. Se ela for a requisição de teste, o disjuntor não fica esperando indefinidamente pelo seu resultado.
+        '''
+        try:
+            self.handleResponse(request, response, latency)
+        except Exception as e:
+            self.log(f"{request.getUrl()} response handling raised {e!r}!", "ERROR", url=request.getUrl(), stage="download")
+            if self.breaker.recordFailure():
+                self.log(f"Circuit breaker opened, pausing requests for {self.breaker.reset_timeout:.0f}s", "WARNING",
+                         url=request.getUrl(), stage="download")
+            failed = PageResponse(self.host+request.getUrl(), NETWORK_ERROR_STATUS, dict(), b"")
+            self.storeResponse(request, FailedResponse.fromResponse(failed, ErrorKind.NETWORK, request.getAttempts()))
+
+    def handleResponse(self, request:Request, response, latency:float):
+        '''
+            Armazena a resposta de uma requisição e atualiza o limitador de taxa, o disjuntor e as estatísticas.
+
+            Falhas temporárias são reagendadas enquanto a política permitir; a última falha é armazenada como `FailedResponse`.
+        '''
+        with self._stats_lock:
+            self._in_flight -= 1
+            self._latencies.append(latency)
+        METRICS.observe("download_seconds", latency)
+        METRICS.observe("download_bytes", len(response.content), BYTES_BUCKETS)
+
+        # Ajusta a taxa de requisições de acordo com a resposta do servidor
+        if self.isThrottled(response):
+            self.rate_limiter.penalize()
+            self.log(f"Server is throttling requests, rate reduced to {self.rate_limiter.getRate():.2f} req/s", "WARNING",
+                     url=request.getUrl(), stage="download", status=response.status_code, rate=round(self.rate_limiter.getRate(), 3))
+        else:
+            self.rate_limiter.reward()
+
+        attempts = request.addAttempt()
+        kind = classifyResponse(response)
+        if kind in (ErrorKind.OK, ErrorKind.PERMANENT):
+            self.breaker.recordSuccess()
+        elif self.breaker.recordFailure():
+            self.log(f"Circuit breaker opened, pausing requests for {self.breaker.reset_timeout:.0f}s", "WARNING",
+                     url=request.getUrl(), stage="download", status=response.status_code)
+
+        if self.retry_policy.shouldRetry(kind, attempts):
+            delay = self.retry_policy.delay(attempts, response)
+            if self.scheduler.retry(request, delay):
+                with self._stats_lock:
+                    self._retries += 1
+                self.log(f"{request.getUrl()} failed with code {response.status_code} ({kind.value}), retrying in {delay:.1f}s", "WARNING",
+                         url=request.getUrl(), stage="retry", status=response.status_code, attempt=attempts, delay=round(delay, 3))
+                return
+
+        if kind != ErrorKind.OK:
+            with self._stats_lock:
+                self._failures += 1
+            response = FailedResponse.fromResponse(response, kind, attempts)
+        elif self.cache is not None:
+            response = self.cache.update(request.getUrl(), response)
+            # Página removida do cache entre a consulta e a resposta 304: baixa a página novamente, sem requisição condicional
+            if response.status_code == 304 and self.scheduler.retry(request):
+                self.log(f"{request.getUrl()} was evicted from the cache before its revalidation, downloading it again", "WARNING",
+                         url=request.getUrl(), stage="cache", status=response.status_code)
+                return
+
+        self.storeResponse(request, response, latency)
+
+    def storeResponse(self, request:Request, response, latency:float|None=None):
+        '''
+            Armazena a resposta de uma requisição, liberando quem a espera. Respostas de requisições canceladas são descartadas.
+        '''
+        with self._stats_lock:
+            cancelled = request.getUrl() in self._cancelled
+            self._cancelled.discard(request.getUrl())
+        if cancelled:
+            self.scheduler.taskDone(request.getUrl())
+            self.log(f"{request.getUrl()} was cancelled, response discarded", "DEBUG", url=request.getUrl(), status=response.status_code)
+            return
+
+        request.addResponse(response)
+        self.storage.put(request)
+        self.scheduler.taskDone(request.getUrl())
+
+        # Respostas sem latência vêm do cache
+        stage = "cache" if latency is None else "download"
+        duration = None if latency is None else round(latency, 4)
+        if response.status_code < 400:
+            self.log(f"{request.getUrl()} sucessfully downloaded!", url=request.getUrl(), stage=stage,
+                     status=response.status_code, duration=duration, bytes=len(response.content))
+        else:
+            self.log(f"{request.getUrl()} download failed with code {response.status_code}!", "WARNING", url=request.getUrl(),
+                     stage=stage, status=response.status_code, duration=duration)
+    
+    def getResponse(self, url, timeout:float|None=None):
+        '''
+            Retorna a resposta da requisição de uma url, ou None caso o tempo de espera se esgote.
+        '''
+        request = self.storage.get(url, timeout)
+        if request is None:
+            return None
+        return request.getResponse()
+
+    def pending(self) -> list[tuple[str, int]]:
+        '''
+            Retorna a URL e a prioridade das requisições ainda não coletadas: na fila, em andamento ou já armazenadas.
+        '''
+        return self.scheduler.snapshot() + self.storage.snapshot()
+
+    def getStats(self) -> dict:
+        '''
+            Retorna as estatísticas de latência por requisição e de concorrência atingida.
+        '''
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+
+        count = len(latencies)
+        return {
+            "requests": count,
+            "retries": self._retries,
+            "failures": self._failures,
+            "breaker_trips": self.breaker.getTrips(),
+            "max_concurrency": self._max_in_flight,
+            "avg_latency": sum(latencies)/count if count else 0.0,
+            "p50_latency": latencies[count//2] if count else 0.0,
+            "p95_latency": latencies[min(count - 1, int(count*0.95))] if count else 0.0,
+        }
+
+    def close(self):
+        '''
+            Encerra o escalonador, liberando as threads que aguardam por requisições.
+        '''
+        self.scheduler.close()
+
+
+class Downloader(BaseDownloader):
+    '''
+        Classe responsável por efetuar o download das páginas necessárias para extração de dados.
+
+        Cada thread do crawler efetua uma requisição por vez com o cloudscraper. O intervalo entre
+        downloads é controlado pelo limitador de taxa.
+    '''
+
+    def __init__(self, host, event_log:EventLog, rate:float=2.0, burst:int=5, cache:PageCache|None=None, retry_policy:RetryPolicy|None=None, breaker:CircuitBreaker|None=None):
+        super().__init__(host, event_log, rate, burst, cache, retry_policy, breaker)
+        self.downloader = cloudscraper.create_scraper()
+        self._threads : list[Thread] = list()
+
+    def start(self, workers:int):
+        '''
+            Inicia `workers` threads do crawler.
+        '''
+        for _ in range(workers):
+            crawler_thread = Thread(target=self.run, daemon=True)
+            crawler_thread.start()
+            self._threads.append(crawler_thread)
+
+    def run(self):
+        '''
+            Método executado pelas threads do crawler: efetua requisições até que o escalonador seja fechado.
+        '''
+        while self.requestPage():
+            pass
+
+    def join(self, timeout:float|None=None):
+        for crawler_thread in self._threads:
+            crawler_thread.join(timeout)
 
     def requestPage(self):
         '''
@@ -46,17 +316,30 @@ class Downloader:
         }
 
         request = self.scheduler.get()
-        response = self.downloader.get(self.host+request.getUrl(), headers=header, allow_redirects=True)
-        request.addResponse(response)
-        
-        self.storage.put(request)
 
-        if response.status_code < 400:
-            self.log(f"{request.getUrl()} sucessfully downloaded!")
-        else:
-            self.log(f"{request.getUrl()} download failed with code {response.status_code}!")
-    
-    def getResponse(self, url):
-        return self.storage.get(url).getResponse()
+        # Escalonador fechado: não há mais requisições a serem feitas
+        if request is None:
+            return False
+
+        # Páginas atualizadas no cache não passam pelo limitador de taxa
+        cached, conditional_headers = self.fromCache(request)
+        if cached is not None:
+            self.storeResponse(request, cached)
+            return True
+
+        self.breaker.acquire()
+        self.acquireRate()
+        self.startRequest()
+        start = monotonic()
+        try:
+            response = self.downloader.get(self.host+request.getUrl(), headers=header | conditional_headers, allow_redirects=True)
+        except Exception as e:
+            # Erros de conexão não podem encerrar a thread: a requisição é tratada como um erro de rede
+            self.log(f"{request.getUrl()} download raised {e!r}!", "WARNING", url=request.getUrl(), stage="download",
+                     duration=round(monotonic() - start, 4))
+            response = PageResponse(self.host+request.getUrl(), NETWORK_ERROR_STATUS, dict(), b"")
+        self.finishRequest(request, response, monotonic() - start)
+
+        return True
 
     
\ No newline at end of file
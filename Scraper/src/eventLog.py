@@ -0,0 +1,125 @@
+import os
+import json
+import atexit
+import datetime
+from queue import SimpleQueue, Empty
+from threading import Thread, Lock
+
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+
+class EventLog:
+    '''
+        Log estruturado em JSON Lines: cada evento é um objeto JSON por linha, com data, nível, origem,
+        mensagem e campos opcionais (url, stage, duration, status, team_id, ...).
+
+        Os eventos são enfileirados por quem os gera e gravados em lotes por uma thread dedicada, que mantém
+        o arquivo aberto. Eventos abaixo do nível configurado não são gravados no arquivo.
+        Quando o arquivo ultrapassa `max_bytes`, ele é rotacionado (arquivo.1, arquivo.2, ... até `backups`).
+
+        Eventos com `echo=True` também são exibidos no terminal, pela mesma thread, independentemente do nível:
+        o nível controla apenas o arquivo.
+    '''
+    def __init__(self, filename:str, level:str="INFO", max_bytes:int=10*1024*1024, backups:int=5, flush_interval:float=0.5):
+        self.filename = filename
+        self.level = LEVELS[level.upper()]
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self._queue = SimpleQueue()
+        self._file = open(filename, mode="a", encoding="utf-8")
+        self._close_lock = Lock()
+        self._closed = False
+        self._writer = Thread(target=self.writerRun, daemon=True)
+        self._writer.start()
+        # Grava os eventos pendentes mesmo se o programa terminar sem fechar o log
+        atexit.register(self.close)
+
+    def isEnabled(self, level:str) -> bool:
+        return LEVELS[level] >= self.level
+
+    def log(self, msg:str, level:str="INFO", source:str|None=None, echo:bool=False, **fields):
+        '''
+            Registra um evento. Campos com valor None são omitidos.
+        '''
+        write = LEVELS[level] >= self.level
+        if not write and not echo:
+            return
+
+        event = {"time": datetime.datetime.now().isoformat(timespec="milliseconds"), "level": level}
+        if source is not None:
+            event["source"] = source
+        event["msg"] = msg
+        for key, value in fields.items():
+            if value is not None:
+                event[key] = value
+
+        self._queue.put((event, echo, write))
+
+    def writerRun(self):
+        '''
+            Thread de escrita: grava os eventos enfileirados em lotes, até receber o sinal de término.
+        '''
+        running = True
+        while running:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except Empty:
+                continue
+
+            # Agrupa os demais eventos já enfileirados em uma única escrita
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+
+            if None in batch:
+                running = False
+                batch = [item for item in batch if item is not None]
+
+            self.write(batch)
+
+    def write(self, batch):
+        lines = []
+        for event, echo, write in batch:
+            if write:
+                lines.append(json.dumps(event, ensure_ascii=False, default=str))
+            if echo:
+                print(event["msg"])
+        if not lines:
+            return
+
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+
+        if self._file.tell() >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self):
+        '''
+            Renomeia os arquivos do log (arquivo -> arquivo.1 -> arquivo.2 ...) e abre um novo arquivo.
+        '''
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.filename}.{i}"):
+                os.replace(f"{self.filename}.{i}", f"{self.filename}.{i+1}")
+        if self.backups > 0:
+            os.replace(self.filename, f"{self.filename}.1")
+        else:
+            os.remove(self.filename)
+        self._file = open(self.filename, mode="a", encoding="utf-8")
+
+    def close(self):
+        '''
+            Grava os eventos pendentes e encerra a thread de escrita.
+        '''
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
@@ -0,0 +1,239 @@
+import json
+import sqlite3
+from threading import Lock
+from time import time
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS units (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    unit_id TEXT PRIMARY KEY REFERENCES units(id),
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    merged INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    heartbeat_at REAL NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS units_state ON units(state, position);
+CREATE INDEX IF NOT EXISTS units_worker ON units(worker);
+CREATE INDEX IF NOT EXISTS results_merged ON results(merged);
+'''
+
+
+class Frontier:
+    '''
+        Fronteira de coleta compartilhada entre um coordenador e vários workers, armazenada em um banco SQLite.
+
+        As unidades de trabalho (lista de rankings, ranking ou time) são identificadas pela URL e entregues aos
+        workers com um lease de `lease_seconds` segundos, renovado pelos heartbeats do worker. Unidades cujo lease
+        expirou (worker encerrado ou travado) voltam a ser entregues a outro worker; após `max_attempts` entregas
+        a unidade é marcada como falha.
+
+        Os resultados são gravados pelos workers e incorporados ao Dataset pelo coordenador. Apenas o primeiro
+        resultado de cada unidade é aceito. Todas as operações são transações, seguras entre processos.
+
+        O banco usa o journal padrão (DELETE) e depende dos locks de arquivo do SQLite, que não são confiáveis em
+        sistemas de arquivos de rede: o coordenador e os workers devem rodar na mesma máquina.
+    '''
+    def __init__(self, filename:str, lease_seconds:float=60.0, max_attempts:int=3):
+        self.filename = filename
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = Lock()
+        self.connection = sqlite3.connect(filename, timeout=60, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode = DELETE")
+        self.connection.execute("PRAGMA busy_timeout = 60000")
+        self.connection.executescript(SCHEMA)
+
+    def _transaction(self, function, *args):
+        '''
+            Executa uma função em uma transação exclusiva para escrita (BEGIN IMMEDIATE).
+        '''
+        with self._lock:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                result = function(cursor, *args)
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+            return result
+
+    def addUnits(self, kind:str, units:list[tuple[str, dict]]) -> int:
+        '''
+            Adiciona unidades de trabalho (id, dados). Unidades já existentes são ignoradas.
+
+            Retorna o número de unidades adicionadas.
+        '''
+        def add(cursor):
+            position = cursor.execute("SELECT COALESCE(MAX(position), 0) FROM units").fetchone()[0]
+            added = 0
+            for id, payload in units:
+                position += 1
+                cursor.execute("INSERT OR IGNORE INTO units (id, kind, payload, position) VALUES (?, ?, ?, ?)",
+                               (id, kind, json.dumps(payload, ensure_ascii=False), position))
+                added += cursor.rowcount
+            return added
+        return self._transaction(add)
+
+    def lease(self, worker:str, limit:int=1) -> list[tuple[str, str, dict]]:
+        '''
+            Entrega até `limit` unidades pendentes (ou com o lease expirado) a um worker, na ordem em que foram adicionadas.
+
+            Retorna uma lista de (id, tipo, dados).
+        '''
+        def lease(cursor):
+            now = time()
+            # Unidades que esgotaram as tentativas (os workers que as receberam não terminaram) são marcadas como falha
+            cursor.execute("UPDATE units SET state = 'failed', error = 'lease expired', worker = NULL "
+                           "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?", (now, self.max_attempts))
+
+            rows = cursor.execute("SELECT id, kind, payload FROM units WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                                  "ORDER BY position LIMIT ?", (now, limit)).fetchall()
+            for id, _, _ in rows:
+                cursor.execute("UPDATE units SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                               (worker, now + self.lease_seconds, id))
+            self._touch(cursor, worker, now)
+            return [(id, kind, json.loads(payload)) for id, kind, payload in rows]
+        return self._transaction(lease)
+
+    def _touch(self, cursor, worker:str, now:float, done:int=0, failed:int=0):
+        cursor.execute("INSERT INTO workers (id, heartbeat_at, done, failed) VALUES (?, ?, ?, ?) "
+                       "ON CONFLICT(id) DO UPDATE SET heartbeat_at = excluded.heartbeat_at, done = done + excluded.done, failed = failed + excluded.failed",
+                       (worker, now, done, failed))
+
+    def heartbeat(self, worker:str) -> int:
+        '''
+            Renova o lease das unidades de um worker. Retorna o número de unidades renovadas.
+        '''
+        def heartbeat(cursor):
+            now = time()
+            cursor.execute("UPDATE units SET lease_expires = ? WHERE state = 'leased' AND worker = ?", (now + self.lease_seconds, worker))
+            renewed = cursor.rowcount
+            self._touch(cursor, worker, now)
+            return renewed
+        return self._transaction(heartbeat)
+
+    def complete(self, id:str, worker:str, result) -> bool:
+        '''
+            Finaliza uma unidade com o seu resultado. Retorna False se a unidade já tinha sido finalizada por outro worker.
+        '''
+        def complete(cursor):
+            cursor.execute("UPDATE units SET state = 'done', worker = ?, lease_expires = NULL, error = NULL WHERE id = ? AND state NOT IN ('done', 'failed')",
+                           (worker, id))
+            accepted = cursor.rowcount == 1
+            if accepted:
+                cursor.execute("INSERT INTO results (unit_id, kind, payload, result, worker) SELECT id, kind, payload, ?, ? FROM units WHERE id = ?",
+                               (json.dumps(result, ensure_ascii=False), worker, id))
+            self._touch(cursor, worker, time(), done=int(accepted))
+            return accepted
+        return self._transaction(complete)
+
+    def fail(self, id:str, worker:str, error:str):
+        '''
+            Devolve uma unidade que falhou. Ela volta a ficar pendente até esgotar as tentativas.
+        '''
+        def fail(cursor):
+            cursor.execute("UPDATE units SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                           "worker = NULL, lease_expires = NULL, error = ? WHERE id = ? AND state = 'leased' AND worker = ?",
+                           (self.max_attempts, error, id, worker))
+            self._touch(cursor, worker, time(), failed=1)
+        self._transaction(fail)
+
+    def release(self, worker:str) -> int:
+        '''
+            Devolve as unidades de um worker que está sendo encerrado, sem contar como tentativa.
+        '''
+        def release(cursor):
+            cursor.execute("UPDATE units SET state = 'pending', worker = NULL, lease_expires = NULL, attempts = MAX(attempts - 1, 0) "
+                           "WHERE state = 'leased' AND worker = ?", (worker,))
+            return cursor.rowcount
+        return self._transaction(release)
+
+    def results(self, limit:int=100) -> list[tuple[str, str, dict, object]]:
+        '''
+            Retorna até `limit` resultados ainda não incorporados ao Dataset: (id, tipo, dados, resultado).
+        '''
+        with self._lock:
+            rows = self.connection.execute("SELECT unit_id, kind, payload, result FROM results WHERE merged = 0 ORDER BY rowid LIMIT ?", (limit,)).fetchall()
+        return [(id, kind, json.loads(payload), json.loads(result)) for id, kind, payload, result in rows]
+
+    def markMerged(self, ids:list[str]):
+        '''
+            Marca resultados como incorporados ao Dataset.
+        '''
+        def merged(cursor):
+            cursor.executemany("UPDATE results SET merged = 1 WHERE unit_id = ?", [(id,) for id in ids])
+        self._transaction(merged)
+
+    def isIdle(self) -> bool:
+        '''
+            Verifica se não há unidades pendentes, em andamento ou resultados a serem incorporados.
+        '''
+        with self._lock:
+            units = self.connection.execute("SELECT COUNT(*) FROM units WHERE state IN ('pending', 'leased')").fetchone()[0]
+            results = self.connection.execute("SELECT COUNT(*) FROM results WHERE merged = 0").fetchone()[0]
+        return units == 0 and results == 0
+
+    def close(self):
+        '''
+            Sinaliza aos workers que a coleta terminou.
+        '''
+        def close(cursor):
+            cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('closed', '1')")
+        self._transaction(close)
+
+    def reset(self):
+        '''
+            Remove todas as unidades, resultados e workers, preparando a fronteira para uma nova coleta.
+        '''
+        def reset(cursor):
+            for table in ("results", "units", "workers", "meta"):
+                cursor.execute(f"DELETE FROM {table}")
+        self._transaction(reset)
+
+    def isClosed(self) -> bool:
+        with self._lock:
+            return self.connection.execute("SELECT 1 FROM meta WHERE key = 'closed'").fetchone() is not None
+
+    def getStats(self) -> dict:
+        '''
+            Retorna o número de unidades por estado, de resultados a serem incorporados e de workers ativos.
+        '''
+        with self._lock:
+            states = dict(self.connection.execute("SELECT state, COUNT(*) FROM units GROUP BY state").fetchall())
+            unmerged = self.connection.execute("SELECT COUNT(*) FROM results WHERE merged = 0").fetchone()[0]
+            workers = self.connection.execute("SELECT COUNT(*) FROM workers WHERE heartbeat_at >= ?", (time() - self.lease_seconds,)).fetchone()[0]
+        return {
+            "pending": states.get("pending", 0),
+            "leased": states.get("leased", 0),
+            "done": states.get("done", 0),
+            "failed": states.get("failed", 0),
+            "unmerged": unmerged,
+            "workers": workers,
+        }
+
+    def disconnect(self):
+        with self._lock:
+            self.connection.close()
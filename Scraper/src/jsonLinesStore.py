@@ -0,0 +1,111 @@
+import os
+import json
+
+
+class JsonLinesStore:
+    '''
+        Armazenamento append-only de registros em um arquivo JSON Lines (um registro JSON por linha).
+
+        Cada registro é adicionado ao final do arquivo e sincronizado com o disco (fsync), então o custo
+        de escrita depende apenas do tamanho do registro. Uma linha incompleta no final do arquivo,
+        resultado de uma interrupção durante a escrita, é ignorada na leitura.
+
+        A compactação reescreve o arquivo em um arquivo temporário e o substitui atomicamente.
+    '''
+    def __init__(self, filename:str):
+        self.filename = filename
+        self.lines = 0
+
+    def exists(self) -> bool:
+        return os.path.exists(os.path.abspath(self.filename))
+
+    def load(self):
+        '''
+            Lê os registros do arquivo, um por vez.
+        '''
+        self.lines = 0
+        if not self.exists():
+            return
+
+        with open(self.filename, mode="r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Linha incompleta (escrita interrompida)
+                    continue
+                self.lines += 1
+                yield record
+
+    def append(self, record:dict):
+        '''
+            Adiciona um registro ao final do arquivo, garantindo que ele foi gravado no disco.
+        '''
+        self.appendMany([record])
+
+    def pending(self) -> list[dict]:
+        '''
+            Registros ainda não gravados no disco (nenhum: cada registro é gravado ao ser adicionado).
+        '''
+        return []
+
+    def appendMany(self, records:list[dict]):
+        '''
+            Adiciona vários registros ao final do arquivo, com uma única sincronização com o disco.
+        '''
+        lines = b"".join(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n" for record in records)
+        if not lines:
+            return
+
+        with open(self.filename, mode="ab+") as file:
+            # Garante que o registro comece em uma nova linha, caso a última escrita tenha sido interrompida
+            size = file.seek(0, os.SEEK_END)
+            if size > 0:
+                file.seek(size - 1)
+                if file.read(1) != b"\n":
+                    file.write(b"\n")
+            file.write(lines)
+            file.flush()
+            os.fsync(file.fileno())
+
+        self.lines += len(records)
+
+    def save(self, records):
+        '''
+            Compacta o arquivo caso ele possua registros substituídos ou removidos.
+        '''
+        if self.lines > len(records):
+            self.compact(records)
+
+    def compact(self, records):
+        '''
+            Reescreve o arquivo apenas com os registros informados, substituindo-o atomicamente.
+        '''
+        temp_filename = f"{self.filename}.tmp"
+        lines = 0
+
+        with open(temp_filename, mode="w", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                lines += 1
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_filename, self.filename)
+
+        # Sincroniza o diretório para que a troca do arquivo sobreviva a uma queda do sistema
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            pass
+        else:
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        self.lines = lines
@@ -0,0 +1,144 @@
+from bisect import bisect_left
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+
+
+# Limites dos intervalos dos histogramas (crescimento exponencial)
+SECONDS_BUCKETS = tuple(0.0005 * 2**i for i in range(20))      # 0.5ms a ~4.4min
+BYTES_BUCKETS = tuple(1024 * 2**i for i in range(16))           # 1KiB a 32MiB
+
+
+class Histogram:
+    '''
+        Histograma de valores com intervalos fixos, além de contagem, soma, mínimo e máximo.
+
+        Os quantis são estimados pelo limite superior do intervalo que os contém.
+    '''
+    def __init__(self, buckets:tuple[float, ...]=SECONDS_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self._lock = Lock()
+
+    def observe(self, value:float):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+
+    def quantile(self, q:float) -> float:
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = q * self.count
+            cumulative = 0
+            for i, count in enumerate(self.counts):
+                cumulative += count
+                if cumulative >= rank:
+                    # O último intervalo não possui limite superior
+                    return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+            return self.max
+
+
+class Metrics:
+    '''
+        Registro dos histogramas de desempenho, identificados por nome e rótulos (ex.: o método de extração).
+
+        Gera um relatório resumido (contagem, soma, média, p50, p95 e máximo) e a exportação
+        no formato de texto do Prometheus.
+    '''
+    def __init__(self, prefix:str="vlrgg"):
+        self.prefix = prefix
+        self._histograms : dict[tuple, Histogram] = dict()
+        self._lock = Lock()
+
+    def histogram(self, name:str, buckets:tuple[float, ...]=SECONDS_BUCKETS, **labels) -> Histogram:
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(buckets))
+        return histogram
+
+    def observe(self, name:str, value:float, buckets:tuple[float, ...]=SECONDS_BUCKETS, **labels):
+        self.histogram(name, buckets, **labels).observe(value)
+
+    def timed(self, name:str, **labels):
+        '''
+            Decorador que registra o tempo de execução de uma função no histograma `name`.
+            Sem rótulos, o nome da função é usado como rótulo "method".
+        '''
+        def decorator(function):
+            function_labels = labels or {"method": function.__name__}
+
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.observe(name, perf_counter() - start, **function_labels)
+            return wrapper
+        return decorator
+
+    def histograms(self) -> list[tuple[str, dict, Histogram]]:
+        '''
+            Retorna (nome, rótulos, histograma) de todos os histogramas registrados.
+        '''
+        with self._lock:
+            return [(name, dict(labels), histogram) for (name, labels), histogram in self._histograms.items()]
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def report(self) -> list[str]:
+        '''
+            Relatório com uma linha por histograma.
+        '''
+        lines = [f"{'metric':<50} {'count':>8} {'sum':>10} {'avg':>10} {'p50':>10} {'p95':>10} {'max':>10}"]
+        for (name, labels), histogram in sorted(self._histograms.items()):
+            if histogram.count == 0:
+                continue
+            label = name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else "")
+            lines.append(f"{label:<50} {histogram.count:>8} {histogram.sum:>10.3f} {histogram.sum/histogram.count:>10.4f} "
+                         f"{histogram.quantile(0.5):>10.4f} {histogram.quantile(0.95):>10.4f} {histogram.max:>10.4f}")
+        return lines
+
+    def prometheus(self) -> str:
+        '''
+            Histogramas no formato de texto do Prometheus.
+        '''
+        lines = []
+        typed = set()
+        for (name, labels), histogram in sorted(self._histograms.items()):
+            metric = f"{self.prefix}_{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} histogram")
+                typed.add(metric)
+
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+            separator = "," if label_text else ""
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{label_text}{separator}le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{label_text}{separator}le="+Inf"}} {histogram.count}')
+            braces = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{metric}_sum{braces} {histogram.sum:g}")
+            lines.append(f"{metric}_count{braces} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, filename:str):
+        with open(filename, mode="w", encoding="utf-8") as file:
+            file.write(self.prometheus())
+
+
+# Registro global, compartilhado pelos componentes do scraper
+METRICS = Metrics()
@@ -0,0 +1,222 @@
+import os
+import re
+import json
+import zlib
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from time import time
+
+from src.response import PageResponse
+
+
+class PageCache:
+    '''
+        Cache de páginas em disco, indexado pelo hash SHA-256 da URL (não pelo conteúdo da página).
+
+        Para cada URL são armazenados o corpo comprimido e os metadados da resposta
+        (ETag, Last-Modified e horário do download). Uma página é considerada atualizada
+        durante o tempo definido pela primeira regra de `freshness` cuja expressão regular
+        corresponde à URL. Páginas desatualizadas são revalidadas com um GET condicional.
+
+        Quando o tamanho total ultrapassa `max_bytes`, as páginas usadas há mais tempo são removidas.
+        O horário do último uso é o mtime do corpo, renovado a cada leitura (o atime não é confiável
+        em sistemas montados com relatime/noatime), e define a ordem LRU ao recarregar o cache.
+        No modo `offline`, apenas o conteúdo em cache é utilizado, independentemente da idade.
+    '''
+
+    # Regras de validade padrão (expressão regular da URL, segundos)
+    freshness = [
+        (r"^/rankings", 60*60),
+        (r"^/team/matches/", 6*60*60),
+        (r"^/team/stats/", 24*60*60),
+        (r"^/team/", 24*60*60),
+    ]
+    default_freshness = 60*60
+
+    def __init__(self, directory:str, max_bytes:int=512*1024*1024, offline:bool=False, freshness:list|None=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.offline = offline
+        if freshness is not None:
+            self.freshness = freshness
+        self._rules = [(re.compile(pattern), ttl) for pattern, ttl in self.freshness]
+        self._lock = Lock()
+        self._entries : OrderedDict[str, int] = OrderedDict()  # hash -> tamanho em bytes (ordem LRU)
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.__load_index()
+
+    def __load_index(self):
+        '''
+            Reconstrói o índice LRU a partir dos arquivos presentes no diretório do cache.
+        '''
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                key = name[:-5]
+                body = self._bodyPath(key)
+                if os.path.exists(body):
+                    stat = os.stat(body)
+                    entries.append((stat.st_mtime, key, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._size += size
+
+    def _key(self, url:str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _metaPath(self, key:str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _bodyPath(self, key:str) -> str:
+        return os.path.join(self.directory, f"{key}.z")
+
+    def maxAge(self, url:str) -> int:
+        '''
+            Retorna por quantos segundos uma página é considerada atualizada.
+        '''
+        for pattern, ttl in self._rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_freshness
+
+    def _read(self, url:str):
+        '''
+            Lê os metadados e o corpo de uma página em cache. Retorna None se não existir.
+        '''
+        key = self._key(url)
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+
+        try:
+            with open(self._metaPath(key), mode="r") as file:
+                meta = json.load(file)
+            with open(self._bodyPath(key), mode="rb") as file:
+                content = zlib.decompress(file.read())
+            # Registra o uso da página para a ordem LRU entre execuções
+            os.utime(self._bodyPath(key))
+        except (OSError, ValueError, zlib.error):
+            return None
+
+        return meta, content
+
+    def _toResponse(self, url:str, meta:dict, content:bytes) -> PageResponse:
+        headers = dict()
+        if meta.get("etag"):
+            headers["etag"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["last-modified"] = meta["last_modified"]
+        return PageResponse(meta.get("full_url", url), meta.get("status", 200), headers, content)
+
+    def lookup(self, url:str) -> tuple[PageResponse | None, dict]:
+        '''
+            Procura uma página no cache.
+
+            Retorna a resposta em cache, se ela estiver atualizada (ou no modo offline), e os
+            cabeçalhos para a requisição condicional, caso a página precise ser revalidada.
+        '''
+        cached = self._read(url)
+        if cached is None:
+            with self._lock:
+                self.misses += 1
+            return None, dict()
+
+        meta, content = cached
+        if self.offline or time() - meta["fetched_at"] < self.maxAge(url):
+            with self._lock:
+                self.hits += 1
+            return self._toResponse(url, meta, content), dict()
+
+        headers = dict()
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return None, headers
+
+    def update(self, url:str, response):
+        '''
+            Atualiza o cache com a resposta do servidor.
+
+            Em caso de 304 (Not Modified), retorna a página em cache com o horário de download renovado
+            (ou o próprio 304, se a página foi removida do cache depois da consulta).
+            Respostas 200 são armazenadas; as demais são retornadas sem alteração.
+        '''
+        if response.status_code == 304:
+            cached = self._read(url)
+            if cached is None:
+                return response
+            meta, content = cached
+            meta["fetched_at"] = time()
+            self._writeMeta(self._key(url), meta)
+            with self._lock:
+                self.revalidated += 1
+            return self._toResponse(url, meta, content)
+
+        if response.status_code == 200:
+            self.store(url, response)
+
+        return response
+
+    def _writeMeta(self, key:str, meta:dict):
+        path = self._metaPath(key)
+        with open(path + ".tmp", mode="w") as file:
+            json.dump(meta, file)
+        os.replace(path + ".tmp", path)
+
+    def store(self, url:str, response):
+        '''
+            Armazena uma resposta no cache, removendo as páginas menos usadas se necessário.
+        '''
+        key = self._key(url)
+        body = zlib.compress(response.content)
+        meta = {
+            "url": url,
+            "full_url": str(response.url),
+            "status": response.status_code,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "fetched_at": time(),
+        }
+
+        path = self._bodyPath(key)
+        with open(path + ".tmp", mode="wb") as file:
+            file.write(body)
+        os.replace(path + ".tmp", path)
+        self._writeMeta(key, meta)
+
+        with self._lock:
+            self._size += len(body) - self._entries.pop(key, 0)
+            self._entries[key] = len(body)
+            self._evict()
+
+    def _evict(self):
+        '''
+            Remove as páginas menos usadas até o cache caber em `max_bytes`. Deve ser chamado com o lock adquirido.
+        '''
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            for path in (self._metaPath(key), self._bodyPath(key)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def getStats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
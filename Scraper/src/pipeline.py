@@ -0,0 +1,259 @@
+from queue import Queue
+from threading import Thread, Lock
+from time import monotonic, perf_counter
+from concurrent.futures import ProcessPoolExecutor
+
+from src.dataExtractor import DataExtractor
+from src.metrics import METRICS
+
+
+# Extrator de dados de cada processo do pool de processamento
+_extractor : DataExtractor | None = None
+
+def _getExtractor() -> DataExtractor:
+    global _extractor
+    if _extractor is None:
+        _extractor = DataExtractor()
+    return _extractor
+
+def _timedParse(method:str, webpage):
+    '''
+        Executa um método de extração, retornando o resultado, o nome do método e a duração.
+
+        As métricas registradas nos processos do pool não chegam ao processo principal, então a duração
+        é retornada junto com o resultado e registrada no processo principal (ver `TeamPipeline.parse`).
+    '''
+    start = perf_counter()
+    result = getattr(_getExtractor(), method)(webpage)
+    return result, method, perf_counter() - start
+
+def parseRanking(webpage):
+    return _timedParse("extractTeamsFromRanking", webpage)
+
+def parseTeamPage(webpage):
+    return _timedParse("extractTeamPage", webpage)
+
+def parseMatchlistPage(webpage):
+    return _timedParse("extractTeamRecentMatchesPage", webpage)
+
+def parseStatsPage(webpage):
+    return _timedParse("extractTeamMapsStats", webpage)
+
+
+class TeamPipeline:
+    '''
+        Execução em pipeline da extração de dados dos times.
+
+        Os estágios são conectados por filas limitadas:
+            - Produtor (thread principal): baixa os rankings e gera um item por time, com o seu rank e região
+            - Times (várias threads): baixam as páginas de cada time e enviam o HTML ao pool de processos,
+              que executa o processamento (BeautifulSoup) fora do GIL
+            - Escrita (uma thread): adiciona os times extraídos ao dataset
+
+        Times de todos os rankings são processados de forma concorrente.
+    '''
+    def __init__(self, scraper, team_workers:int=8, parse_processes:int|None=None, queue_size:int=32):
+        self.scraper = scraper
+        self.team_workers = team_workers
+        self.parse_processes = parse_processes
+        self.teams = Queue(maxsize=queue_size)
+        self.results = Queue(maxsize=queue_size)
+        self.pool = None
+        self._dispatched : set[str] = set()
+        self._errors = 0
+        self._lock = Lock()
+
+    def log(self, msg, level:str="INFO", **fields):
+        self.scraper.log(msg, level, **fields)
+
+    def _error(self, msg, **fields):
+        with self._lock:
+            self._errors += 1
+        self.log(msg, "ERROR", **fields)
+
+    def parse(self, function, webpage):
+        '''
+            Executa uma função de extração no pool de processos e espera pelo resultado.
+
+            O tempo de processamento medido no pool é registrado em `parse_seconds`, como na execução sequencial;
+            o tempo total, que inclui a transferência da página e do resultado entre os processos, em `pipeline_parse_seconds`.
+        '''
+        start = perf_counter()
+        try:
+            result, method, seconds = self.pool.submit(function, webpage).result()
+        finally:
+            METRICS.observe("pipeline_parse_seconds", perf_counter() - start, function=function.__name__)
+        METRICS.observe("parse_seconds", seconds, method=method)
+        return result
+
+    def run(self, rankings:list[str]) -> int:
+        '''
+            Executa o pipeline para todos os rankings. Retorna -1 caso algum time ou ranking falhe.
+        '''
+        with ProcessPoolExecutor(max_workers=self.parse_processes) as pool:
+            self.pool = pool
+
+            writer = Thread(target=self.writerRun, daemon=True)
+            writer.start()
+
+            workers = [Thread(target=self.teamRun, daemon=True) for _ in range(self.team_workers)]
+            for worker in workers:
+                worker.start()
+
+            for ranking in rankings:
+                if self.scraper.interrupted:
+                    break
+                self.produce(ranking)
+
+            # Sinaliza o fim dos times para cada thread
+            for _ in workers:
+                self.teams.put(None)
+            for worker in workers:
+                worker.join()
+
+            self.results.put(None)
+            writer.join()
+
+        return -1 if self._errors else 0
+
+    def produce(self, ranking:str):
+        '''
+            Extrai os times de um ranking e os envia ao estágio de times.
+        '''
+        self.log("="*70)
+        self.log(f"Starting ranking '{ranking}' data extraction...")
+
+        progress = self.scraper.checkpoint.getRanking(ranking)
+        if progress is not None:
+            # Ranking já extraído na execução interrompida: restam apenas os times ainda não coletados
+            region, teams = progress
+            self.log(f"Resuming ranking '{ranking}' from checkpoint, {len(teams)} teams remaining...")
+        else:
+            response = self.scraper.getResponse(ranking)
+            if not response:
+                self._error(f"Invalid response for URL '{ranking}'! (SKIPPING RANKING)", url=ranking)
+                return
+
+            self.log(f"Extracting Teams URLs from ranking '{ranking}'...")
+            try:
+                urls, region = self.parse(parseRanking, response)
+            except Exception as e:
+                self._error(f"Teams URLs extraction from ranking '{ranking}' FAILED with error {e}! (SKIPPING RANKING)")
+                return
+
+            teams = self.scraper.selectTeams(ranking, urls)
+            self.scraper.checkpoint.startRanking(ranking, region, teams)
+
+        # Um time presente em mais de um ranking é coletado uma única vez: o escalonador descarta requisições repetidas,
+        # então apenas um dos itens receberia a resposta da página do time
+        selected = []
+        for team in teams:
+            if team[2] in self._dispatched:
+                self.scraper.checkpoint.teamDone(ranking, team[2])
+            else:
+                self._dispatched.add(team[2])
+                selected.append(team)
+        if len(selected) < len(teams):
+            self.log(f"{len(teams) - len(selected)} teams from ranking '{ranking}' already dispatched! (SKIPPING TEAMS)")
+        teams = selected
+
+        self.scraper.queueTeams([url for _, url, _ in teams])
+
+        for rank, url, team_id in teams:
+            if self.scraper.interrupted:
+                break
+            self.teams.put((ranking, url, team_id, rank, region))
+
+    def teamRun(self):
+        '''
+            Estágio de times: processa os times da fila até receber o sinal de término.
+        '''
+        while True:
+            job = self.teams.get()
+            if job is None:
+                break
+
+            # Coleta interrompida: os times restantes são descartados (e coletados ao retomar)
+            if self.scraper.interrupted:
+                continue
+
+            try:
+                team = self.processTeam(*job)
+            except Exception as e:
+                self._error(f"Team '{job[1]}' data extraction FAILED with error {e}! (SKIPPING TEAM)", url=job[1], team_id=job[2], stage="parse")
+                continue
+
+            if team:
+                self.results.put((job[0], team))
+
+    def processTeam(self, ranking:str, url:str, team_id:str, rank:int, region:str):
+        '''
+            Baixa e extrai todas as páginas de um time. Retorna os dados do time ou None.
+        '''
+        scraper = self.scraper
+        host = scraper.host
+        team_urls = [host+ranking, host+url]
+
+        self.log(f"Starting team '{url}' data extraction...", url=url, team_id=team_id, stage="team")
+        start = monotonic()
+
+        response = scraper.getResponse(url)
+        if not response:
+            self._error(f"Invalid response for URL '{url}'! (SKIPPING TEAM)", url=url, team_id=team_id)
+            scraper.cancelPrediction(url)
+            return None
+
+        try:
+            name, players, coach, matchlist_page, stats_page = self.parse(parseTeamPage, response)
+        except Exception:
+            scraper.cancelPrediction(url)
+            raise
+        scraper.checkPrediction(url, matchlist_page, stats_page)
+        scraper.downloader.addManyToQueue([matchlist_page, stats_page], 3)
+
+        response = scraper.getResponse(matchlist_page)
+        if not response:
+            self._error(f"Invalid response for URL '{matchlist_page}'! (SKIPPING TEAM)", url=matchlist_page, team_id=team_id)
+            return None
+        team_urls.append(host+matchlist_page)
+
+        recent_results, next_page = self.parse(parseMatchlistPage, response)
+        while next_page:
+            scraper.downloader.addToQueue(next_page, 3)
+            response = scraper.getResponse(next_page)
+            if not response:
+                self.log(f"Invalid response for URL '{next_page}'! (KEEPING {len(recent_results)} RESULTS)", "WARNING", url=next_page)
+                break
+            results, next_page = self.parse(parseMatchlistPage, response)
+            recent_results.extend(results)
+
+        response = scraper.getResponse(stats_page)
+        if not response:
+            self._error(f"Invalid response for URL '{stats_page}'! (SKIPPING TEAM)", url=stats_page, team_id=team_id)
+            return None
+        team_urls.append(host+stats_page)
+
+        maps_stats = self.parse(parseStatsPage, response)
+
+        self.log(f"Team '{url}' data extracted!", "DEBUG", url=url, team_id=team_id, stage="team", duration=round(monotonic() - start, 4))
+
+        return (team_id, name, players, region, coach, rank, recent_results, maps_stats, team_urls)
+
+    def writerRun(self):
+        '''
+            Estágio de escrita: adiciona os times extraídos ao dataset.
+        '''
+        while True:
+            item = self.results.get()
+            if item is None:
+                break
+
+            # Uma falha na escrita não pode encerrar a thread: os times continuam sendo consumidos até o sinal de término
+            ranking, team = item
+            try:
+                self.scraper.data_manager.addNewTeam(*team)
+                self.scraper.checkpoint.teamDone(ranking, team[0])
+            except Exception as e:
+                self._error(f"Team '{team[1]}' write FAILED with error {e}! (SKIPPING TEAM)", team_id=team[0], stage="write")
+                continue
+            self.log(f"Team '{team[1]}' added to dataset!", team_id=team[0], stage="write")
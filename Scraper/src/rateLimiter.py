@@ -0,0 +1,67 @@
+from threading import Lock
+from time import monotonic, sleep
+
+
+class RateLimiter:
+    '''
+        Limitador de taxa global baseado em token bucket.
+
+        Permite até `rate` requisições por segundo, com rajadas de até `burst` requisições.
+        A taxa é reduzida pela metade quando o servidor indica sobrecarga (HTTP 429, 5xx ou
+        desafio do Cloudflare) e volta a crescer gradualmente a cada resposta bem-sucedida.
+    '''
+    def __init__(self, rate:float, burst:int=1, min_rate:float=0.05, recovery:float=1.1):
+        if rate <= 0:
+            raise ValueError(f"Invalid rate {rate}, it must be a positive number of requests per second!")
+        if burst < 1:
+            raise ValueError(f"Invalid burst {burst}, it must be at least 1 request!")
+        self._target_rate = rate
+        self._rate = rate
+        self._burst = burst
+        self._min_rate = min(min_rate, rate)
+        self._recovery = recovery
+        self._tokens = float(self._burst)
+        self._last = monotonic()
+        self._lock = Lock()
+
+    def _refill(self):
+        '''
+            Atualiza a quantidade de tokens disponíveis. Deve ser chamado com o lock adquirido.
+        '''
+        now = monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._last)*self._rate)
+        self._last = now
+
+    def acquire(self):
+        '''
+            Consome um token, esperando o tempo necessário caso o balde esteja vazio.
+        '''
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens)/self._rate
+            sleep(delay)
+
+    def penalize(self):
+        '''
+            Reduz a taxa pela metade e esvazia o balde após um sinal de sobrecarga do servidor.
+        '''
+        with self._lock:
+            self._refill()
+            self._rate = max(self._min_rate, self._rate/2)
+            self._tokens = min(self._tokens, 0)
+
+    def reward(self):
+        '''
+            Aumenta gradualmente a taxa, até a taxa configurada, após uma resposta bem-sucedida.
+        '''
+        with self._lock:
+            if self._rate < self._target_rate:
+                self._refill()
+                self._rate = min(self._target_rate, self._rate*self._recovery)
+
+    def getRate(self) -> float:
+        return self._rate
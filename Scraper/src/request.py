@@ -8,6 +8,7 @@ class Request:
         self._url = url
         self._priority = priority
         self._response = None
+        self._attempts = 0
 
     def getUrl(self):
         '''
@@ -21,6 +22,22 @@ class Request:
         '''
         return self._priority.value
 
+    def raisePriority(self):
+        '''
+            Aumenta a prioridade da requisição em um nível (até a prioridade máxima).
+        '''
+        self._priority = Priority(min(self._priority.value + 1, Priority.HIGH.value))
+
+    def addAttempt(self) -> int:
+        '''
+            Registra uma tentativa de download, retornando o número de tentativas feitas.
+        '''
+        self._attempts += 1
+        return self._attempts
+
+    def getAttempts(self) -> int:
+        return self._attempts
+
     def getResponse(self):
         '''
             Retorna a resposta da requisição
@@ -0,0 +1,33 @@
+class PageResponse:
+    '''
+        Resposta de uma requisição que não foi gerada diretamente pelo cloudscraper
+        (engine assíncrona ou cache de páginas).
+
+        Expõe os mesmos atributos de `requests.Response` utilizados pelo scraper.
+        Os nomes dos cabeçalhos são armazenados em letras minúsculas.
+    '''
+    def __init__(self, url:str, status_code:int, headers:dict, content:bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = {key.lower(): value for key, value in headers.items()}
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+
+class FailedResponse(PageResponse):
+    '''
+        Resultado final de uma requisição que falhou, após todas as tentativas permitidas.
+
+        Mantém o status e o conteúdo da última resposta, o tipo do erro (`ErrorKind`) e o número de tentativas.
+    '''
+    def __init__(self, url:str, status_code:int, headers:dict, content:bytes, error, attempts:int):
+        super().__init__(url, status_code, headers, content)
+        self.error = error
+        self.attempts = attempts
+
+    @classmethod
+    def fromResponse(cls, response, error, attempts:int):
+        return cls(response.url, response.status_code, dict(response.headers), response.content, error, attempts)
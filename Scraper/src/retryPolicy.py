@@ -0,0 +1,83 @@
+import random
+from enum import Enum
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+class ErrorKind(Enum):
+    OK = "ok"
+    THROTTLED = "throttled"     # 429 ou desafio do Cloudflare: o servidor pede que as requisições diminuam
+    TRANSIENT = "transient"     # 5xx e 408: falhas temporárias do servidor
+    NETWORK = "network"         # Erros de conexão ou tempo esgotado (sem resposta do servidor)
+    PERMANENT = "permanent"     # Demais 4xx (ex.: 404): uma nova tentativa não mudaria o resultado
+
+
+# Código de status usado nas respostas geradas para erros de rede
+NETWORK_ERROR_STATUS = 599
+
+
+def classifyResponse(response) -> ErrorKind:
+    '''
+        Classifica a resposta de uma requisição.
+    '''
+    status = response.status_code
+    if status == NETWORK_ERROR_STATUS:
+        return ErrorKind.NETWORK
+    if status == 429 or (status == 403 and "cf-mitigated" in response.headers):
+        return ErrorKind.THROTTLED
+    if status >= 500 or status == 408:
+        return ErrorKind.TRANSIENT
+    if status >= 400:
+        return ErrorKind.PERMANENT
+    return ErrorKind.OK
+
+
+def parseRetryAfter(value:str|None) -> float | None:
+    '''
+        Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos de espera.
+    '''
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    '''
+        Política de novas tentativas de uma requisição.
+
+        Falhas temporárias, de rede e de limitação são repetidas até `max_attempts` tentativas, com espera
+        exponencial e jitter (um valor aleatório entre 0 e `base_delay * 2^tentativa`, limitado a `max_delay`).
+        Se o servidor informar o cabeçalho Retry-After, a espera é de pelo menos o tempo pedido
+        (limitado a `max_retry_after`). Esse limite deve ficar bem abaixo do tempo de espera pela resposta,
+        para que a nova tentativa não termine depois que quem espera pela resposta já desistiu.
+    '''
+    def __init__(self, max_attempts:int=5, base_delay:float=1.0, max_delay:float=60.0, max_retry_after:float=60.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def shouldRetry(self, kind:ErrorKind, attempts:int) -> bool:
+        return kind in (ErrorKind.THROTTLED, ErrorKind.TRANSIENT, ErrorKind.NETWORK) and attempts < self.max_attempts
+
+    def delay(self, attempts:int, response=None) -> float:
+        '''
+            Tempo de espera antes da próxima tentativa, após `attempts` tentativas.
+        '''
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**(attempts - 1)))
+
+        retry_after = parseRetryAfter(response.headers.get("retry-after")) if response is not None else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_retry_after))
+
+        return delay
@@ -1,37 +1,229 @@
+import heapq
+from itertools import count
 from threading import Condition
+from time import monotonic
 from src.request import Request
+from src.metrics import METRICS
 
 
 class Scheduler:
     '''
         Escalonador de requisições.
 
-        Ordena a fila de requisições de acordo com a prioridade.
+        Mantém a fila de requisições em um heap ordenado pela prioridade e, dentro
+        da mesma prioridade, pela ordem de chegada (FIFO).
+
+        URLs que já estão na fila ou em andamento não são adicionadas novamente.
+        Se `maxsize` for maior que zero, `put` bloqueia enquanto a fila estiver cheia.
+
+        Requisições que falharam podem ser reagendadas com `retry`: elas aguardam o tempo de espera
+        fora da fila (continuando em andamento, para que não sejam duplicadas) e voltam a ela com prioridade maior.
     '''
-    def __init__(self):
-        self._queue : list[Request] = list()
+    def __init__(self, maxsize:int=0):
+        self._queue : list[tuple[int, int, Request]] = list()
+        self._delayed : list[tuple[float, int, Request]] = list()
         self._condition = Condition()
+        self._counter = count()
+        self._maxsize = maxsize
+        self._queued : set[str] = set()
+        self._in_flight : dict[str, Request] = dict()
+        self._closed = False
+
+        # Contadores
+        self._total_put = 0
+        self._total_get = 0
+        self._duplicates = 0
+        self._retries = 0
+        self._max_depth = 0
+        self._total_wait = 0.0
+        self._enqueued_at : dict[str, float] = dict()
+
+    def _isFull(self):
+        return self._maxsize > 0 and len(self._queue) >= self._maxsize
+
+    def _isDuplicate(self, request:Request):
+        url = request.getUrl()
+        return url in self._queued or url in self._in_flight
+
+    def _push(self, request:Request) -> bool:
+        '''
+            Insere a requisição no heap. Deve ser chamado com o lock adquirido.
+        '''
+        url = request.getUrl()
+        if self._isDuplicate(request):
+            self._duplicates += 1
+            return False
+
+        heapq.heappush(self._queue, (-request.getPriority(), next(self._counter), request))
+        self._queued.add(url)
+        self._enqueued_at[url] = monotonic()
+        self._total_put += 1
+        self._max_depth = max(self._max_depth, len(self._queue))
+        return True
+
+    def _promoteDelayed(self):
+        '''
+            Move para a fila as requisições reagendadas cujo tempo de espera terminou. Deve ser chamado com o lock adquirido.
+        '''
+        now = monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, _, request = heapq.heappop(self._delayed)
+            self._in_flight.pop(request.getUrl(), None)
+            self._push(request)
+
+    def get(self) -> Request | None:
+        '''
+            Retorna a requisição de maior prioridade, esperando caso a fila esteja vazia.
+
+            Retorna None quando o escalonador é fechado.
+        '''
+        with self._condition:
+            while True:
+                self._promoteDelayed()
+                if self._queue or self._closed:
+                    break
+                # Espera até que uma requisição esteja disponível (ou até o fim da espera de uma reagendada)
+                timeout = self._delayed[0][0] - monotonic() if self._delayed else None
+                self._condition.wait(timeout)
+
+            if self._closed:
+                return None
+
+            _, _, request = heapq.heappop(self._queue)
+            url = request.getUrl()
+            self._queued.discard(url)
+            self._in_flight[url] = request
+            self._total_get += 1
+            wait = monotonic() - self._enqueued_at.pop(url, monotonic())
+            self._total_wait += wait
+            METRICS.observe("queue_wait_seconds", wait)
+
+            self._condition.notify_all() # Libera produtores esperando espaço na fila
+            return request
+
+    def put(self, request:Request) -> bool:
+        '''
+            Adiciona uma requisição na fila de requisições.
+
+            Retorna False se a URL já estiver na fila/em andamento ou se o escalonador estiver fechado.
+        '''
+        return self.putMany([request]) == 1
+
+    def putMany(self, requests:list[Request]) -> int:
+        '''
+            Adiciona várias requisições na fila de uma só vez.
+
+            Retorna o número de requisições efetivamente adicionadas.
+        '''
+        added = 0
+        requests = list(requests)
+        i = 0
 
-    def __reschedule(self):
+        with self._condition:
+            while i < len(requests) and not self._closed:
+                if self._isFull() and not self._isDuplicate(requests[i]):
+                    self._condition.notify_all()
+                    self._condition.wait()  # Back-pressure: espera até que exista espaço na fila
+                    continue
+
+                if self._push(requests[i]):
+                    added += 1
+                i += 1
+
+            self._condition.notify_all() # Notifica que novos itens foram adicionados
+
+        return added
+
+    def retry(self, request:Request, delay:float=0.0) -> bool:
+        '''
+            Reagenda uma requisição em andamento para daqui a `delay` segundos, com prioridade maior.
+
+            Retorna False se o escalonador estiver fechado.
+        '''
+        with self._condition:
+            if self._closed:
+                return False
+            request.raisePriority()
+            heapq.heappush(self._delayed, (monotonic() + delay, next(self._counter), request))
+            self._retries += 1
+            self._condition.notify_all()
+        return True
+
+    def cancel(self, url:str) -> bool:
+        '''
+            Remove uma requisição da fila (ou das reagendadas). Retorna False se ela não estiver na fila.
+        '''
+        with self._condition:
+            if url in self._queued:
+                self._queue = [item for item in self._queue if item[2].getUrl() != url]
+                heapq.heapify(self._queue)
+                self._queued.discard(url)
+                self._enqueued_at.pop(url, None)
+                self._condition.notify_all()
+                return True
+
+            delayed = [item for item in self._delayed if item[2].getUrl() != url]
+            if len(delayed) < len(self._delayed):
+                self._delayed = delayed
+                heapq.heapify(self._delayed)
+                self._in_flight.pop(url, None)
+                return True
+
+            return False
+
+    def isInFlight(self, url:str) -> bool:
+        with self._condition:
+            return url in self._in_flight
+
+    def taskDone(self, url:str):
+        '''
+            Marca a requisição de uma URL como finalizada, permitindo que ela seja agendada novamente.
+        '''
+        with self._condition:
+            self._in_flight.pop(url, None)
+
+    def close(self):
+        '''
+            Fecha o escalonador, acordando todas as threads bloqueadas em `get` e `put`.
         '''
-            Reordenação da fila
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def snapshot(self) -> list[tuple[str, int]]:
         '''
-        self._queue.sort(key=lambda r: r.getPriority(), reverse=True)
+            Retorna a URL e a prioridade das requisições na fila, reagendadas e em andamento.
+        '''
+        with self._condition:
+            # Requisições reagendadas continuam em andamento
+            requests = dict(self._in_flight)
+            requests.update((request.getUrl(), request) for _, _, request in self._queue)
+            return [(url, request.getPriority()) for url, request in requests.items()]
+
+    def isClosed(self) -> bool:
+        return self._closed
 
-    def get(self) -> Request:
+    def qsize(self) -> int:
         '''
-            Retorna uma requisição, caso exista na fila.
+            Retorna o número de requisições na fila.
         '''
         with self._condition:
-            while not self._queue:
-                self._condition.wait()  # Espera até que a requisição esteja disponível
-            return self._queue.pop(0)
+            return len(self._queue)
 
-    def put(self, request:Request):
+    def getStats(self) -> dict:
         '''
-            Adiciona uma requisição na fila de requisições
+            Retorna os contadores do escalonador (profundidade da fila e tempos de espera).
         '''
         with self._condition:
-            self._queue.append(request)
-            self.__reschedule()
-            self._condition.notify_all() # Notifica que um novo item foi adicionado
\ No newline at end of file
+            return {
+                "depth": len(self._queue),
+                "delayed": len(self._delayed),
+                "max_depth": self._max_depth,
+                "in_flight": len(self._in_flight),
+                "put": self._total_put,
+                "get": self._total_get,
+                "duplicates": self._duplicates,
+                "retries": self._retries,
+                "total_wait": self._total_wait,
+                "avg_wait": self._total_wait / self._total_get if self._total_get else 0.0,
+            }
@@ -1,12 +1,23 @@
-import re
 import os
+import signal
 import datetime
-from threading import Thread
-from time import sleep
+import threading
+from threading import Thread, Event, Lock
+from time import monotonic
 
 from src.downloader import Downloader
+from src.asyncDownloader import AsyncDownloader
+from src.retryPolicy import RetryPolicy
+from src.response import FailedResponse
+from src.pageCache import PageCache
 from src.dataExtractor import DataExtractor
 from src.dataManager import DataManager
+from src.pipeline import TeamPipeline
+from src.checkpoint import Checkpoint
+from src.frontier import Frontier
+from src.distributed import Coordinator, CrawlWorker
+from src.eventLog import EventLog
+from src.metrics import METRICS
 
 class VLRGGScraper:
     '''
@@ -24,32 +35,69 @@ class VLRGGScraper:
 
     host = "https://vlr.gg"
 
-    def __init__(self, filename):
-        self.downloader = Downloader(self.host)
-        self.stop = False
+    def __init__(self, filename, workers:int=5, rate:float=2.0, burst:int=5, engine:str="threads", concurrency:int=100, cache_dir:str|None=None, offline:bool=False, pipeline:bool=False, team_workers:int=8, parse_processes:int|None=None, refresh_after:float|None=None, log_level:str="INFO", metrics_file:str|None=None, max_attempts:int=5, checkpoint_file:str|None=None, resume:bool=False, checkpoint_interval:float=60.0, prefetch:bool=True):
+        now = datetime.datetime.now().strftime("%d-%m-%Y_%H-%M-%s")
+        self.log_file = f"scraper_log_{now}.jsonl"
+        self.event_log = EventLog(self.log_file, log_level)
+        self.cache = PageCache(cache_dir, offline=offline) if cache_dir else None
+        self.response_timeout = 300
+        # Uma nova tentativa pedida pelo servidor (Retry-After) deve terminar antes que quem espera pela resposta desista
+        retry_policy = RetryPolicy(max_attempts, max_retry_after=self.response_timeout/5)
+        if engine == "async":
+            self.downloader = AsyncDownloader(self.host, self.event_log, rate, burst, concurrency, self.cache, retry_policy)
+        else:
+            self.downloader = Downloader(self.host, self.event_log, rate, burst, self.cache, retry_policy)
+        self.engine = engine
+        self.workers = workers
+        self.pipeline = pipeline
+        self.team_workers = team_workers
+        self.parse_processes = parse_processes
+        self.refresh_after = refresh_after
+        self.prefetch = prefetch
+        self._prefetch_lock = Lock()
+        self._prefetch_hits = 0
+        self._prefetch_misses = 0
+        self.metrics_file = metrics_file
+        self.interrupted = False
+        self.checkpoint = Checkpoint(checkpoint_file)
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
+        self._checkpoint_stop = Event()
         self.data_extractor = DataExtractor()
         self.data_manager = DataManager(filename)
-        self.wait_time = 10
-        now = datetime.datetime.now().strftime("%d-%m-%Y_%H-%M-%s")
-        self.log_file = f"scraper_log_{now}"
+        if self.data_manager.imported_from:
+            self.log(f"Dataset '{filename}' created from '{self.data_manager.imported_from}' with {len(self.data_manager.teams)} teams")
+        self.drain_timeout = 30
     
-    def log(self, msg):
-        with open(self.log_file, mode="a") as file:
-            file.write(f"{msg}\n")
-        print(f"{msg}")
+    def log(self, msg, level:str="INFO", **fields):
+        '''
+            Registra um evento no log estruturado (JSON Lines), exibindo a mensagem no terminal.
+        '''
+        self.event_log.log(msg, level, source="scraper", echo=True, **fields)
 
     def getResponse(self, url:str):
         '''
             Obtém a resposta da requisição realizada para uma dada URL.
 
             Retorna o conteúdo (HTML) da resposta, se o status da resposta for OK.
+            Requisições que falharam após todas as tentativas são registradas no log com o tipo do erro.
         '''
-        response = None
-        while not response:
-            response = self.downloader.getResponse(url)
+        response = self.downloader.getResponse(url, self.response_timeout)
+        if response is None and self.interrupted:
+            return None
+        if response is None:
+            self.log(f"Timed out waiting {self.response_timeout}s for URL '{url}'!", "ERROR", url=url, stage="wait", duration=self.response_timeout)
+            return None
+
+        if isinstance(response, FailedResponse):
+            self.log(f"URL '{url}' failed after {response.attempts} attempt(s) with code {response.status_code} ({response.error.value})!", "ERROR",
+                     url=url, stage="download", status=response.status_code, attempts=response.attempts, error=response.error.value)
+            return None
         
         if response.status_code != 200:
             return None
+
+        self.checkpoint.urlCompleted(url)
         
         return response.content
 
@@ -57,53 +105,270 @@ class VLRGGScraper:
         '''
             Inicializa o WebScraper, configurando uma Thread dedicada para o crawler e
             efetuando o loop de execução para cada ranking.
+
+            Se `resume` for True, a coleta continua a partir do checkpoint da execução interrompida.
+            Um SIGINT interrompe a coleta de forma segura, salvando o checkpoint (retorna 130).
+        '''
+        previous_handler = self.handleInterrupts()
+        self.startDownloads()
+
+        # 1. Extraindo a lista de rankings por região (ou restaurando-a do checkpoint)
+        rankings = self.startCrawl()
+        if rankings is None:
+            if previous_handler is not None:
+                signal.signal(signal.SIGINT, previous_handler)
+            return -1
+
+        # 2. Adicionando o link dos rankings ainda não extraídos na fila de requisições
+        self.log("Adding rankings URLs to queue...")
+        self.downloader.addManyToQueue([ranking for ranking in rankings if self.checkpoint.getRanking(ranking) is None], 1)
+
+        # Salvando o checkpoint periodicamente
+        checkpoint_thread = None
+        if self.checkpoint.filename and self.checkpoint_interval > 0:
+            checkpoint_thread = Thread(target=self.checkpointRun, daemon=True)
+            checkpoint_thread.start()
+
+        # 3. Para cada ranking, executa o loop (ou o pipeline, com os times de todos os rankings em paralelo)
+        if self.pipeline:
+            code = TeamPipeline(self, self.team_workers, self.parse_processes).run(rankings)
+            if code == -1:
+                self.log("Pipelined data extraction finished with errors!")
+        else:
+            for ranking in rankings:
+                if self.interrupted:
+                    break
+                self.log("="*70)
+                self.log(f"Starting ranking '{ranking}' data extraction...")
+
+                code = self.mainloop(ranking)
+                if code == -1:
+                    self.log(f"Data extraction for ranking '{ranking}' finished with errors!")
+                    continue
+
+                self.log(f"Data extraction for ranking '{ranking}' successfully finished!")
+        self.log("="*70)
+
+        self.drainDownloads()
+        self._checkpoint_stop.set()
+        if checkpoint_thread is not None:
+            checkpoint_thread.join()
+        
+        self.saveDataset()
+
+        # Coleta interrompida: o checkpoint permite retomá-la; coleta finalizada: o checkpoint não é mais necessário
+        if self.interrupted:
+            self.saveCheckpoint()
+            stats = self.checkpoint.getStats()
+            self.log(f"Crawl interrupted with {stats['done']} teams collected and {stats['remaining']} remaining! Progress saved to '{self.checkpoint.filename}', run again with --resume to continue", "WARNING")
+        else:
+            self.checkpoint.remove()
+
+        if previous_handler is not None:
+            signal.signal(signal.SIGINT, previous_handler)
+
+        self.logStats()
+        self.report()
+        self.event_log.close()
+
+        return 130 if self.interrupted else 0
+
+    def startDownloads(self):
+        '''
+            Inicia as threads do crawler (ou o event loop, no modo assíncrono).
+        '''
+        self.downloader.start(self.workers)
+
+    def drainDownloads(self):
+        '''
+            Encerra os downloads: as threads do crawler terminam as requisições em andamento.
+        '''
+        self.downloader.close()
+        self.downloader.join(self.drain_timeout)
+
+    def saveDataset(self):
+        '''
+            Salva o Dataset. O Dataset em JSON Lines (ou SQLite) também é exportado como JSON, formato lido pelo simulador.
+        '''
+        self.data_manager.save_data()
+
+        stats = self.data_manager.getStats()
+        self.log(f"Dataset stats: {stats['teams']} teams, {stats['matches']} matches ({stats['merged']} with both teams on the dataset), "
+                 f"{stats['references']} team results referencing them")
+
+        if self.data_manager.store is not None:
+            json_filename = os.path.splitext(self.data_manager.filename)[0] + ".json"
+            self.data_manager.export_json(json_filename)
+            self.log(f"Dataset exported to '{json_filename}'")
+
+    def logStats(self):
+        '''
+            Registra as estatísticas do escalonador, do downloader e do cache de páginas.
+        '''
+        stats = self.downloader.scheduler.getStats()
+        self.log(f"Scheduler stats: {stats['get']} requests served, max queue depth {stats['max_depth']}, average queue wait {stats['avg_wait']:.2f}s, {stats['duplicates']} duplicates ignored")
+
+        stats = self.downloader.getStats()
+        self.log(f"Downloader stats: {stats['requests']} requests, {stats['retries']} retries, {stats['failures']} failures, {stats['breaker_trips']} circuit breaker trips, max concurrency {stats['max_concurrency']}, latency avg {stats['avg_latency']:.2f}s / p50 {stats['p50_latency']:.2f}s / p95 {stats['p95_latency']:.2f}s")
+
+        if self.prefetch:
+            self.log(f"Prefetch stats: {self._prefetch_hits} team pages predicted correctly, {self._prefetch_misses} mispredicted")
+
+        if self.cache:
+            stats = self.cache.getStats()
+            self.log(f"Cache stats: {stats['hits']} hits, {stats['misses']} misses, {stats['revalidated']} revalidated, {stats['entries']} pages ({stats['bytes']/1024/1024:.1f} MiB)")
+
+    def coordinate(self, frontier:Frontier) -> int:
+        '''
+            Executa o coordenador da coleta distribuída: os workers baixam e extraem as páginas e
+            o coordenador incorpora os times ao Dataset.
         '''
-        # Configurando thread crawler
-        for _ in range(5):
-            crawler_thread = Thread(target=self.downloaderRun, daemon=True)
-            crawler_thread.start()
+        previous_handler = self.handleInterrupts()
 
-        # 1. Extraindo a lista de rankings por região
+        code = Coordinator(self, frontier).run()
+        self.saveDataset()
+
+        if previous_handler is not None:
+            signal.signal(signal.SIGINT, previous_handler)
+
+        self.report()
+        self.event_log.close()
+
+        return code
+
+    def work(self, frontier:Frontier, worker_id:str, batch_size:int=8) -> int:
+        '''
+            Executa um worker da coleta distribuída, processando as unidades de trabalho da fronteira
+            até que o coordenador encerre a coleta.
+        '''
+        previous_handler = self.handleInterrupts()
+        self.startDownloads()
+
+        code = CrawlWorker(self, frontier, worker_id, batch_size).run()
+        self.drainDownloads()
+
+        if previous_handler is not None:
+            signal.signal(signal.SIGINT, previous_handler)
+
+        self.logStats()
+        self.report()
+        self.event_log.close()
+
+        return code
+
+    def startCrawl(self) -> list[str] | None:
+        '''
+            Retorna a lista de rankings a serem coletados, restaurando o checkpoint ao retomar uma coleta.
+
+            Retorna None caso a lista de rankings não possa ser extraída.
+        '''
+        if self.resume and self.checkpoint.load():
+            stats = self.checkpoint.getStats()
+            self.log(f"Resuming crawl from checkpoint '{self.checkpoint.filename}' saved at {self.checkpoint.saved_at}: "
+                     f"{stats['done']} teams collected, {stats['remaining']} remaining in {stats['extracted']} of {stats['rankings']} rankings")
+
+            # Times extraídos que ainda não tinham sido gravados no Dataset
+            if self.checkpoint.unsaved_matches:
+                self.data_manager.bulkLoadMatches(self.checkpoint.unsaved_matches)
+            if self.checkpoint.unsaved_teams:
+                self.data_manager.bulkLoad(self.checkpoint.unsaved_teams)
+                self.log(f"{len(self.checkpoint.unsaved_teams)} unsaved teams restored to the dataset")
+
+            # URLs pendentes voltam para a fila com as suas prioridades
+            pending = self.checkpoint.pending
+            for priority in sorted({priority for _, priority in pending}, reverse=True):
+                self.downloader.addManyToQueue([url for url, url_priority in pending if url_priority == priority], priority)
+
+            rankings = self.checkpoint.getRankings()
+            if rankings:
+                return rankings
+
+        elif self.resume:
+            self.log(f"No checkpoint found at '{self.checkpoint.filename}', starting a new crawl", "WARNING")
+        elif self.checkpoint.exists():
+            self.log(f"Checkpoint '{self.checkpoint.filename}' will be overwritten, use --resume to continue the interrupted crawl", "WARNING")
+
+        # Extraindo a lista de rankings por região
         self.downloader.addToQueue("/rankings", 1)
 
         ## Obtém a resposta da requisição
         response = self.getResponse("/rankings")
         if not response:
-            self.log("Invalid response for URL '/rankings'! (ABORTING)")
-            return -1
+            self.log("Invalid response for URL '/rankings'! (ABORTING)", "ERROR")
+            return None
 
         ## O método retorna uma lista com a url de todos os rankings por região
         self.log("Extracting Regional Rankings URLs...")
         try:
             rankings = self.data_extractor.extractRegionalRankingsPaths(response)
         except Exception as e:
-            self.log(f"Regional Rankings URLs extraction FAILED with error {e}! (ABORTING)")
-            return -1
+            self.log(f"Regional Rankings URLs extraction FAILED with error {e}! (ABORTING)", "ERROR")
+            return None
 
         #rankings = ["/rankings/brazil"]
 
-        # 2. Adicionando o link dos rankings na fila de requisições
-        self.log("Adding rankings URLs to queue...")
-        for ranking in rankings:
-            self.downloader.addToQueue(ranking, 1)
+        self.checkpoint.setRankings(rankings)
+        return rankings
 
-        # 3. Para cada ranking, executa o loop
-        for ranking in rankings:
-            self.log("="*70)
-            self.log(f"Starting ranking '{ranking}' data extraction...")
+    def handleInterrupts(self):
+        '''
+            Instala o tratador do SIGINT, para interromper a coleta de forma segura com Ctrl+C.
 
-            code = self.mainloop(ranking)
-            if code == -1:
-                self.log(f"Data extraction for ranking '{ranking}' finished with errors!")
-                continue
+            Retorna o tratador anterior (ou None, fora da thread principal, que é a única a receber sinais).
+        '''
+        if threading.current_thread() is threading.main_thread():
+            return signal.signal(signal.SIGINT, self.interrupt)
+        return None
 
-            self.log(f"Data extraction for ranking '{ranking}' successfully finished!")
-        self.log("="*70)
-        
-        self.data_manager.save_data()
-        self.stop = True
+    def interrupt(self, signum=None, frame=None):
+        '''
+            Tratador do SIGINT: interrompe a coleta de forma segura.
+
+            Novas requisições deixam de ser enviadas e as threads do crawler terminam as requisições em andamento.
+            Times incompletos são coletados novamente ao retomar. Um segundo SIGINT encerra o programa imediatamente.
+            Também pode ser chamado por outra thread (ex.: limite de tempo do benchmark).
+        '''
+        self.interrupted = True
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+        self.log("Interrupt received! Finishing in-flight downloads and saving progress (press Ctrl+C again to force quit)...", "WARNING")
+
+        # O escalonador e o armazenamento são fechados por outra thread, pois a thread principal pode estar com os seus locks
+        Thread(target=self.stopDownloads, daemon=True).start()
+
+    def stopDownloads(self):
+        self.downloader.close()
+        self.downloader.storage.close()
+
+    def saveCheckpoint(self):
+        '''
+            Salva o estado da coleta: progresso dos rankings, URLs pendentes e times e partidas ainda não gravados.
+        '''
+        try:
+            self.checkpoint.save(self.downloader.pending(), self.data_manager.unsavedTeams(), self.data_manager.unsavedMatches())
+        except OSError as e:
+            self.log(f"Checkpoint saving FAILED with error {e}!", "ERROR", stage="checkpoint")
 
-        return 0
+    def checkpointRun(self):
+        '''
+            Método executado pela thread de checkpoint: salva o estado da coleta a cada `checkpoint_interval` segundos.
+        '''
+        while not self._checkpoint_stop.wait(self.checkpoint_interval):
+            self.saveCheckpoint()
+            self.log("Checkpoint saved", "DEBUG", stage="checkpoint")
+
+    def report(self):
+        '''
+            Relatório de desempenho por etapa: espera na fila, limitador de taxa, latência e tamanho dos downloads,
+            espera pelas respostas, processamento das páginas e gravação do Dataset.
+        '''
+        self.log("Performance report:")
+        for line in METRICS.report():
+            self.log(line)
+
+        if self.metrics_file:
+            METRICS.dump(self.metrics_file)
+            self.log(f"Metrics exported to '{self.metrics_file}'")
 
     def mainloop(self, ranking):
         '''
@@ -116,128 +381,215 @@ class VLRGGScraper:
         '''
         return_code = 0
 
-        # 1. Espera pela resposta da requisição ao ranking
-        response = self.getResponse(ranking)
+        progress = self.checkpoint.getRanking(ranking)
+        if progress is not None:
+            # Ranking já extraído na execução interrompida: restam apenas os times ainda não coletados
+            region, teams = progress
+            self.log(f"Resuming ranking '{ranking}' from checkpoint, {len(teams)} teams remaining...")
+        else:
+            # 1. Espera pela resposta da requisição ao ranking
+            response = self.getResponse(ranking)
+            if not response:
+                self.log(f"Invalid response for URL '{ranking}'! (SKIPPING RANKING)", "ERROR", url=ranking)
+                return -1
+            
+            # 2. Extrai as URLs dos times
+            self.log(f"Extracting Teams URLs from ranking '{ranking}'...")
+            try:
+                urls, region = self.data_extractor.extractTeamsFromRanking(response)
+            except Exception as e:
+                self.log(f"Teams URLs extraction from ranking '{ranking}' FAILED with error {e}! (SKIPPING RANKING)", "ERROR")
+                return -1
+
+            # 3. Seleciona os times ausentes ou desatualizados no Dataset
+            teams = self.selectTeams(ranking, urls)
+            self.checkpoint.startRanking(ranking, region, teams)
+
+        # Adiciona as URLs dos times (e as páginas previstas de partidas e de estatísticas) na fila de requisições
+        self.queueTeams([url for _, url, _ in teams])
+
+        # 4. Para cada URL (time) no ranking
+        for rank, url, team_id in teams:
+            if self.interrupted:
+                break
+
+            start = monotonic()
+            team = self.collectTeam(ranking, rank, url, team_id, region, self.data_manager.matches)
+            if team is None:
+                return_code = -1
+                continue
+
+            # 4.8 Salva o time na na lista de times
+            self.data_manager.addNewTeam(*team)
+            self.checkpoint.teamDone(ranking, team_id)
+            self.log(f"Team '{team[1]}' added to dataset!", url=url, team_id=team_id, stage="team", duration=round(monotonic() - start, 4))
+
+        self.log("-"*70)
+
+        return return_code
+                
+    def collectTeam(self, ranking:str, rank:int, url:str, team_id:str, region:str, known=None):
+        '''
+            Baixa e extrai todas as páginas de um time.
+            Os detalhes das partidas cujos Ids estão em `known` (já presentes no Dataset) não são extraídos.
+
+            Retorna os dados do time (na ordem dos parâmetros de `DataManager.addNewTeam`), ou None caso alguma página falhe.
+        '''
+        team_ulrs = [self.host+ranking, self.host+url]
+
+        self.log("-"*70)
+        self.log(f"Starting team '{url}' data extraction...", url=url, team_id=team_id, stage="team")
+        start = monotonic()
+
+        # 4.1 Espera pela resposta da requisição da página do time
+        response = self.getResponse(url)
         if not response:
-            self.log(f"Invalid response for URL '{ranking}'! (SKIPPING RANKING)")
-            return -1
+            self.log(f"Invalid response for URL '{url}'! (SKIPPING TEAM)", "ERROR", url=url, team_id=team_id)
+            self.cancelPrediction(url)
+            return None
+
+        # 4.2 Extrai nome, jogadores, head coach e as URLs das páginas de partidas e de estatísticas do time
+        self.log(f"Extracting team '{url}' info, matchlist and statistics pages URLs...")
+        try:
+            name, players, coach, matchlist_page, stats_page = self.data_extractor.extractTeamPage(response)
+        except Exception as e:
+            self.log(f"Team '{url}' info extraction FAILED with error {e}! (SKIPPING TEAM)", "ERROR", url=url, team_id=team_id, stage="parse")
+            self.cancelPrediction(url)
+            return None
+
+        # 4.3 Adiciona as páginas de partidas e de estatísticas do time na fila de requisições (caso a previsão tenha falhado)
+        self.checkPrediction(url, matchlist_page, stats_page)
+        self.downloader.addManyToQueue([matchlist_page, stats_page], 3)
+
+        # 4.4 Espera pela resposta da requisição da página de lista de partidas do time
+        response = self.getResponse(matchlist_page)
+        if not response:
+            self.log(f"Invalid response for URL '{matchlist_page}'! (SKIPPING TEAM)", "ERROR", url=matchlist_page, team_id=team_id)
+            return None
+        team_ulrs.append(self.host+matchlist_page)
         
-        # 2. Extrai as URLs dos times
-        self.log(f"Extracting Teams URLs from ranking '{ranking}'...")
+        # 4.5 Extrai os resultados recentes do time
+        self.log(f"Extracting team '{url}' recent matches results...")
         try:
-            urls, region = self.data_extractor.extractTeamsFromRanking(response)
+            recent_results = self.extractRecentResults(url, response, known)
         except Exception as e:
-            self.log(f"Teams URLs extraction from ranking '{ranking}' FAILED with error {e}! (SKIPPING RANKING)")
-            return -1
+            self.log(f"Team '{url}' recent matches results extracion FAILED with error {e}! (SKIPPING TEAM)", "ERROR", url=url, team_id=team_id, stage="parse")
+            return None
 
-        # 3. Adiciona as URLs na fila de requisições
-        for url in urls:
-            self.downloader.addToQueue(url, 2)
+        # 4.6 Espera pela resposta da requisição da página de estatísticas do time
+        response = self.getResponse(stats_page)
+        if not response:
+            self.log(f"Invalid response for URL '{stats_page}'! (SKIPPING TEAM)", "ERROR", url=stats_page, team_id=team_id)
+            return None
+        team_ulrs.append(self.host+stats_page)
 
-        # 4. Para cada URL (time) no ranking
-        rank = 0
+        # 4.7 Extrai as estatísticas de mapas do time
+        self.log(f"Extracting team '{url}' maps statistics...")
+        try:
+            maps_stats = self.data_extractor.extractTeamMapsStats(response)
+        except Exception as e:
+            self.log(f"Team '{url}' maps statistics extraction FAILED with error {e}! (SKIPPING TEAM)", "ERROR", url=url, team_id=team_id, stage="parse")
+            return None
 
-        for url in urls:
-            team_ulrs = [self.host+ranking, self.host+url]
-            rank += 1
+        self.log(f"Team '{url}' data extracted!", "DEBUG", url=url, team_id=team_id, stage="team", duration=round(monotonic() - start, 4))
 
-            self.log("-"*70)
-            self.log(f"Starting team '{url}' data extraction...")
+        return (team_id, name, players, region, coach, rank, recent_results, maps_stats, team_ulrs)
 
-            # 4.1 Espera pela resposta da requisição da página do time
-            response = self.getResponse(url)
-            if not response:
-                self.log(f"Invalid response for URL '{url}'! (SKIPPING TEAM)")
-                return_code = -1
-                continue
+    def queueTeams(self, urls:list[str]):
+        '''
+            Adiciona as páginas dos times na fila de requisições.
 
-            # 4.2 Extrai o ID do time da URL
-            team_id = re.search(r"\d+", url).group(0)
-            if self.data_manager.datasetHasTeam(team_id):
-                self.log(f"Team '{team_id}' already on the dataset! (SKIPPING TEAM)")
-                continue
+            Com a pré-busca, as páginas de partidas e de estatísticas previstas a partir da URL de cada time são adicionadas
+            logo após a página do time, com a mesma prioridade: as três páginas são baixadas em paralelo, na ordem em que
+            serão processadas, em vez de esperar pelo processamento da página do time.
+        '''
+        if not self.prefetch:
+            self.downloader.addManyToQueue(urls, 2)
+            return
 
-            # 4.3 Extrai nome, jogadores e head coach do time
-            self.log(f"Extracting team '{url}' info...")
-            try:
-                name, players, coach = self.data_extractor.extractTeamInfo(response)
-            except Exception as e:
-                self.log(f"Team '{url}' info extraction FAILED with error {e}! (SKIPPING TEAM)")
-                return_code = -1
-                continue
+        pages = []
+        for url in urls:
+            pages.append(url)
+            pages.extend(self.data_extractor.predictTeamPages(url) or ())
+        self.downloader.addManyToQueue(pages, 2)
 
-            # 4.4 Extrai a URL para a página com a lista de partidas do time e adiciona na fila de requisições
-            self.log(f"Extracting team '{url}' matchlist page URL...")
-            try:
-                matchlist_page = self.data_extractor.extractTeamMatchlistPage(response)
-            except Exception as e:
-                self.log(f"Team '{url}' matchlist page URL extraction FAILED with error {e}! (SKIPPING TEAM)")
-                return_code = -1
-                continue
-            self.downloader.addToQueue(matchlist_page, 3)
+    def checkPrediction(self, url:str, matchlist_page:str, stats_page:str) -> bool:
+        '''
+            Compara as páginas previstas de um time com as extraídas da sua página, cancelando as previsões erradas.
 
-            # 4.5 Extrai a URL para a página de estatísticas do time e adiciona na fila de requisições
-            self.log(f"Extracting team '{url}' statistics page URL...")
-            try:
-                stats_page = self.data_extractor.extractTeamStatsPage(response)
-            except Exception as e:
-                self.log(f"Team '{url}' statistics page URL extraction FAILED with error {e}! (SKIPPING TEAM)")
-                return_code = -1
-                continue
-            self.downloader.addToQueue(stats_page, 3)
+            Retorna True se a previsão estiver correta.
+        '''
+        if not self.prefetch:
+            return False
+
+        predicted = self.data_extractor.predictTeamPages(url)
+        if predicted == (matchlist_page, stats_page):
+            with self._prefetch_lock:
+                self._prefetch_hits += 1
+            return True
+
+        with self._prefetch_lock:
+            self._prefetch_misses += 1
+        if predicted is not None:
+            wrong = [page for page in predicted if page not in (matchlist_page, stats_page)]
+            self.downloader.cancel(wrong)
+            self.log(f"Team '{url}' pages differ from the prefetched ones {predicted}, cancelling {wrong}", "WARNING", url=url, stage="prefetch")
+        return False
+
+    def cancelPrediction(self, url:str):
+        '''
+            Cancela as páginas previstas de um time cuja página não pôde ser baixada ou extraída.
+        '''
+        if not self.prefetch:
+            return
 
-            # 4.6 Espera pela resposta da requisição da página de lista de partidas do time
-            response = self.getResponse(matchlist_page)
-            if not response:
-                self.log(f"Invalid response for URL '{matchlist_page}'! (SKIPPING TEAM)")
-                return_code = -1
-                continue
-            team_ulrs.append(self.host+matchlist_page)
-            
-            # 4.7 Extrai os resultados recentes do time
-            self.log(f"Extracting team '{url}' recent matches results...")
-            try:
-                recent_results = self.data_extractor.extractTeamRecentMatchesResult(response)
-            except Exception as e:
-                self.log(f"Team '{url}' recent matches results extracion FAILED with error {e}! (SKIPPING TEAM)")
-                return_code = -1
-                continue
+        predicted = self.data_extractor.predictTeamPages(url)
+        if predicted is not None:
+            self.downloader.cancel(list(predicted))
+            self.log(f"Team '{url}' skipped, cancelling its prefetched pages {predicted}", "WARNING", url=url, stage="prefetch")
 
-            # 4.8 Espera pela resposta da requisição da página de estatísticas do time
-            response = self.getResponse(stats_page)
-            if not response:
-                self.log(f"Invalid response for URL '{stats_page}'! (SKIPPING TEAM)")
-                return_code = -1
-                continue
-            team_ulrs.append(self.host+stats_page)
+    def selectTeams(self, ranking, urls):
+        '''
+            Seleciona, a partir dos IDs presentes nas URLs, os times de um ranking que precisam ser coletados:
+            times ausentes no Dataset ou com registros mais antigos que `refresh_after` segundos.
 
-            # 4.9 Extrai as estatísticas de mapas do time
-            self.log(f"Extracting team '{url}' maps statistics...")
-            try:
-                maps_stats = self.data_extractor.extractTeamMapsStats(response)
-            except Exception as e:
-                self.log(f"Team '{url}' maps statistics extraction FAILED with error {e}! (SKIPPING TEAM)")
-                return_code = -1
-                continue
+            Retorna uma lista de tuplas (rank, url, id do time).
+        '''
+        teams = []
+        for rank, url in enumerate(urls, start=1):
+            team_id = self.data_extractor.extractTeamId(url)
+            if self.data_manager.teamNeedsUpdate(team_id, self.refresh_after):
+                teams.append((rank, url, team_id))
 
-            # 4.10 Salva o time na na lista de times
-            self.data_manager.addNewTeam(team_id, name, players, region, coach, rank, recent_results, maps_stats, team_ulrs[:])
-            self.log(f"Team '{name}' added to dataset!")
+        skipped = len(urls) - len(teams)
+        if skipped:
+            self.log(f"{skipped} teams from ranking '{ranking}' already up to date on the dataset! (SKIPPING TEAMS)")
 
-        self.log("-"*70)
+        return teams
 
-        return return_code
-                
-    def downloaderRun(self):
+    def extractRecentResults(self, url, response, known=None):
         '''
-            Método executado pela thread dedicada do crawler.
+            Extrai os resultados recentes de um time a partir da sua página de partidas.
 
-            Chama o método que efetua o download de uma página do crawler e
-            espera por um tempo predefinido antes de efetuar um novo download.
+            As páginas seguintes da lista de partidas são baixadas apenas enquanto todas
+            as partidas da página atual estiverem dentro da janela de resultados recentes.
+            Os detalhes das partidas cujos Ids estão em `known` não são extraídos novamente.
         '''
-        while not self.stop:
-            self.downloader.requestPage()
-            sleep(self.wait_time)
+        recent_results, next_page = self.data_extractor.extractTeamRecentMatchesPage(response, known=known)
+
+        while next_page:
+            self.log(f"Team '{url}' recent matches continue on page '{next_page}'...")
+            self.downloader.addToQueue(next_page, 3)
+
+            response = self.getResponse(next_page)
+            if not response:
+                self.log(f"Invalid response for URL '{next_page}'! (KEEPING {len(recent_results)} RESULTS)", "WARNING", url=next_page)
+                break
+
+            results, next_page = self.data_extractor.extractTeamRecentMatchesPage(response, known=known)
+            recent_results.extend(results)
+
+        return recent_results
 
 
     
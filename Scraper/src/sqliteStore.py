@@ -0,0 +1,356 @@
+import json
+import sqlite3
+from threading import Lock
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS teams (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    coach TEXT,
+    region TEXT,
+    rank INTEGER,
+    urls TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS players (
+    team_id TEXT NOT NULL REFERENCES teams(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (team_id, position)
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    team_id TEXT NOT NULL REFERENCES teams(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    date TEXT,
+    series TEXT,
+    opponent TEXT,
+    result TEXT,
+    vlr_id TEXT
+);
+CREATE TABLE IF NOT EXISTS match_maps (
+    match_id INTEGER NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    map TEXT NOT NULL,
+    score TEXT,
+    team_score INTEGER,
+    opponent_score INTEGER,
+    PRIMARY KEY (match_id, position)
+);
+CREATE TABLE IF NOT EXISTS map_stats (
+    team_id TEXT NOT NULL REFERENCES teams(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    map TEXT NOT NULL,
+    win_pct REAL,
+    atk_rwin_pct REAL,
+    def_rwin_pct REAL,
+    PRIMARY KEY (team_id, position)
+);
+CREATE TABLE IF NOT EXISTS vlr_matches (
+    id TEXT PRIMARY KEY,
+    url TEXT,
+    date TEXT,
+    series TEXT,
+    team_a_id TEXT,
+    team_a_name TEXT,
+    team_b_id TEXT,
+    team_b_name TEXT,
+    score_a INTEGER,
+    score_b INTEGER,
+    winner INTEGER
+);
+CREATE TABLE IF NOT EXISTS vlr_match_maps (
+    match_id TEXT NOT NULL REFERENCES vlr_matches(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    map TEXT NOT NULL,
+    score_a INTEGER,
+    score_b INTEGER,
+    PRIMARY KEY (match_id, position)
+);
+CREATE INDEX IF NOT EXISTS teams_name ON teams(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS teams_region ON teams(region);
+CREATE INDEX IF NOT EXISTS matches_team ON matches(team_id);
+CREATE INDEX IF NOT EXISTS match_maps_map ON match_maps(map);
+CREATE INDEX IF NOT EXISTS vlr_matches_team_a ON vlr_matches(team_a_id);
+CREATE INDEX IF NOT EXISTS vlr_matches_team_b ON vlr_matches(team_b_id);
+CREATE INDEX IF NOT EXISTS vlr_match_maps_map ON vlr_match_maps(map);
+CREATE INDEX IF NOT EXISTS map_stats_map ON map_stats(map, win_pct);
+'''
+
+
+def parsePercent(value:str) -> float | None:
+    '''
+        Converte uma porcentagem no formato do site ("57%") em número. Retorna None se não houver valor.
+    '''
+    try:
+        return float(value.replace("%", "").strip())
+    except (AttributeError, ValueError):
+        return None
+
+def formatPercent(value:float | None) -> str:
+    return "" if value is None else f"{value:g}%"
+
+def parseScore(score:str) -> tuple[int | None, int | None]:
+    '''
+        Converte um placar de mapa ("13-10") nos rounds de cada time.
+    '''
+    try:
+        team_score, opponent_score = score.split("-")
+        return int(team_score), int(opponent_score)
+    except (AttributeError, ValueError):
+        return None, None
+
+
+class SQLiteStore:
+    '''
+        Armazenamento do Dataset em um banco SQLite com tabelas normalizadas
+        (teams, players, matches, match_maps e map_stats).
+
+        Resultados recentes que referenciam uma partida do armazenamento de partidas (ver `SQLiteMatchStore`)
+        são gravados na tabela matches apenas com o Id da partida (vlr_id) e o resultado.
+
+        Porcentagens são armazenadas como números e as tabelas possuem índices por nome do time,
+        região e mapa. Os times são gravados em lotes de `batch_size`, cada lote em uma única transação.
+    '''
+    def __init__(self, filename:str, batch_size:int=10):
+        self.filename = filename
+        self.batch_size = batch_size
+        self._pending : list[dict] = list()
+        self._lock = Lock()
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+        self.__migrate()
+
+    def __migrate(self):
+        '''
+            Atualiza bancos criados antes da coluna matches.vlr_id.
+        '''
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(matches)")]
+        if "vlr_id" not in columns:
+            with self.connection:
+                self.connection.execute("ALTER TABLE matches ADD COLUMN vlr_id TEXT")
+
+    def load(self):
+        '''
+            Lê os times do banco, um por vez, no formato de registro do Dataset.
+        '''
+        with self._lock:
+            ids = [row[0] for row in self.connection.execute("SELECT id FROM teams ORDER BY rowid")]
+        for id in ids:
+            yield self.getTeam(id)
+
+    def getTeam(self, id) -> dict | None:
+        '''
+            Reconstrói o registro de um time a partir das tabelas normalizadas.
+        '''
+        with self._lock:
+            cursor = self.connection.cursor()
+            row = cursor.execute("SELECT id, name, coach, region, rank, urls, updated_at FROM teams WHERE id = ?", (id,)).fetchone()
+            if row is None:
+                return None
+
+            players = [name for (name,) in cursor.execute("SELECT name FROM players WHERE team_id = ? ORDER BY position", (id,))]
+
+            recent_results = []
+            for match_id, date, series, opponent, result, vlr_id in cursor.execute(
+                    "SELECT id, date, series, opponent, result, vlr_id FROM matches WHERE team_id = ? ORDER BY position", (id,)).fetchall():
+                if vlr_id is not None:
+                    recent_results.append({"match": vlr_id, "result": result})
+                    continue
+                maps = {map_name: score for map_name, score in cursor.execute(
+                    "SELECT map, score FROM match_maps WHERE match_id = ? ORDER BY position", (match_id,))}
+                recent_results.append({"date": date, "series": series, "oponent": opponent, "result": result, "maps": maps})
+
+            maps_stats = [
+                {"Map": map_name, "WIN%": formatPercent(win), "ATK RWIN%": formatPercent(atk), "DEF RWIN%": formatPercent(defense)}
+                for map_name, win, atk, defense in cursor.execute(
+                    "SELECT map, win_pct, atk_rwin_pct, def_rwin_pct FROM map_stats WHERE team_id = ? ORDER BY position", (id,))
+            ]
+
+        team = {
+            "Id": row[0],
+            "Name": row[1],
+            "Players": players,
+            "Coach": row[2],
+            "Region": row[3],
+            "Rank": row[4],
+            "Recent Results": recent_results,
+            "Maps Stats": maps_stats,
+            "URLs": json.loads(row[5]) if row[5] else [],
+        }
+        if row[6]:
+            team["Updated At"] = row[6]
+        return team
+
+    def append(self, record:dict):
+        '''
+            Adiciona um time (ou a remoção de um time) ao lote pendente, gravando o lote quando ele estiver cheio.
+        '''
+        self.appendMany([record])
+
+    def appendMany(self, records:list[dict]):
+        with self._lock:
+            self._pending.extend(records)
+            if len(self._pending) >= self.batch_size:
+                self.__flush()
+
+    def pending(self) -> list[dict]:
+        '''
+            Registros do lote pendente, ainda não gravados no banco.
+        '''
+        with self._lock:
+            return [record for record in self._pending if not record.get("Deleted")]
+
+    def save(self, records=None):
+        '''
+            Grava os times pendentes.
+        '''
+        with self._lock:
+            self.__flush()
+
+    def __flush(self):
+        '''
+            Grava o lote pendente em uma única transação. Deve ser chamado com o lock adquirido.
+        '''
+        if not self._pending:
+            return
+
+        with self.connection:
+            cursor = self.connection.cursor()
+            for record in self._pending:
+                # Remove o registro anterior (e, em cascata, jogadores, partidas e estatísticas)
+                cursor.execute("DELETE FROM teams WHERE id = ?", (record["Id"],))
+                if not record.get("Deleted"):
+                    self.__insert(cursor, record)
+
+        self._pending.clear()
+
+    def __insert(self, cursor, team:dict):
+        id = team["Id"]
+        cursor.execute(
+            "INSERT INTO teams (id, name, coach, region, rank, urls, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (id, team["Name"], team.get("Coach"), team.get("Region"), team.get("Rank"), json.dumps(team.get("URLs", [])), team.get("Updated At"))
+        )
+        cursor.executemany(
+            "INSERT INTO players (team_id, position, name) VALUES (?, ?, ?)",
+            [(id, i, player) for i, player in enumerate(team.get("Players", []))]
+        )
+        for i, match in enumerate(team.get("Recent Results", [])):
+            if "match" in match:
+                cursor.execute("INSERT INTO matches (team_id, position, result, vlr_id) VALUES (?, ?, ?, ?)",
+                               (id, i, match["result"], match["match"]))
+                continue
+            cursor.execute(
+                "INSERT INTO matches (team_id, position, date, series, opponent, result) VALUES (?, ?, ?, ?, ?, ?)",
+                (id, i, match["date"], match["series"], match["oponent"], match["result"])
+            )
+            match_id = cursor.lastrowid
+            cursor.executemany(
+                "INSERT INTO match_maps (match_id, position, map, score, team_score, opponent_score) VALUES (?, ?, ?, ?, ?, ?)",
+                [(match_id, j, map_name, score, *parseScore(score)) for j, (map_name, score) in enumerate(match["maps"].items())]
+            )
+        cursor.executemany(
+            "INSERT INTO map_stats (team_id, position, map, win_pct, atk_rwin_pct, def_rwin_pct) VALUES (?, ?, ?, ?, ?, ?)",
+            [(id, i, stats["Map"], parsePercent(stats["WIN%"]), parsePercent(stats["ATK RWIN%"]), parsePercent(stats["DEF RWIN%"]))
+             for i, stats in enumerate(team.get("Maps Stats", []))]
+        )
+
+    def findTeamsByMapWinRate(self, map_name:str, min_win_pct:float, region:str|None=None) -> list[tuple[str, str, float]]:
+        '''
+            Retorna (id, nome, WIN%) dos times com porcentagem de vitórias em um mapa maior que `min_win_pct`,
+            opcionalmente apenas de uma região.
+        '''
+        query = '''
+            SELECT teams.id, teams.name, map_stats.win_pct
+            FROM map_stats JOIN teams ON teams.id = map_stats.team_id
+            WHERE map_stats.map = ? AND map_stats.win_pct > ?
+        '''
+        params = [map_name, min_win_pct]
+        if region is not None:
+            query += " AND teams.region = ?"
+            params.append(region)
+        query += " ORDER BY map_stats.win_pct DESC"
+
+        with self._lock:
+            return self.connection.execute(query, params).fetchall()
+
+    def close(self):
+        self.save()
+        self.connection.close()
+
+
+class SQLiteMatchStore:
+    '''
+        Armazenamento das partidas do Dataset (tabelas vlr_matches e vlr_match_maps), no mesmo banco de um SQLiteStore.
+
+        Os lados da partida ("Teams") são gravados como time A e time B, e o vencedor como o índice do lado (0 ou 1).
+        As partidas são gravadas imediatamente, cada chamada em uma única transação.
+    '''
+    def __init__(self, store:SQLiteStore):
+        self.store = store
+
+    def load(self):
+        '''
+            Lê as partidas do banco no formato de registro do Dataset.
+        '''
+        with self.store._lock:
+            cursor = self.store.connection.cursor()
+            maps = dict()
+            for match_id, map_name, score_a, score_b in cursor.execute(
+                    "SELECT match_id, map, score_a, score_b FROM vlr_match_maps ORDER BY match_id, position"):
+                maps.setdefault(match_id, []).append({"Map": map_name, "Score": [score_a, score_b]})
+
+            rows = cursor.execute("SELECT id, url, date, series, team_a_id, team_a_name, team_b_id, team_b_name, "
+                                  "score_a, score_b, winner FROM vlr_matches ORDER BY rowid").fetchall()
+
+        for id, url, date, series, team_a_id, team_a_name, team_b_id, team_b_name, score_a, score_b, winner in rows:
+            yield {
+                "Id": id,
+                "URL": url,
+                "Date": date,
+                "Series": series,
+                "Teams": [{"Id": team_a_id, "Name": team_a_name}, {"Id": team_b_id, "Name": team_b_name}],
+                "Score": None if score_a is None else [score_a, score_b],
+                "Winner": winner,
+                "Maps": maps.get(id, []),
+            }
+
+    def append(self, record:dict):
+        self.appendMany([record])
+
+    def appendMany(self, records:list[dict]):
+        '''
+            Grava (ou substitui) as partidas em uma única transação.
+        '''
+        if not records:
+            return
+
+        with self.store._lock, self.store.connection:
+            cursor = self.store.connection.cursor()
+            for match in records:
+                team_a, team_b = match["Teams"]
+                score_a, score_b = match["Score"] or (None, None)
+                # Remove o registro anterior (e, em cascata, os mapas)
+                cursor.execute("DELETE FROM vlr_matches WHERE id = ?", (match["Id"],))
+                cursor.execute(
+                    "INSERT INTO vlr_matches (id, url, date, series, team_a_id, team_a_name, team_b_id, team_b_name, score_a, score_b, winner) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (match["Id"], match.get("URL"), match.get("Date"), match.get("Series"), team_a["Id"], team_a["Name"],
+                     team_b["Id"], team_b["Name"], score_a, score_b, match.get("Winner"))
+                )
+                cursor.executemany(
+                    "INSERT INTO vlr_match_maps (match_id, position, map, score_a, score_b) VALUES (?, ?, ?, ?, ?)",
+                    [(match["Id"], i, game["Map"], *game["Score"]) for i, game in enumerate(match.get("Maps", []))]
+                )
+
+    def pending(self) -> list[dict]:
+        '''
+            Partidas ainda não gravadas no banco (nenhuma: cada partida é gravada ao ser adicionada).
+        '''
+        return []
+
+    def save(self, records=None):
+        pass
@@ -1,32 +1,131 @@
-from threading import Condition
+from collections import OrderedDict
+from threading import Condition, Lock
+from time import monotonic
 from src.request import Request
+from src.metrics import METRICS
 
 class Storage:
     '''
         Classe responsável pelo armazenamento de requisições já realizadas.
+
+        As requisições são indexadas pela URL e cada consumidor espera apenas pela
+        sua própria URL. Requisições que ninguém coletou são descartadas após `ttl`
+        segundos ou quando o armazenamento ultrapassa `max_entries` itens.
     '''
-    def __init__(self):
-        self._data : list[Request] = list()
-        self._condition = Condition()
-    
+    def __init__(self, ttl:float=3600, max_entries:int=1000):
+        self._data : OrderedDict[str, tuple[Request, float]] = OrderedDict()
+        self._lock = Lock()
+        self._waiters : dict[str, Condition] = dict()
+        self._waiting : dict[str, int] = dict()
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._evicted = 0
+        self._closed = False
+
+    def _evict(self):
+        '''
+            Remove requisições expiradas ou excedentes. Deve ser chamado com o lock adquirido.
+        '''
+        now = monotonic()
+        excess = len(self._data) - self._max_entries if self._max_entries else 0
+        expired = list()
+
+        # Os itens estão em ordem de inserção, então os mais antigos estão no início
+        for url, (_, stored_at) in self._data.items():
+            if excess <= len(expired) and not (self._ttl and now - stored_at > self._ttl):
+                break
+            # Requisições com consumidores esperando não são descartadas
+            if url not in self._waiters:
+                expired.append(url)
+
+        for url in expired:
+            del self._data[url]
+        self._evicted += len(expired)
+
     def put(self, request:Request):
         '''
-            Adiciona uma requisição na lista.
+            Adiciona uma requisição no armazenamento, acordando apenas quem espera pela sua URL.
         '''
-        with self._condition:
-            self._data.append(request)
-            self._condition.notify_all()
-    
-    def get(self, url):
+        url = request.getUrl()
+        with self._lock:
+            self._data[url] = (request, monotonic())
+            self._data.move_to_end(url)
+
+            waiter = self._waiters.get(url)
+            if waiter:
+                waiter.notify_all()
+
+            self._evict()
+
+    def get(self, url, timeout:float|None=None) -> Request | None:
         '''
             Retorna a requisição realizada para uma dada url.
+
+            Aguarda até `timeout` segundos (ou indefinidamente, se None) pela requisição.
+            Retorna None caso o tempo de espera se esgote ou o armazenamento seja fechado.
+        '''
+        start = monotonic()
+        with self._lock:
+            if url not in self._data and not self._closed:
+                waiter = self._waiters.setdefault(url, Condition(self._lock))
+                self._waiting[url] = self._waiting.get(url, 0) + 1
+                deadline = None if timeout is None else monotonic() + timeout
+
+                # Aguardar enquanto a solicitação desejada não estiver armazenada
+                while url not in self._data and not self._closed:
+                    remaining = None if deadline is None else deadline - monotonic()
+                    if remaining is not None and remaining <= 0:
+                        break
+                    waiter.wait(remaining)
+
+                self._waiting[url] -= 1
+                if self._waiting[url] == 0:
+                    del self._waiting[url]
+                    del self._waiters[url]
+
+            item = self._data.pop(url, None)  # Remover o item quando encontrado
+
+        METRICS.observe("storage_wait_seconds", monotonic() - start)
+        return item[0] if item else None
+
+    def close(self):
+        '''
+            Fecha o armazenamento, liberando todos os consumidores que esperam por requisições.
+        '''
+        with self._lock:
+            self._closed = True
+            for waiter in self._waiters.values():
+                waiter.notify_all()
+
+    def discard(self, url:str) -> bool:
+        '''
+            Descarta a requisição armazenada de uma URL. Retorna False se ela não estiver armazenada.
+        '''
+        with self._lock:
+            return self._data.pop(url, None) is not None
+
+    def __contains__(self, url:str):
+        with self._lock:
+            return url in self._data
+
+    def snapshot(self) -> list[tuple[str, int]]:
+        '''
+            Retorna a URL e a prioridade das requisições armazenadas e ainda não coletadas.
+        '''
+        with self._lock:
+            return [(url, request.getPriority()) for url, (request, _) in self._data.items()]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def getStats(self) -> dict:
+        '''
+            Retorna os contadores do armazenamento.
         '''
-        with self._condition:
-            # Aguardar enquanto a solicitação desejada não estiver na lista
-            while True:
-                request = next((r for r in self._data if r.getUrl() == url), None)
-                if request:
-                    self._data.remove(request)  # Remover o item quando encontrado
-                    return request
-                # Caso não tenha encontrado o item, aguardar até que algo seja adicionado
-                self._condition.wait()
\ No newline at end of file
+        with self._lock:
+            return {
+                "stored": len(self._data),
+                "waiting": len(self._waiters),
+                "evicted": self._evicted,
+            }
@@ -1,6 +1,7 @@
-import os
 import json
 
+from model import load_model, SERIES_WEIGHTS
+
 
 def load_data():
     with open("./VLRGG_Scraping_Dataset.json", mode="r") as file:
@@ -65,47 +66,42 @@ def calc_p_recent_results(teamA, teamB):
 
     return p_recentA, p_recentB
 
-def main(name_teamA:str, name_teamB:str, series:int, maps:list[str]):
-    data = load_data()
-    
-    weights = []
-    match series:
-        case 1:
-            weights = {"rank":0.4, "map":0.5, "results":0.1}
-        case 3:
-            weights = {"rank":0.4, "map":0.4, "results":0.2}
-        case 5:
-            weights = {"rank":0.2, "map":0.4, "results":0.4}
-
-    teamA = None
-    for team in data["teams"]:
-        if team["Name"].lower() == name_teamA.lower():
-            teamA = team
+def simulate(name_teamA:str, name_teamB:str, series:int, maps:list[str], model=None):
+    '''
+        Calcula a probabilidade de vitória de cada time em uma série. Retorna (p_winA, p_winB), entre 0 e 1.
+
+        O modelo pode ser informado para simular vários confrontos sem recarregar o Dataset.
+        Lança ValueError se um time ou mapa não for encontrado ou se a série for inválida.
+    '''
+    if model is None:
+        model = load_model()
+
+    weights = SERIES_WEIGHTS.get(series)
+    if weights is None or len(maps) < series:
+        raise ValueError(f"Invalid series '{series}' with {len(maps)} maps!")
+
+    teamA = model.team(name_teamA)
 
     if teamA == None:
-        print(f"Team '{name_teamA}' not found in dataset! Simulation aborted.")
-        return -1
+        raise ValueError(f"Team '{name_teamA}' not found in dataset!")
 
-    teamB = None
-    for team in data["teams"]:
-        if team["Name"].lower() == name_teamB.lower():
-            teamB = team
+    teamB = model.team(name_teamB)
     
     if teamB == None:
-        print(f"Team '{name_teamB}' not found in dataset! Simulation aborted.")
-        return -1
+        raise ValueError(f"Team '{name_teamB}' not found in dataset!")
     
+    map_columns = []
     for map_name in maps:
-        teamA_maps = [map_item["Map"].lower() for map_item in teamA["Maps Stats"]]
-        if map_name.lower() not in teamA_maps:
-            print(f"Map '{map_name}' is a invalid map! Simulation aborted.")
-            return -1
+        map_column = model.map(map_name)
+        if not model.has_map(teamA, map_column) or not model.has_map(teamB, map_column):
+            raise ValueError(f"Map '{map_name}' is a invalid map!")
+        map_columns.append(map_column)
 
-    p_rankA, p_rankB = calc_p_rank(teamA, teamB)
+    p_rankA, p_rankB = model.p_rank(teamA, teamB)
     p_mapsA = []
     p_mapsB = []
     for i in range(series):
-        a, b = calc_p_map(teamA, teamB, maps[i])
+        a, b = model.p_map(teamA, teamB, map_columns[i])
         p_mapsA.append(a)
         p_mapsB.append(b)
     
@@ -115,11 +111,20 @@ def main(name_teamA:str, name_teamB:str, series:int, maps:list[str]):
     p_mapA = p_mapA / series
     p_mapB = 1 - p_mapA
 
-    p_recentA, p_recentB = calc_p_recent_results(teamA, teamB)
+    p_recentA, p_recentB = model.p_recent(teamA, teamB)
 
     p_winA = weights["rank"]*p_rankA + weights["map"]*p_mapA + weights["results"]*p_recentA
     p_winB = 1 - p_winA
 
+    return float(p_winA), float(p_winB)
+
+def main(name_teamA:str, name_teamB:str, series:int, maps:list[str]):
+    try:
+        p_winA, p_winB = simulate(name_teamA, name_teamB, series, maps)
+    except ValueError as e:
+        print(f"{e} Simulation aborted.")
+        return -1
+
     p_winA = p_winA*100
     p_winB = p_winB*100
 
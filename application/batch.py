@@ -0,0 +1,163 @@
+'''
+    Modo em lote do simulador: lê confrontos de um arquivo e grava a probabilidade de vitória de cada um.
+
+    Entrada (formato pela extensão):
+        - ".csv": colunas teamA, teamB, series e maps (mapas separados por ";")
+        - ".jsonl": um objeto por linha, {"teamA": ..., "teamB": ..., "series": 3, "maps": [...]}
+
+    Saída (".csv" ou ".jsonl"): os campos do confronto, p_teamA, p_teamB e error (confrontos inválidos).
+
+    Os confrontos são lidos sob demanda e enviados em blocos a um pool de processos. Cada processo
+    carrega o modelo uma única vez, e apenas alguns blocos ficam em processamento ao mesmo tempo,
+    então o uso de memória não depende do tamanho do arquivo.
+
+    Uso:
+        python batch.py ENTRADA SAIDA [-d DATASET] [-j PROCESSOS] [--chunk-size N]
+'''
+import os
+import csv
+import json
+import argparse
+from itertools import islice
+from collections import deque
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor
+
+from model import load_model, DATASET
+from app import simulate
+
+
+# Modelo de cada processo do pool
+_model = None
+
+def _load_model(dataset):
+    global _model
+    _model = load_model(dataset)
+
+def simulate_chunk(fixtures):
+    results = []
+    for fixture in fixtures:
+        result = dict(fixture)
+        # Linha inválida no arquivo de entrada
+        if result.get("error"):
+            result["p_teamA"], result["p_teamB"] = None, None
+            results.append(result)
+            continue
+        try:
+            result["p_teamA"], result["p_teamB"] = simulate(fixture["teamA"], fixture["teamB"], int(fixture["series"]),
+                                                            fixture["maps"], _model)
+            result["error"] = ""
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            result["p_teamA"], result["p_teamB"] = None, None
+            result["error"] = str(e)
+        results.append(result)
+    return results
+
+
+def read_fixtures(filename):
+    '''
+        Lê os confrontos do arquivo, um por vez. Linhas inválidas são retornadas com o campo "error" preenchido.
+    '''
+    with open(filename, mode="r", newline="", encoding="utf-8") as file:
+        if filename.endswith(".jsonl"):
+            for number, line in enumerate(file, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    fixture = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield {"error": f"line {number}: invalid JSON ({e})"}
+                    continue
+                if not isinstance(fixture, dict):
+                    yield {"error": f"line {number}: expected a JSON object"}
+                    continue
+                yield fixture
+        else:
+            for row in csv.DictReader(file):
+                # Linhas com menos colunas têm os campos ausentes preenchidos com None
+                row["maps"] = [map_name.strip() for map_name in (row.get("maps") or "").split(";") if map_name.strip()]
+                yield row
+
+
+class FixtureWriter:
+    '''
+        Grava os resultados no formato CSV ou JSON Lines, de acordo com a extensão do arquivo.
+    '''
+    FIELDS = ["teamA", "teamB", "series", "maps", "p_teamA", "p_teamB", "error"]
+
+    def __init__(self, filename):
+        self.jsonl = filename.endswith(".jsonl")
+        self.file = open(filename, mode="w", newline="", encoding="utf-8")
+        if not self.jsonl:
+            self.writer = csv.DictWriter(self.file, fieldnames=self.FIELDS, extrasaction="ignore")
+            self.writer.writeheader()
+
+    def write(self, result):
+        if self.jsonl:
+            self.file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        else:
+            self.writer.writerow({**result, "maps": ";".join(result.get("maps") or [])})
+
+    def close(self):
+        self.file.close()
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def run_batch(input_file, output_file, dataset=DATASET, processes=None, chunk_size=1000):
+    '''
+        Simula todos os confrontos do arquivo de entrada. Retorna (confrontos, confrontos inválidos).
+    '''
+    # Gera o arquivo binário do modelo antes de iniciar os processos, caso ele esteja desatualizado
+    load_model(dataset)
+
+    processes = processes or os.cpu_count() or 1
+    writer = FixtureWriter(output_file)
+    count = errors = 0
+    try:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_load_model, initargs=(dataset,)) as pool:
+            pending = deque()
+            for chunk in chunks(read_fixtures(input_file), chunk_size):
+                pending.append(pool.submit(simulate_chunk, chunk))
+                # Limita os blocos em processamento, gravando os resultados na ordem da entrada
+                while len(pending) > processes * 2:
+                    count, errors = write_results(writer, pending.popleft().result(), count, errors)
+            while pending:
+                count, errors = write_results(writer, pending.popleft().result(), count, errors)
+    finally:
+        writer.close()
+
+    return count, errors
+
+
+def write_results(writer, results, count, errors):
+    for result in results:
+        writer.write(result)
+        errors += bool(result["error"])
+    return count + len(results), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valorant Matchup Simulator - batch simulation")
+    parser.add_argument("input", help="Fixtures file (.csv or .jsonl)")
+    parser.add_argument("output", help="Results file (.csv or .jsonl)")
+    parser.add_argument("-d", "--dataset", default=DATASET, help="Dataset JSON file")
+    parser.add_argument("-j", "--processes", type=int, default=None, help="Number of processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Fixtures per chunk")
+    args = parser.parse_args()
+
+    start = perf_counter()
+    count, errors = run_batch(args.input, args.output, args.dataset, args.processes, args.chunk_size)
+    elapsed = perf_counter() - start
+
+    print(f"{count} fixtures simulated in {elapsed:.2f}s ({errors} invalid), results saved to '{args.output}'")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,143 @@
+'''
+    Modo em lote do simulador: calcula a probabilidade de vitória de todos os confrontos entre os times do Dataset.
+
+    Para cada tipo de série (md1, md3, md5) e cada mapa, é gerada uma matriz N×N em que o elemento [i, j]
+    é a probabilidade do time i vencer o time j com o fator de mapa daquele mapa. Como o fator de mapa de
+    uma série é a média dos mapas jogados, a probabilidade de uma série em vários mapas é a média das
+    matrizes desses mapas.
+
+    Saída:
+        - ".npz": arrays "probabilities" [séries, mapas, N, N] (float32), "series", "maps" e "teams"
+        - ".csv": uma linha por confronto válido (series, map, teamA, teamB, probability)
+
+    Uso:
+        python matrix.py [-d DATASET] [-o SAIDA] [-s 1 3 5] [-m MAPA ...] [--benchmark]
+'''
+import os
+import csv
+import json
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+from model import load_model, DATASET, SERIES_WEIGHTS
+from app import calc_p_rank, calc_p_map, calc_p_recent_results
+
+
+def build_matrices(model, series_list, map_columns):
+    probabilities = np.empty((len(series_list), len(map_columns), len(model.names), len(model.names)), dtype=np.float32)
+    for s, series in enumerate(series_list):
+        for k, m in enumerate(map_columns):
+            probabilities[s, k] = model.matchup_matrix([m], series)
+    return probabilities
+
+
+def save_npz(filename, model, series_list, map_columns, probabilities):
+    np.savez_compressed(filename, probabilities=probabilities, series=np.array(series_list),
+                        maps=np.array([model.maps[m] for m in map_columns], dtype=str),
+                        teams=np.array(model.names, dtype=str))
+
+
+def save_csv(filename, model, series_list, map_columns, probabilities):
+    with open(filename, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["series", "map", "teamA", "teamB", "probability"])
+        for s, series in enumerate(series_list):
+            for k, m in enumerate(map_columns):
+                matrix = probabilities[s, k]
+                # Apenas confrontos válidos: times diferentes que jogaram o mapa
+                valid = ~np.isnan(matrix)
+                np.fill_diagonal(valid, False)
+                for i, j in zip(*np.nonzero(valid)):
+                    writer.writerow([series, model.maps[m], model.names[i], model.names[j], f"{matrix[i, j]:.4f}"])
+
+
+def scalar_matrices(data, model, series_list, map_columns):
+    '''
+        Caminho escalar, equivalente ao de `app.main`: uma chamada de calc_p_* por confronto.
+    '''
+    teams = [next(team for team in reversed(data["teams"]) if team["Name"] == name) for name in model.names]
+    probabilities = np.full((len(series_list), len(map_columns), len(teams), len(teams)), np.nan, dtype=np.float32)
+    for s, series in enumerate(series_list):
+        weights = SERIES_WEIGHTS[series]
+        for k, m in enumerate(map_columns):
+            map_name = model.maps[m]
+            for i, teamA in enumerate(teams):
+                for j, teamB in enumerate(teams):
+                    try:
+                        p_mapA, _ = calc_p_map(teamA, teamB, map_name)
+                    except (TypeError, ValueError):
+                        # Algum dos times não jogou o mapa
+                        continue
+                    except ZeroDivisionError:
+                        p_mapA = 0.5
+                    p_rankA, _ = calc_p_rank(teamA, teamB)
+                    try:
+                        p_recentA, _ = calc_p_recent_results(teamA, teamB)
+                    except ZeroDivisionError:
+                        # Nenhum dos times venceu partidas recentes
+                        p_recentA = 0.5
+                    probabilities[s, k, i, j] = weights["rank"]*p_rankA + weights["map"]*p_mapA + weights["results"]*p_recentA
+    return probabilities
+
+
+def benchmark(dataset, model, series_list, map_columns):
+    with open(dataset, mode="r") as file:
+        data = json.load(file)
+
+    start = perf_counter()
+    scalar = scalar_matrices(data, model, series_list, map_columns)
+    scalar_time = perf_counter() - start
+
+    start = perf_counter()
+    vectorized = build_matrices(model, series_list, map_columns)
+    vectorized_time = perf_counter() - start
+
+    pairs = scalar.size
+    print(f"Matchups: {pairs} ({len(model.names)} teams, {len(map_columns)} maps, {len(series_list)} series types)")
+    print(f"Scalar:     {scalar_time:.3f}s")
+    print(f"Vectorized: {vectorized_time:.3f}s ({scalar_time/vectorized_time:.0f}x)")
+    print(f"Max difference: {np.nanmax(np.abs(scalar - vectorized)):.2e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valorant Matchup Simulator - all-pairs matchup matrix")
+    parser.add_argument("-d", "--dataset", default=DATASET, help="Dataset JSON file")
+    parser.add_argument("-o", "--output", default="./matchups.npz", help="Output file (.npz or .csv)")
+    parser.add_argument("-s", "--series", type=int, nargs="+", choices=sorted(SERIES_WEIGHTS), default=sorted(SERIES_WEIGHTS),
+                        help="Series types (1, 3 and/or 5)")
+    parser.add_argument("-m", "--maps", nargs="+", default=None, help="Map pool (all maps in the dataset by default)")
+    parser.add_argument("--benchmark", action="store_true", help="Compare the vectorized computation against the scalar path")
+    args = parser.parse_args()
+
+    model = load_model(args.dataset)
+
+    if args.maps is None:
+        map_columns = list(range(len(model.maps)))
+    else:
+        map_columns = []
+        for map_name in args.maps:
+            map_column = model.map(map_name)
+            if map_column is None:
+                print(f"Map '{map_name}' is a invalid map! Aborted.")
+                return -1
+            map_columns.append(map_column)
+
+    if args.benchmark:
+        benchmark(args.dataset, model, args.series, map_columns)
+        return 0
+
+    probabilities = build_matrices(model, args.series, map_columns)
+
+    if os.path.splitext(args.output)[1].lower() == ".csv":
+        save_csv(args.output, model, args.series, map_columns, probabilities)
+    else:
+        save_npz(args.output, model, args.series, map_columns, probabilities)
+
+    print(f"{len(model.names)}x{len(model.names)} matchup matrices for {len(args.series)} series types and {len(map_columns)} maps saved to '{args.output}'")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
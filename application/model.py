@@ -0,0 +1,173 @@
+import os
+import json
+import numpy as np
+
+
+DATASET = "./VLRGG_Scraping_Dataset.json"
+
+# Pesos de cada fator na probabilidade de vitória, por tipo de série (md1, md3 e md5)
+SERIES_WEIGHTS = {
+    1: {"rank":0.4, "map":0.5, "results":0.1},
+    3: {"rank":0.4, "map":0.4, "results":0.2},
+    5: {"rank":0.2, "map":0.4, "results":0.4},
+}
+
+
+def parse_percent(value):
+    try:
+        return float(value.replace("%", "").strip())
+    except (AttributeError, ValueError):
+        return np.nan
+
+
+class MatchupModel:
+    '''
+        Representação colunar do Dataset para o simulador.
+
+        Cada time recebe um índice denso e cada mapa uma coluna. As estatísticas ficam em arrays NumPy:
+            - rank[N]
+            - win[N, M], atk[N, M], dfn[N, M]: WIN%, ATK RWIN% e DEF RWIN% por mapa (NaN se o time não jogou o mapa)
+            - recent[N]: razão de vitórias nos resultados recentes (NaN se o time não possui resultados)
+
+        Assim, as probabilidades são calculadas por indexação de arrays, sem percorrer o Dataset.
+    '''
+    def __init__(self, names, maps, rank, win, atk, dfn, recent):
+        self.names = list(names)
+        self.maps = list(maps)
+        self.team_index = {name.lower(): i for i, name in enumerate(self.names)}
+        self.map_index = {name.lower(): j for j, name in enumerate(self.maps)}
+        self.rank = rank
+        self.win = win
+        self.atk = atk
+        self.dfn = dfn
+        self.recent = recent
+
+    @classmethod
+    def from_data(cls, data):
+        '''
+            Constrói o modelo a partir do Dataset (documento JSON já carregado).
+        '''
+        # O último time com um mesmo nome prevalece, como na busca por nome do simulador
+        teams = list({team["Name"].lower(): team for team in data["teams"]}.values())
+
+        maps = []
+        map_index = {}
+        for team in teams:
+            for stats in team["Maps Stats"]:
+                if stats["Map"].lower() not in map_index:
+                    map_index[stats["Map"].lower()] = len(maps)
+                    maps.append(stats["Map"])
+
+        n, m = len(teams), len(maps)
+        rank = np.empty(n, dtype=np.float64)
+        win = np.full((n, m), np.nan)
+        atk = np.full((n, m), np.nan)
+        dfn = np.full((n, m), np.nan)
+        recent = np.full(n, np.nan)
+
+        for i, team in enumerate(teams):
+            rank[i] = int(team["Rank"])
+
+            # Primeira ocorrência de cada mapa, como em calc_p_map
+            for stats in reversed(team["Maps Stats"]):
+                j = map_index[stats["Map"].lower()]
+                win[i, j] = parse_percent(stats["WIN%"])
+                atk[i, j] = parse_percent(stats["ATK RWIN%"])
+                dfn[i, j] = parse_percent(stats["DEF RWIN%"])
+
+            results = team["Recent Results"]
+            if results:
+                recent[i] = sum(1 for match in results if match["result"] == "win") / len(results)
+
+        return cls([team["Name"] for team in teams], maps, rank, win, atk, dfn, recent)
+
+    def save(self, filename):
+        np.savez(filename, names=np.array(self.names, dtype=str), maps=np.array(self.maps, dtype=str),
+                 rank=self.rank, win=self.win, atk=self.atk, dfn=self.dfn, recent=self.recent)
+
+    @classmethod
+    def load(cls, filename):
+        with np.load(filename, allow_pickle=False) as arrays:
+            return cls(arrays["names"].tolist(), arrays["maps"].tolist(), arrays["rank"], arrays["win"],
+                       arrays["atk"], arrays["dfn"], arrays["recent"])
+
+    def team(self, name):
+        '''
+            Retorna o índice de um time pelo nome, ou None.
+        '''
+        return self.team_index.get(name.lower())
+
+    def map(self, name):
+        '''
+            Retorna a coluna de um mapa pelo nome, ou None.
+        '''
+        return self.map_index.get(name.lower())
+
+    def has_map(self, i, j):
+        return j is not None and not np.isnan(self.win[i, j])
+
+    def p_rank(self, i, j):
+        p_rankA = (1/self.rank[i]) / ((1/self.rank[i]) + (1/self.rank[j]))
+        return p_rankA, 1 - p_rankA
+
+    def p_map(self, i, j, m):
+        winA, winB = self.win[i, m], self.win[j, m]
+        # Times sem vitórias no mapa são considerados equivalentes
+        p_mapA = 0.5 if winA + winB == 0 else winA / (winA + winB)
+        return p_mapA, 1 - p_mapA
+
+    def p_recent(self, i, j):
+        r_recentA, r_recentB = self.recent[i], self.recent[j]
+        # Times sem resultados recentes: o fator é desconsiderado
+        if np.isnan(r_recentA) or np.isnan(r_recentB):
+            return 0, 0
+        p_recentA = 0.5 if r_recentA + r_recentB == 0 else r_recentA / (r_recentA + r_recentB)
+        return p_recentA, 1 - p_recentA
+
+    # Versões vetorizadas: matrizes N×N em que o elemento [i, j] é a probabilidade do time i vencer o time j
+
+    def p_rank_matrix(self):
+        inverse = 1 / self.rank
+        return inverse[:, None] / (inverse[:, None] + inverse[None, :])
+
+    def p_map_matrix(self, m):
+        win = self.win[:, m]
+        total = win[:, None] + win[None, :]
+        # NaN se algum dos times não jogou o mapa
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total == 0, 0.5, win[:, None] / total)
+
+    def p_recent_matrix(self):
+        recent = self.recent
+        total = recent[:, None] + recent[None, :]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            p_recent = np.where(total == 0, 0.5, recent[:, None] / total)
+        return np.nan_to_num(p_recent, nan=0.0)
+
+    def matchup_matrix(self, map_columns, series):
+        '''
+            Probabilidade de vitória de todos os confrontos (matriz N×N) em uma série jogada nos mapas informados.
+            Confrontos em que algum dos times não jogou um dos mapas resultam em NaN.
+        '''
+        weights = SERIES_WEIGHTS[series]
+        p_map = sum(self.p_map_matrix(m) for m in map_columns) / len(map_columns)
+        return weights["rank"]*self.p_rank_matrix() + weights["map"]*p_map + weights["results"]*self.p_recent_matrix()
+
+
+def load_model(dataset=DATASET):
+    '''
+        Carrega o modelo do arquivo binário (.npz) gerado a partir do Dataset,
+        reconstruindo-o caso o Dataset seja mais recente que o arquivo.
+    '''
+    cache = os.path.splitext(dataset)[0] + ".npz"
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(dataset):
+        return MatchupModel.load(cache)
+
+    with open(dataset, mode="r") as file:
+        model = MatchupModel.from_data(json.load(file))
+
+    # Arquivo temporário substituído atomicamente, para não expor um modelo incompleto
+    temp_cache = os.path.splitext(dataset)[0] + ".tmp.npz"
+    model.save(temp_cache)
+    os.replace(temp_cache, cache)
+    return model
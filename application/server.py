@@ -0,0 +1,228 @@
+'''
+    Serviço HTTP local de previsões do simulador.
+
+    O modelo do Dataset fica em memória e é substituído atomicamente quando o arquivo do Dataset é
+    alterado (por exemplo, ao final de uma execução do scraper). Cada requisição usa o modelo vigente
+    no seu início, então requisições em andamento não são afetadas pela troca.
+
+    Rotas:
+        - GET  /predict?teamA=...&teamB=...&series=3&maps=Ascent,Bind,Haven
+        - POST /predict com um confronto ({"teamA", "teamB", "series", "maps"}) ou uma lista de confrontos
+        - GET  /metrics: requisições, latência (p50/p99), cache e recarregamentos do Dataset
+        - GET  /health
+
+    Uso:
+        python server.py [-d DATASET] [--host HOST] [--port PORTA] [--cache-size N] [--reload-interval SEGUNDOS]
+'''
+import os
+import json
+import argparse
+from collections import OrderedDict, deque
+from threading import Thread, Lock, Event
+from time import perf_counter
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from model import load_model, DATASET
+from app import simulate
+
+
+class PredictionService:
+    '''
+        Previsões sobre o modelo em memória, com cache LRU dos confrontos já calculados.
+    '''
+    def __init__(self, dataset=DATASET, cache_size=10000, reload_interval=2.0):
+        self.dataset = dataset
+        self.cache_size = cache_size
+        self.reload_interval = reload_interval
+        self.model = load_model(dataset)
+        self.mtime = os.path.getmtime(dataset)
+        self.reloads = 0
+
+        self._cache = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._requests = 0
+        self._errors = 0
+        self._latencies = deque(maxlen=10000)
+        self._stop = Event()
+        self._watcher = Thread(target=self.watch, daemon=True)
+
+    def start(self):
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def watch(self):
+        '''
+            Verifica periodicamente se o Dataset foi alterado, recarregando o modelo.
+        '''
+        while not self._stop.wait(self.reload_interval):
+            try:
+                mtime = os.path.getmtime(self.dataset)
+            except OSError:
+                continue
+            if mtime != self.mtime:
+                self.reload(mtime)
+
+    def reload(self, mtime):
+        try:
+            model = load_model(self.dataset)
+        except Exception as e:
+            # Qualquer erro (Dataset malformado, npz corrompido...) mantém o modelo atual, sem encerrar a thread de verificação;
+            # uma nova tentativa é feita na próxima verificação
+            print(f"Dataset reload FAILED with error {e}! (KEEPING CURRENT DATASET)")
+            return
+
+        with self._lock:
+            self.model = model
+            self.mtime = mtime
+            self.reloads += 1
+            self._cache.clear()
+        print(f"Dataset '{self.dataset}' reloaded ({len(model.names)} teams)")
+
+    def predict(self, fixture):
+        '''
+            Probabilidade de vitória de um confronto. Lança ValueError se o confronto for inválido.
+        '''
+        try:
+            key = (fixture["teamA"].lower(), fixture["teamB"].lower(), int(fixture["series"]),
+                   tuple(map_name.lower() for map_name in fixture["maps"]))
+        except (KeyError, TypeError, AttributeError, ValueError):
+            raise ValueError("Fixture must have 'teamA', 'teamB', 'series' and 'maps'!")
+
+        with self._lock:
+            model = self.model
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return result
+            self._misses += 1
+
+        p_teamA, p_teamB = simulate(fixture["teamA"], fixture["teamB"], key[2], list(fixture["maps"]), model)
+        result = {"teamA": fixture["teamA"], "teamB": fixture["teamB"], "p_teamA": p_teamA, "p_teamB": p_teamB}
+
+        with self._lock:
+            # Resultados de um modelo já substituído não são armazenados
+            if model is self.model:
+                self._cache[key] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def record(self, latency, error=False):
+        with self._lock:
+            self._requests += 1
+            self._errors += error
+            self._latencies.append(latency)
+
+    def get_metrics(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+            return {
+                "requests": self._requests,
+                "errors": self._errors,
+                "p50_ms": round(percentile(0.50), 3),
+                "p99_ms": round(percentile(0.99), 3),
+                "cache_size": len(self._cache),
+                "cache_hits": self._hits,
+                "cache_misses": self._misses,
+                "teams": len(self.model.names),
+                "dataset_reloads": self.reloads,
+            }
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    service : PredictionService = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/metrics":
+            self.reply(200, self.service.get_metrics())
+        elif url.path == "/health":
+            self.reply(200, {"status": "ok"})
+        elif url.path == "/predict":
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            query["maps"] = [map_name for map_name in query.get("maps", "").split(",") if map_name]
+            self.handle_predict(query)
+        else:
+            self.reply(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/predict":
+            self.reply(404, {"error": "Not found"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError:
+            self.reply(400, {"error": "Invalid JSON body"})
+            self.service.record(0.0, error=True)
+            return
+        self.handle_predict(body)
+
+    def handle_predict(self, body):
+        start = perf_counter()
+        error = False
+        if isinstance(body, list):
+            # Lote: confrontos inválidos recebem o erro no seu resultado
+            results = []
+            for fixture in body:
+                try:
+                    results.append(self.service.predict(fixture))
+                except ValueError as e:
+                    results.append({"error": str(e)})
+            status, payload = 200, results
+        else:
+            try:
+                status, payload = 200, self.service.predict(body)
+            except ValueError as e:
+                status, payload, error = 400, {"error": str(e)}, True
+
+        self.reply(status, payload)
+        self.service.record(perf_counter() - start, error)
+
+    def reply(self, status, payload):
+        content = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        # Sem log por requisição: as métricas estão em /metrics
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valorant Matchup Simulator - prediction service")
+    parser.add_argument("-d", "--dataset", default=DATASET, help="Dataset JSON file")
+    parser.add_argument("--host", default="127.0.0.1", help="Listening address")
+    parser.add_argument("--port", type=int, default=8000, help="Listening port")
+    parser.add_argument("--cache-size", type=int, default=10000, help="Number of memoized matchups")
+    parser.add_argument("--reload-interval", type=float, default=2.0, help="Seconds between dataset change checks")
+    args = parser.parse_args()
+
+    service = PredictionService(args.dataset, args.cache_size, args.reload_interval)
+    PredictionHandler.service = service
+    server = ThreadingHTTPServer((args.host, args.port), PredictionHandler)
+    server.daemon_threads = True
+
+    service.start()
+    print(f"Serving predictions for {len(service.model.names)} teams on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,312 @@
+'''
+    Simulação de Monte Carlo de torneios (fase de grupos e playoffs em eliminação simples ou dupla).
+
+    A probabilidade de vitória de cada confronto é a mesma do simulador (`app.main`): os pesos de
+    `SERIES_WEIGHTS` aplicados aos fatores de rank, mapa e resultados recentes do modelo. Os mapas de cada
+    série são definidos por um veto: cada time bane o mapa em que tem menor chance de vencer e escolhe o
+    mapa em que tem maior chance, e o último mapa restante é o desempate.
+
+    As probabilidades são calculadas uma única vez para todos os confrontos. Cada rodada é então sorteada
+    para todas as iterações de uma só vez (arrays NumPy), e as iterações são divididas em blocos executados
+    em vários processos. Cada bloco possui a sua própria semente, derivada da semente informada, então o
+    resultado é reproduzível independentemente do número de processos.
+
+    Uso:
+        python tournament.py TIME [TIME ...] [-n ITERACOES] [--seed SEMENTE] [-j PROCESSOS]
+                             [--groups G --advance K] [--playoffs {single,double}] [-m MAPA ...]
+'''
+import csv
+import argparse
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from model import load_model, DATASET, SERIES_WEIGHTS
+
+
+def veto(p_maps, series):
+    '''
+        Veto de mapas de uma série entre os times A e B, com A iniciando.
+
+        `p_maps` é a probabilidade de A vencer em cada mapa do pool. São banidos 2 mapas, escolhidos
+        `series - 1` mapas (alternadamente) e os demais são banidos até restar o mapa de desempate.
+        Retorna as posições dos mapas jogados.
+    '''
+    pool = list(range(len(p_maps)))
+    if len(pool) <= series:
+        return pool
+
+    picks = []
+    bans = min(2, len(pool) - series)
+    turn = 0
+    for step in range(len(pool) - 1):
+        # A prefere mapas com maior probabilidade, B com menor
+        best = max(pool, key=lambda m: p_maps[m]) if turn == 0 else min(pool, key=lambda m: p_maps[m])
+        worst = min(pool, key=lambda m: p_maps[m]) if turn == 0 else max(pool, key=lambda m: p_maps[m])
+        if bans <= step < bans + series - 1:
+            picks.append(best)
+            pool.remove(best)
+        else:
+            pool.remove(worst)
+        turn = 1 - turn
+
+    return picks + pool
+
+
+def series_matrix(model, teams, map_columns, series):
+    '''
+        Probabilidade de vitória (matriz K×K) de cada confronto entre os times informados (índices do modelo)
+        em uma série com mapas definidos por veto. O time de melhor seed (menor posição) inicia o veto.
+    '''
+    weights = SERIES_WEIGHTS[series]
+    p_rank = model.p_rank_matrix()[np.ix_(teams, teams)]
+    p_recent = model.p_recent_matrix()[np.ix_(teams, teams)]
+
+    k = len(teams)
+    p_map = np.full((k, k), 0.5)
+    for a in range(k):
+        for b in range(a + 1, k):
+            # Apenas mapas jogados pelos dois times
+            pool = [m for m in map_columns if model.has_map(teams[a], m) and model.has_map(teams[b], m)]
+            if not pool:
+                continue
+            p_maps = [model.p_map(teams[a], teams[b], m)[0] for m in pool]
+            played = veto(p_maps, series)
+            p_map[a, b] = sum(p_maps[m] for m in played) / len(played)
+            p_map[b, a] = 1 - p_map[a, b]
+
+    return weights["rank"]*p_rank + weights["map"]*p_map + weights["results"]*p_recent
+
+
+def bracket_order(n):
+    '''
+        Posições dos seeds em uma chave de n times (potência de 2), de forma que o seed 1 enfrente o seed n.
+    '''
+    order = [0]
+    while len(order) < n:
+        size = len(order) * 2
+        order = [seed for s in order for seed in (s, size - 1 - s)]
+    return order
+
+
+def round_name(size):
+    match size:
+        case 2:
+            return "Final"
+        case 4:
+            return "Semifinals"
+        case 8:
+            return "Quarterfinals"
+    return f"Round of {size}"
+
+
+class Tournament:
+    '''
+        Torneio com fase de grupos opcional (todos contra todos, os `advance` primeiros de cada grupo avançam)
+        e playoffs em eliminação simples ("single") ou dupla ("double").
+
+        Os times são informados em ordem de seed. Nos grupos, os times são distribuídos em serpentina;
+        nos playoffs, os primeiros colocados dos grupos recebem os melhores seeds.
+    '''
+    def __init__(self, model, team_names, map_names=None, groups=0, advance=2, playoffs="single",
+                 group_series=1, playoff_series=3, final_series=5):
+        teams = []
+        for name in team_names:
+            team = model.team(name)
+            if team is None:
+                raise ValueError(f"Team '{name}' not found in dataset!")
+            teams.append(team)
+
+        if map_names is None:
+            map_columns = list(range(len(model.maps)))
+        else:
+            map_columns = []
+            for map_name in map_names:
+                map_column = model.map(map_name)
+                if map_column is None:
+                    raise ValueError(f"Map '{map_name}' is a invalid map!")
+                map_columns.append(map_column)
+
+        playoff_size = groups * advance if groups else len(teams)
+        if playoff_size < 2 or playoff_size & (playoff_size - 1):
+            raise ValueError(f"Playoffs need a power of 2 number of teams (got {playoff_size})!")
+        if playoffs == "double" and playoff_size < 4:
+            raise ValueError("Double elimination playoffs need at least 4 teams!")
+        if groups and len(teams) < groups * advance:
+            raise ValueError(f"Not enough teams for {groups} groups with {advance} advancing!")
+
+        self.names = [model.names[team] for team in teams]
+        self.groups = groups
+        self.advance = advance
+        self.playoffs = playoffs
+        self.playoff_size = playoff_size
+
+        self.p_group = series_matrix(model, teams, map_columns, group_series) if groups else None
+        self.p_playoff = series_matrix(model, teams, map_columns, playoff_series)
+        self.p_final = series_matrix(model, teams, map_columns, final_series)
+
+        # Distribuição em serpentina dos times (posições em ordem de seed) nos grupos
+        self.group_members = [[] for _ in range(groups)]
+        for position in range(len(teams) if groups else 0):
+            row, column = divmod(position, groups)
+            self.group_members[column if row % 2 == 0 else groups - 1 - column].append(position)
+
+    def play(self, rng, a, b, p):
+        '''
+            Sorteia as séries entre os times dos arrays `a` e `b`. Retorna (vencedores, perdedores).
+        '''
+        wins = rng.random(a.shape) < p[a, b]
+        return np.where(wins, a, b), np.where(wins, b, a)
+
+    def simulate(self, iterations, seed):
+        '''
+            Simula o torneio `iterations` vezes. Retorna o número de vezes que cada time alcançou cada etapa.
+        '''
+        rng = np.random.default_rng(seed)
+        counts = {}
+
+        def reach(stage, teams):
+            counts[stage] = counts.get(stage, 0) + np.bincount(teams.ravel(), minlength=len(self.names))
+
+        if self.groups:
+            seeds = self.simulate_groups(rng, iterations)
+            reach("Playoffs", seeds)
+        else:
+            seeds = np.broadcast_to(np.arange(len(self.names)), (iterations, len(self.names)))
+
+        bracket = seeds[:, bracket_order(self.playoff_size)]
+        if self.playoffs == "double":
+            champion = self.simulate_double_elimination(rng, bracket, reach)
+        else:
+            champion = self.simulate_single_elimination(rng, bracket, reach)
+        reach("Champion", champion)
+
+        return counts
+
+    def simulate_groups(self, rng, iterations):
+        '''
+            Fase de grupos: retorna os times classificados em ordem de seed dos playoffs, um array [iterações, G*K].
+        '''
+        placements = []
+        for members in self.group_members:
+            members = np.array(members)
+            wins = np.zeros((iterations, len(members)))
+            for a in range(len(members)):
+                for b in range(a + 1, len(members)):
+                    won = rng.random(iterations) < self.p_group[members[a], members[b]]
+                    wins[:, a] += won
+                    wins[:, b] += ~won
+            # Empates no número de vitórias são decididos por sorteio
+            order = np.argsort(-(wins + rng.random(wins.shape) * 0.5), axis=1)
+            placements.append(members[order[:, :self.advance]])
+
+        # Seeds: primeiros colocados de todos os grupos, depois os segundos colocados, ...
+        return np.stack([placements[g][:, place] for place in range(self.advance) for g in range(self.groups)], axis=1)
+
+    def simulate_single_elimination(self, rng, bracket, reach):
+        while bracket.shape[1] > 1:
+            reach(round_name(bracket.shape[1]), bracket)
+            p = self.p_final if bracket.shape[1] == 2 else self.p_playoff
+            bracket, _ = self.play(rng, bracket[:, 0::2], bracket[:, 1::2], p)
+        return bracket[:, 0]
+
+    def simulate_double_elimination(self, rng, upper, reach):
+        lower = None
+        while upper.shape[1] > 1:
+            if upper.shape[1] == 2:
+                reach("Upper final", upper)
+            upper, losers = self.play(rng, upper[:, 0::2], upper[:, 1::2], self.p_playoff)
+
+            if lower is None:
+                # Primeira rodada da chave inferior: perdedores da primeira rodada entre si
+                lower, _ = self.play(rng, losers[:, 0::2], losers[:, 1::2], self.p_playoff)
+                continue
+
+            if losers.shape[1] == 1:
+                reach("Lower final", np.stack([lower[:, 0], losers[:, 0]], axis=1))
+            # Perdedores da chave superior entram na chave inferior em ordem invertida, evitando revanches
+            lower, _ = self.play(rng, lower, losers[:, ::-1], self.p_playoff)
+            if lower.shape[1] > 1:
+                lower, _ = self.play(rng, lower[:, 0::2], lower[:, 1::2], self.p_playoff)
+
+        final = np.stack([upper[:, 0], lower[:, 0]], axis=1)
+        reach("Grand final", final)
+        champion, _ = self.play(rng, final[:, 0], final[:, 1], self.p_final)
+        return champion
+
+    def run(self, iterations, seed=None, processes=None, chunk_size=50_000):
+        '''
+            Executa as iterações em blocos de `chunk_size`, distribuídos entre `processes` processos.
+            Retorna a probabilidade de cada time alcançar cada etapa: {etapa: array[K]}.
+        '''
+        sizes = [chunk_size] * (iterations // chunk_size)
+        if iterations % chunk_size:
+            sizes.append(iterations % chunk_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+        if processes == 1:
+            results = map(self.simulate, sizes, seeds)
+            return self.merge(results, iterations)
+
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            return self.merge(pool.map(self.simulate, sizes, seeds), iterations)
+
+    def merge(self, results, iterations):
+        counts = {}
+        for result in results:
+            for stage, count in result.items():
+                counts[stage] = counts.get(stage, 0) + count
+        return {stage: count / iterations for stage, count in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valorant Matchup Simulator - Monte Carlo tournament simulation")
+    parser.add_argument("teams", nargs="+", help="Team names, in seed order")
+    parser.add_argument("-d", "--dataset", default=DATASET, help="Dataset JSON file")
+    parser.add_argument("-n", "--iterations", type=int, default=100_000, help="Number of simulated tournaments")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed, for reproducible results")
+    parser.add_argument("-j", "--processes", type=int, default=None, help="Number of processes (default: CPU count)")
+    parser.add_argument("--groups", type=int, default=0, help="Number of round-robin groups (0: playoffs only)")
+    parser.add_argument("--advance", type=int, default=2, help="Teams advancing from each group")
+    parser.add_argument("--playoffs", choices=["single", "double"], default="single", help="Playoffs format")
+    parser.add_argument("--group-series", type=int, choices=sorted(SERIES_WEIGHTS), default=1, help="Group stage series type")
+    parser.add_argument("--playoff-series", type=int, choices=sorted(SERIES_WEIGHTS), default=3, help="Playoffs series type")
+    parser.add_argument("--final-series", type=int, choices=sorted(SERIES_WEIGHTS), default=5, help="Final series type")
+    parser.add_argument("-m", "--maps", nargs="+", default=None, help="Map pool (all maps in the dataset by default)")
+    parser.add_argument("-o", "--output", default=None, help="Write the results to a CSV file")
+    args = parser.parse_args()
+
+    model = load_model(args.dataset)
+    try:
+        tournament = Tournament(model, args.teams, args.maps, args.groups, args.advance, args.playoffs,
+                                args.group_series, args.playoff_series, args.final_series)
+    except ValueError as e:
+        print(f"{e} Simulation aborted.")
+        return -1
+
+    start = perf_counter()
+    results = tournament.run(args.iterations, args.seed, args.processes)
+    elapsed = perf_counter() - start
+
+    stages = list(results)
+    width = max(len(name) for name in tournament.names) + 2
+    print("="*70)
+    print(f"{args.iterations} simulations in {elapsed:.2f}s")
+    print("-"*70)
+    print("Team".ljust(width) + "".join(stage.rjust(15) for stage in stages))
+    for i in np.argsort(-results["Champion"], kind="stable"):
+        print(tournament.names[i].ljust(width) + "".join(f"{results[stage][i]*100:.1f}%".rjust(15) for stage in stages))
+
+    if args.output:
+        with open(args.output, mode="w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["team"] + stages)
+            for i, name in enumerate(tournament.names):
+                writer.writerow([name] + [f"{results[stage][i]:.6f}" for stage in stages])
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())